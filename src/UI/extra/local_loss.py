@@ -1,15 +1,165 @@
-import pandas as pd
+import os
+from functools import lru_cache
+
 import numpy as np
 
-# Load the CSV table. Make sure the index corresponds to the size values.
-dt_equiv_lenght = pd.read_csv("./src/db/eq_lenght_exported.csv", sep=";", decimal=',', index_col=0)
+# Equivalent-length table (m) of each fitting per pipe size, resolved from this module's location
+EQ_LENGTH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "db", "eq_lenght_exported.CSV")
 
-def get_size_singularities_loss_values(size):
-    if size not in dt_equiv_lenght.index:
+
+@lru_cache(maxsize=1)
+def load_equivalent_length_table():
+    """
+    Load the equivalent-length table once, on first use.
+
+    Returns:
+        (sizes, fittings, matrix): size values (mm) of each row, fitting column names and
+        a read-only float matrix [n_sizes, n_fittings] with the equivalent lengths.
+    """
+    import pandas as pd
+
+    table = pd.read_csv(EQ_LENGTH_PATH, sep=";", decimal=',', index_col=0)
+    # The first column is the nominal size in inches, the remaining ones are the fittings
+    fittings = table.iloc[:, 1:]
+    matrix = fittings.to_numpy(dtype=float)
+    matrix.flags.writeable = False
+    return tuple(int(v) for v in table.index), tuple(fittings.columns), matrix
+
+
+@lru_cache(maxsize=None)
+def _row_index(size):
+    sizes = load_equivalent_length_table()[0]
+    if size not in sizes:
         raise ValueError(f"Size {size} not found in the CSV data.")
-    current_size_row = dt_equiv_lenght.loc[size]
-    # Adjust slicing below if needed in case the CSV columns order changes.
-    return current_size_row[1:].to_numpy()
+    return sizes.index(size)
+
+
+def get_size_singularities_loss_values(size):
+    """Equivalent lengths (m) of every fitting for a size value in mm (e.g. 25)."""
+    return load_equivalent_length_table()[2][_row_index(size)]
+
+
+def equivalent_length_matrix(size_keys=None):
+    """
+    Equivalent-length matrix [len(size_keys), n_fittings] for size_dict keys (default: all, in order).
+    """
+    size_keys = list(size_dict) if size_keys is None else size_keys
+    matrix = load_equivalent_length_table()[2]
+    return matrix[[_row_index(size_dict[key]) for key in size_keys]]
+
+
+def fittings_equivalent_length(quantities, size_keys=None):
+    """
+    Total equivalent length (m) of the fittings: dot product of the fitting quantities with the
+    equivalent-length row of each size.
+
+    quantities: fitting quantities in table column order (the spinbox values after length and height),
+                shape [n_fittings] or [..., n_fittings]
+    size_keys: a size_dict key (returns a scalar) or a list of keys (default: all sizes)
+    """
+    quantities = np.asarray(quantities, dtype=float)
+    n_fittings = len(load_equivalent_length_table()[1])
+    if quantities.shape[-1:] != (n_fittings,):
+        raise ValueError(f"Expected {n_fittings} fitting quantities, got {quantities.shape[-1:]}.")
+    if isinstance(size_keys, str):
+        return float(get_size_singularities_loss_values(size_dict[size_keys]) @ quantities)
+    return quantities @ equivalent_length_matrix(size_keys).T
+
+
+# Local-loss methods: equivalent length from the table, constant K, Hooper 2-K and Darby 3-K
+LOCAL_LOSS_METHODS = ("eq_length", "k", "2k", "3k")
+
+# Darby 3-K coefficients (K1, Ki, Kd) per fitting column: K = K1/Re + Ki * (1 + Kd / D_in**0.3).
+# Entrances and exits follow the 2-K form (Kd = 0). The foot valve with strainer uses the lift-check values.
+THREE_K_COEFFICIENTS = {
+    "ct_90_rl": (800, 0.056, 3.9),
+    "ct_90_rm": (800, 0.091, 4.0),
+    "ct_90_rc": (800, 0.14, 4.0),
+    "ct_45": (500, 0.071, 4.2),
+    "cur_90_1_1-2": (800, 0.056, 3.9),
+    "cur_90_1": (800, 0.091, 4.0),
+    "cur_45": (500, 0.052, 4.0),
+    "ent_norm": (160, 0.5, 0.0),
+    "ent_borda": (160, 1.0, 0.0),
+    "rg_ga_a": (300, 0.037, 3.9),
+    "rg_gb_a": (1500, 1.7, 3.6),
+    "rg_an_a": (1000, 0.69, 4.0),
+    "te_main": (150, 0.05, 4.0),
+    "te_deriv": (800, 0.28, 4.0),
+    "te_div": (800, 0.28, 4.0),
+    "val_pec": (2000, 2.85, 3.8),
+    "sai_can": (0, 1.0, 0.0),
+    "valv_ret_leve": (1500, 0.46, 4.0),
+    "valv_ret_pesado": (2000, 2.85, 3.8),
+}
+
+# Hooper 2-K coefficients (K1, K_inf, Kd) per fitting column: K = K1/Re + K_inf * (1 + Kd / D_in).
+# Kd is 1 for fittings and valves and 0 for entrances and exits.
+TWO_K_COEFFICIENTS = {
+    "ct_90_rl": (800, 0.20, 1.0),
+    "ct_90_rm": (800, 0.25, 1.0),
+    "ct_90_rc": (800, 0.40, 1.0),
+    "ct_45": (500, 0.20, 1.0),
+    "cur_90_1_1-2": (800, 0.20, 1.0),
+    "cur_90_1": (800, 0.25, 1.0),
+    "cur_45": (500, 0.15, 1.0),
+    "ent_norm": (160, 0.5, 0.0),
+    "ent_borda": (160, 1.0, 0.0),
+    "rg_ga_a": (300, 0.10, 1.0),
+    "rg_gb_a": (1500, 4.0, 1.0),
+    "rg_an_a": (1000, 2.0, 1.0),
+    "te_main": (150, 0.05, 1.0),
+    "te_deriv": (800, 0.80, 1.0),
+    "te_div": (800, 0.80, 1.0),
+    "val_pec": (2000, 10.0, 1.0),
+    "sai_can": (0, 1.0, 0.0),
+    "valv_ret_leve": (1500, 1.5, 1.0),
+    "valv_ret_pesado": (2000, 10.0, 1.0),
+}
+
+# Exponent of D_in in the diameter term of each K model
+K_DIAMETER_EXPONENT = {"k": 0.3, "2k": 1.0, "3k": 0.3}
+
+
+@lru_cache(maxsize=None)
+def _k_table(method):
+    """Coefficient arrays (K1, Ki, Ki * Kd) aligned with the table's fitting columns."""
+    table = TWO_K_COEFFICIENTS if method == "2k" else THREE_K_COEFFICIENTS
+    coefs = np.array([table[name] for name in load_equivalent_length_table()[1]], dtype=float)
+    if method == "k":
+        # Constant K: the fully turbulent limit of the 3-K model
+        coefs[:, 0] = 0.0
+    return coefs[:, 0], coefs[:, 1], coefs[:, 1] * coefs[:, 2]
+
+
+def fittings_k_coefficients(quantities, method="3k"):
+    """
+    Collapse the fitting quantities into the four numbers needed to evaluate the total K:
+
+        K_total(Re, D) = a / Re + b + c / D_in**p
+
+    quantities: fitting quantities in table column order
+    method: "k", "2k" or "3k"
+
+    Returns:
+        (a, b, c, p) as floats
+    """
+    if method not in K_DIAMETER_EXPONENT:
+        raise ValueError(f"Unknown local loss method: {method}")
+    quantities = np.asarray(quantities, dtype=float)
+    K1, Ki, Kd = _k_table(method)
+    if quantities.shape != K1.shape:
+        raise ValueError(f"Expected {K1.size} fitting quantities, got {quantities.shape}.")
+    return float(quantities @ K1), float(quantities @ Ki), float(quantities @ Kd), K_DIAMETER_EXPONENT[method]
+
+
+def __getattr__(name):
+    # Backwards-compatible access to the table as a DataFrame, loaded on demand
+    if name == "dt_equiv_lenght":
+        import pandas as pd
+        return pd.read_csv(EQ_LENGTH_PATH, sep=";", decimal=',', index_col=0)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 size_dict = {
     "13 (1/2\")": 13,
@@ -1,10 +1,11 @@
 # Adicione esta importação ao topo do arquivo
 from PyQt6.QtWidgets import (
     QRadioButton, QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, 
-    QDoubleSpinBox, QButtonGroup, QApplication, QFormLayout, QGroupBox
+    QDoubleSpinBox, QButtonGroup, QApplication, QFormLayout, QGroupBox, QCheckBox
 )
-from PyQt6.QtCore import Qt
-from pyfluids import Fluid, FluidsList
+from PyQt6.QtCore import Qt, QTimer
+
+from UI.func.fluid_properties import FLUIDS, get_fluid_table
 
 class FluidPropInput(QWidget):
     def __init__(self):
@@ -16,7 +17,7 @@ class FluidPropInput(QWidget):
         # Create combo box for "Fluido:"
         self.fluid_label = QLabel("Fluido:")
         self.fluid_combo = QComboBox()
-        self.fluid_combo.addItems(["Água"])  # Add your options here
+        self.fluid_combo.addItems(list(FLUIDS.keys()))
         self.fluid_combo.currentIndexChanged.connect(self.change_values)
         
         # Create radio buttons
@@ -43,10 +44,22 @@ class FluidPropInput(QWidget):
         self.temperature_input.setDecimals(1)
         self.temperature_input.setSuffix(" °C")
         self.temperature_input.setValue(25.0)
+        self.temperature_input.valueChanged.connect(self.change_values)
+        
+        # Faixa de temperatura: a seleção de bombas vale da temperatura acima até a máxima
+        self.temperature_range_check = QCheckBox("Seleção por faixa de temperatura")
+        self.temperature_range_check.toggled.connect(self.toggle_temperature_range)
+        self.temperature_max_label = QLabel("Temperatura máxima (°C):")
+        self.temperature_max_input = QDoubleSpinBox()
+        self.temperature_max_input.setRange(-100, 1000)
+        self.temperature_max_input.setDecimals(1)
+        self.temperature_max_input.setSuffix(" °C")
+        self.temperature_max_input.setValue(60.0)
+        self.temperature_max_input.setDisabled(True)
         
         self.mu_label = QLabel("µ (Viscosidade Absoluta [cP]):")
         self.mu_input = QDoubleSpinBox()
-        self.mu_input.setRange(0.001, 2)
+        self.mu_input.setRange(0.001, 10000)
         self.mu_input.setDecimals(3)
         self.mu_input.setSuffix(" cP")
         self.mu_input.setValue(0.891)
@@ -75,6 +88,8 @@ class FluidPropInput(QWidget):
         # Form layout for better alignment
         self.form_layout = QFormLayout()
         self.form_layout.addRow(self.temperature_label, self.temperature_input)
+        self.form_layout.addRow(self.temperature_range_check)
+        self.form_layout.addRow(self.temperature_max_label, self.temperature_max_input)
         self.form_layout.addRow(self.mu_label, self.mu_input)
         self.form_layout.addRow(self.rho_label, self.rho_input)
         
@@ -169,6 +184,28 @@ class FluidPropInput(QWidget):
         self.setWindowTitle("Fluid Properties Input")
         self.resize(450, 400)
         
+        # µ e ρ do fluido padrão são preenchidos após a primeira pintura: sem a tabela em cache, montá-la
+        # importa o CoolProp e levaria segundos antes de a janela aparecer
+        self._valores_iniciais_pendentes = True
+        
+    def paintEvent(self, event):
+        """
+        Após a primeira pintura, preenche µ e ρ no próximo ciclo do loop de eventos. A pintura (e não o
+        showEvent) é o gatilho porque, na primeira exibição, a janela só é desenhada depois de exposta.
+        """
+        super().paintEvent(event)
+        if self._valores_iniciais_pendentes:
+            QTimer.singleShot(0, self.preencher_valores_iniciais)
+
+    def preencher_valores_iniciais(self):
+        """
+        Lê a tabela do fluido padrão e preenche µ e ρ, uma única vez. Também é chamado pelos getters de µ e
+        ρ, caso sejam lidos antes da primeira pintura.
+        """
+        if self._valores_iniciais_pendentes:
+            self._valores_iniciais_pendentes = False
+            self.change_values()
+
     def toggle_inputs(self):
         if self.radio1.isChecked():
             self.mu_input.setDisabled(True)
@@ -176,19 +213,28 @@ class FluidPropInput(QWidget):
         elif self.radio2.isChecked():
             self.mu_input.setDisabled(False)
             self.rho_input.setDisabled(False)
+        # A faixa de temperatura depende das tabelas dos fluidos padrões
+        self.temperature_range_check.setEnabled(self.radio1.isChecked())
+        self.toggle_temperature_range()
+        self.change_values()
+
+    def toggle_temperature_range(self):
+        """Habilita/desabilita a temperatura máxima da seleção por faixa."""
+        self.temperature_max_input.setEnabled(self.temperature_range_check.isChecked()
+                                              and self.temperature_range_check.isEnabled())
 
     
     def change_values(self):
+        """Atualiza µ e ρ do fluido padrão selecionado a partir da tabela de propriedades."""
+        if not self.radio1.isChecked():
+            return
         try:
-            self.mu_input.setValue(CP.PropsSI('V', 'T', self.temperature_input.value() + 273.15, 'P', 101325, self.fluid_combo.currentText())*1000)
-        except ValueError:
-            print("Erro!!!! Não foi encontrado um valor de Viscosidade Dinamica para", self.fluid_combo.currentText(), "Insira um valor Manualmente")
-    
-        try:    
-            self.rho_input.setValue(CP.PropsSI('D', 'T', self.temperature_input.value() + 273.15, 'P', 101325, self.fluid_combo.currentText()))
-        except ValueError:
-            print("Erro!!!! Não foi encontrado um valor de Densidade para", self.fluid_combo.currentText(), "Insira um valor Manualmente")
-    # (self.temperature_input.value() + 273.15)
+            table = get_fluid_table(self.get_fluid_name())
+            temperatura = self.temperature_input.value()
+            self.mu_input.setValue(float(table.mu(temperatura)) * 1000)  # Pa.s -> cP
+            self.rho_input.setValue(float(table.rho(temperatura)))
+        except ValueError as e:
+            print("Erro!!!!", e, "Insira os valores manualmente")
 
     def toggle_roughness_input(self):
         """Habilita/desabilita entrada de rugosidade personalizada."""
@@ -205,10 +251,25 @@ class FluidPropInput(QWidget):
             rugosidade = self.materials.get(material, 0.045)  # Valor padrão se não encontrado
             self.roughness_input.setValue(rugosidade)
 
+    def get_fluid_name(self):
+        return self.fluid_combo.currentText()
+
+    def get_temperature_range(self):
+        """
+        Retorna a faixa de temperatura da seleção (t_min, t_max) em °C, ou None se a seleção por faixa
+        estiver desativada.
+        """
+        if not (self.temperature_range_check.isChecked() and self.temperature_range_check.isEnabled()):
+            return None
+        t_min, t_max = self.temperature_input.value(), self.temperature_max_input.value()
+        return (min(t_min, t_max), max(t_min, t_max))
+
     def get_mu_input_value(self):
+        self.preencher_valores_iniciais()
         return self.mu_input.value()
         
     def get_rho_input_value(self):
+        self.preencher_valores_iniciais()
         return self.rho_input.value()
     
     def get_roughness_value(self):
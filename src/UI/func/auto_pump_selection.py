@@ -10,7 +10,11 @@ Funcionalidades:
     - Recebe uma curva do sistema (coef_system_curve) que é um array de coeficientes polinomiais (grau 5).
     - Recebe as variáveis global_min_flow e global_max_flow que definem o intervalo global de fluxo.
     - Realiza uma consulta no banco de dados (DB_PATH) para buscar apenas bombas cujo intervalo de vazão
-      (vazao_min e vazao_max) esteja dentro do intervalo global.
+      (vazao_min e vazao_max) esteja dentro do intervalo global. Se houver um snapshot binário do
+      catálogo (SNAPSHOT_PATH) atualizado, o filtro é feito nele, sem abrir o banco.
+    - Para líquidos viscosos, corrige as curvas de todo o catálogo (HI 9.6.7) em lote antes do filtro.
+    - Descarta, antes de qualquer cálculo de raízes, as bombas cujo head máximo pré-calculado
+      (max_head) não alcança a curva do sistema na faixa de operação.
     - Converte a string dos coeficientes (armazenados em formato JSON) para um array NumPy.
     - Calcula os pontos de interseção entre a curva do sistema e a curva da bomba, considerando somente os
       pontos de interseção que estejam dentro do intervalo suportado pela bomba.
@@ -24,6 +28,9 @@ import sqlite3
 import numpy as np
 import json
 
+from UI.func.catalog_snapshot import load_snapshot, load_catalog_arrays, SNAPSHOT_PATH, SCALAR_FIELDS, CURVE_FIELDS
+from UI.func.viscosity_correction import correct_catalog, kinematic_viscosity, WATER_KINEMATIC_VISCOSITY
+
 # Caminho do banco de dados
 DB_PATH = "./src/db/pump_data.db"
 
@@ -36,11 +43,13 @@ def parse_coef_string(coef_str: str) -> np.ndarray:
           1.57151363e-04, 5.70842371e+00]"
     
     Parâmetros:
-        coef_str (str): String contendo os coeficientes.
+        coef_str (str): String contendo os coeficientes (arrays NumPy são retornados sem conversão).
         
     Retorna:
         np.ndarray: Array de floats com os coeficientes.
     """
+    if isinstance(coef_str, np.ndarray):
+        return coef_str
     try:
         coef_list = json.loads(coef_str)
     except json.JSONDecodeError as e:
@@ -48,6 +57,39 @@ def parse_coef_string(coef_str: str) -> np.ndarray:
     
     return np.array(coef_list)
 
+def batch_intersections(diff: np.ndarray, flow_values: np.ndarray, segment_ok: np.ndarray = None):
+    """
+    Encontra de uma vez as interseções de muitas curvas avaliadas na mesma grade de vazões.
+
+    Para cada curva, a interseção é a primeira troca de sinal (+ -> -) de diff = head_bomba - head_sistema
+    entre dois pontos consecutivos da grade, interpolada linearmente dentro do intervalo.
+
+    Parâmetros:
+        diff (np.ndarray): Diferença de head [..., F] avaliada em flow_values.
+        flow_values (np.ndarray): Grade de vazões (F,), igualmente espaçada.
+        segment_ok (np.ndarray): Máscara opcional [..., F - 1] dos intervalos permitidos
+                                 (ex.: dentro da faixa de vazão da bomba).
+
+    Retorna:
+        tuple: (has_crossing, q, k, t)
+            has_crossing: se a curva cruza a do sistema
+            q: vazão da interseção (m³/h)
+            k: índice do ponto da grade que inicia o intervalo da interseção
+            t: posição da interseção dentro do intervalo (0 a 1), para interpolar outras grandezas
+    """
+    crossing = (diff[..., :-1] >= 0) & (diff[..., 1:] < 0)
+    if segment_ok is not None:
+        crossing &= segment_ok
+    has_crossing = crossing.any(axis=-1)
+    k = np.argmax(crossing, axis=-1)
+
+    d0 = np.take_along_axis(diff, k[..., np.newaxis], axis=-1)[..., 0]
+    d1 = np.take_along_axis(diff, k[..., np.newaxis] + 1, axis=-1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(has_crossing, d0 / (d0 - d1), 0.0)
+    step = flow_values[1] - flow_values[0]
+    return has_crossing, flow_values[k] + t * step, k, t
+
 def find_intersection_points(coef_system: np.ndarray, coef_pump: np.ndarray,
                              global_min_flow: float, global_max_flow: float, tol: float = 1e-6) -> np.ndarray:
     """
@@ -68,7 +110,8 @@ def find_intersection_points(coef_system: np.ndarray, coef_pump: np.ndarray,
         np.ndarray: Array com os pontos de interseção válidos.
     """
     # Calcula o polinômio diferença: f(x) = poly_system(x) - poly_pump(x)
-    diff_coef = np.array(coef_system) - np.array(coef_pump)
+    # (np.polysub alinha os graus, que podem diferir após a seleção automática de grau)
+    diff_coef = np.polysub(coef_system, coef_pump)
     # Calcula as raízes do polinômio diferença
     roots = np.roots(diff_coef)
     
@@ -82,7 +125,100 @@ def find_intersection_points(coef_system: np.ndarray, coef_pump: np.ndarray,
     
     return np.array(valid_roots)
 
-def auto_pump_selection(coef_system_curve: np.ndarray, target_flow: float):
+def candidates_from_db(target_flow: float, static_head: float) -> list:
+    """
+    Consulta no banco de dados as bombas candidatas para a vazão alvo.
+
+    Retorna somente bombas cuja faixa de 80% a 110% da vazão de melhor eficiência contenha a vazão
+    alvo e cujo head máximo (quando conhecido) alcance a altura estática do sistema. As bombas vêm na
+    ordem de id, a mesma do snapshot (read_catalog), para que os dois caminhos sejam intercambiáveis.
+
+    Parâmetros:
+        target_flow (float): Vazão alvo.
+        static_head (float): Altura estática do sistema (curva do sistema em Q = 0).
+
+    Retorna:
+        list: Tuplas (marca, modelo, diametro, rotacao, estagios, vazao_min, vazao_max, coef_head,
+              coef_eff, coef_npshr, coef_power, eff_bop, eff_bop_flow, p80_eff_bop_flow,
+              p110_eff_bop_flow, max_head), com os coeficientes em JSON.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    try:
+        query = """
+        SELECT marca, modelo, diametro, rotacao, estagios, vazao_min, vazao_max, 
+               coef_head, coef_eff, coef_npshr, coef_power, 
+               eff_bop, eff_bop_flow, p80_eff_bop_flow, p110_eff_bop_flow, max_head
+        FROM pump_models
+        WHERE p110_eff_bop_flow >= ? AND p80_eff_bop_flow <= ?
+          AND (max_head IS NULL OR max_head >= ?)
+        ORDER BY id
+        """
+        cursor.execute(query, (target_flow, target_flow, static_head))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+def candidates_from_snapshot(snapshot, target_flow: float, static_head: float) -> list:
+    """
+    Equivalente a candidates_from_db, filtrando as bombas diretamente no snapshot binário.
+
+    O filtro é vetorizado sobre as colunas mapeadas em memória; somente as bombas aprovadas
+    são decodificadas.
+
+    Parâmetros:
+        snapshot (CatalogSnapshot): Catálogo carregado por memória mapeada.
+        target_flow (float): Vazão alvo.
+        static_head (float): Altura estática do sistema (curva do sistema em Q = 0).
+
+    Retorna:
+        list: Tuplas no mesmo formato de candidates_from_db, com os coeficientes como arrays NumPy.
+    """
+    return candidates_from_arrays(snapshot.scalars, snapshot.coefs, snapshot.strings, target_flow, static_head)
+
+def candidates_from_arrays(scalars: np.ndarray, coefs: np.ndarray, strings, target_flow: float,
+                           static_head: float, valid: np.ndarray = None) -> list:
+    """
+    Equivalente a candidates_from_db sobre os arrays do catálogo (formato do snapshot), por exemplo
+    após a correção de viscosidade.
+
+    Parâmetros:
+        scalars (np.ndarray): Escalares [n_bombas, len(SCALAR_FIELDS)].
+        coefs (np.ndarray): Coeficientes [n_bombas, len(CURVE_FIELDS), largura].
+        strings (callable): strings(index) retorna os campos de texto de uma bomba.
+        target_flow (float): Vazão alvo.
+        static_head (float): Altura estática do sistema (curva do sistema em Q = 0).
+        valid (np.ndarray): Máscara opcional das bombas que podem ser consideradas.
+
+    Retorna:
+        list: Tuplas no mesmo formato de candidates_from_db, com os coeficientes como arrays NumPy.
+    """
+    column = {field: k for k, field in enumerate(SCALAR_FIELDS)}
+    p80 = scalars[:, column["p80_eff_bop_flow"]]
+    p110 = scalars[:, column["p110_eff_bop_flow"]]
+    max_head = scalars[:, column["max_head"]]
+    mask = (p110 >= target_flow) & (p80 <= target_flow) & (np.isnan(max_head) | (max_head >= static_head))
+    if valid is not None:
+        mask &= valid
+
+    fields = ("vazao_min", "vazao_max", "eff_bop", "eff_bop_flow", "p80_eff_bop_flow", "p110_eff_bop_flow",
+              "max_head")
+    rows = []
+    for index in np.flatnonzero(mask):
+        text = strings(index)
+        value = {f: None if np.isnan(scalars[index, column[f]]) else float(scalars[index, column[f]])
+                 for f in fields}
+        curve = [np.trim_zeros(coefs[index, k], "f") for k in range(len(CURVE_FIELDS))]
+        curve = [np.array(c if c.size else [0.0]) for c in curve]
+        rows.append((text["marca"], text["modelo"], text["diametro"], text["rotacao"], text["estagios"],
+                     value["vazao_min"], value["vazao_max"], *curve,
+                     value["eff_bop"], value["eff_bop_flow"], value["p80_eff_bop_flow"],
+                     value["p110_eff_bop_flow"], value["max_head"]))
+    return rows
+
+def auto_pump_selection(coef_system_curve: np.ndarray, target_flow: float, system_model=None,
+                        mu: float = None, rho: float = None):
     """
     Seleciona os modelos de bomba cujas curvas de desempenho (coef_head) se interceptam com a curva do sistema.
 
@@ -92,6 +228,12 @@ def auto_pump_selection(coef_system_curve: np.ndarray, target_flow: float):
     Parâmetros:
         coef_system_curve (np.ndarray): Coeficientes do polinômio do sistema (grau 5).
         target_flow (float): Vazão alvo para seleção de bombas.
+        system_model (SystemCurve, opcional): Curva física do sistema correspondente a coef_system_curve.
+            Quando informada, as interseções encontradas no polinômio são refinadas na curva exata.
+        mu (float, opcional): Viscosidade dinâmica do fluido (cP).
+        rho (float, opcional): Massa específica do fluido (kg/m³).
+            Com mu e rho de um líquido mais viscoso que a água, as curvas de todo o catálogo são corrigidas
+            pelo método HI 9.6.7 (viscosity_correction) antes da seleção.
     
     Retorna:
         list ou str: Lista de dicionários contendo os dados da bomba, os pontos de interseção e os
@@ -100,80 +242,89 @@ def auto_pump_selection(coef_system_curve: np.ndarray, target_flow: float):
     """
     results = []
     
-    # Conecta ao banco de dados
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    # A curva do sistema é crescente com a vazão: nenhuma bomba com head máximo abaixo
+    # da altura estática (curva do sistema em Q = 0) pode interceptá-la
+    static_head = float(np.polyval(coef_system_curve, 0.0))
     
-    try:
-        # Query atualizada com a estrutura correta de colunas
-        query = """
-        SELECT marca, modelo, diametro, rotacao, estagios, vazao_min, vazao_max, 
-               coef_head, coef_eff, coef_npshr, coef_power, 
-               eff_bop, eff_bop_flow, p80_eff_bop_flow, p110_eff_bop_flow
-        FROM pump_models
-        WHERE p110_eff_bop_flow >= ? AND p80_eff_bop_flow <= ?
-        """
-        cursor.execute(query, (target_flow, target_flow))
-        pump_models = cursor.fetchall()
-        
-        # Se nenhum registro for retornado, indica que não há bombas para o intervalo selecionado
-        if not pump_models:
-            return "Não há nenhuma bomba para o intervalo de vazão selecionado"
+    # Líquido viscoso: corrige o catálogo inteiro de uma vez e filtra sobre as curvas corrigidas.
+    # Caso contrário, usa o snapshot binário quando estiver atualizado, ou consulta o banco
+    if mu is not None and rho is not None and kinematic_viscosity(mu, rho) > WATER_KINEMATIC_VISCOSITY:
+        scalars, coefs, strings = load_catalog_arrays(SNAPSHOT_PATH, DB_PATH)
+        scalars, coefs, valid = correct_catalog(scalars, coefs, mu, rho)
+        pump_models = candidates_from_arrays(scalars, coefs, strings, target_flow, static_head, valid)
+    else:
+        snapshot = load_snapshot(SNAPSHOT_PATH, DB_PATH)
+        if snapshot is not None:
+            pump_models = candidates_from_snapshot(snapshot, target_flow, static_head)
+        else:
+            pump_models = candidates_from_db(target_flow, static_head)
+    
+    # Se nenhum registro for retornado, indica que não há bombas para o intervalo selecionado
+    if not pump_models:
+        return "Não há nenhuma bomba para o intervalo de vazão selecionado"
+    
+    # Processa cada bomba
+    for pump in pump_models:
+        marca, modelo, diametro, rotacao, estagios, pump_vazao_min, pump_vazao_max, coef_head_str, \
+        coef_eff_str, coef_npshr_str, coef_power_str, pump_eff_bop, pump_eff_bop_flow, \
+        pump_p80_eff_bop_flow, pump_p110_eff_bop_flow, pump_max_head = pump
         
-        # Processa cada bomba
-        for pump in pump_models:
-            marca, modelo, diametro, rotacao, estagios, pump_vazao_min, pump_vazao_max, coef_head_str, \
-            coef_eff_str, coef_npshr_str, coef_power_str, pump_eff_bop, pump_eff_bop_flow, \
-            pump_p80_eff_bop_flow, pump_p110_eff_bop_flow = pump
-            
-            # Converte as strings de coeficientes para arrays NumPy
-            try:
-                coef_pump = parse_coef_string(coef_head_str)
-                coef_eff = parse_coef_string(coef_eff_str)
-                coef_npshr = parse_coef_string(coef_npshr_str)
-                coef_power = parse_coef_string(coef_power_str)
-            except Exception as e:
-                print(f"Erro ao converter coeficientes para o modelo {modelo}: {e}")
+        # Verificação de limites: se o sistema já exige mais que o head máximo da bomba
+        # no início da faixa de busca, não há interseção possível
+        if pump_max_head is not None:
+            flow_lo = max(pump_p80_eff_bop_flow, pump_vazao_min)
+            if np.polyval(coef_system_curve, flow_lo) > pump_max_head:
                 continue
+        
+        # Converte as strings de coeficientes para arrays NumPy (o snapshot já fornece arrays)
+        try:
+            coef_pump = parse_coef_string(coef_head_str)
+            coef_eff = parse_coef_string(coef_eff_str)
+            coef_npshr = parse_coef_string(coef_npshr_str)
+            coef_power = parse_coef_string(coef_power_str)
+        except Exception as e:
+            print(f"Erro ao converter coeficientes para o modelo {modelo}: {e}")
+            continue
+        
+        # Calcula os pontos de interseção entre a curva do sistema e a curva da bomba
+        intersection_points = find_intersection_points(coef_system_curve, coef_pump,
+                                                      pump_p80_eff_bop_flow, pump_p110_eff_bop_flow)
+        # Filtra os pontos para que estejam dentro do intervalo suportado pela bomba
+        intersection_points = intersection_points[
+            (intersection_points >= pump_vazao_min) & (intersection_points <= pump_vazao_max)
+        ]
+        
+        # Se houver pontos de interseção válidos, utiliza o primeiro ponto para calcular os valores
+        if intersection_points.size > 0:
+            x_val = float(intersection_points[0])
+            if system_model is not None:
+                x_val = system_model.refine_intersection(coef_pump, x_val)
+                y_val = float(system_model(x_val))
+            else:
+                y_val = float(np.polyval(coef_system_curve, x_val))
+            intersections = [[x_val], [y_val]]
             
-            # Calcula os pontos de interseção entre a curva do sistema e a curva da bomba
-            intersection_points = find_intersection_points(coef_system_curve, coef_pump,
-                                                          pump_p80_eff_bop_flow, pump_p110_eff_bop_flow)
-            # Filtra os pontos para que estejam dentro do intervalo suportado pela bomba
-            intersection_points = intersection_points[
-                (intersection_points >= pump_vazao_min) & (intersection_points <= pump_vazao_max)
-            ]
+            # Calcula os valores de eficiência, NPSHr e potência para o ponto de interseção escolhido
+            pump_eff = float(np.polyval(coef_eff, x_val))
+            pump_npshr = float(np.polyval(coef_npshr, x_val))
+            pump_power = float(np.polyval(coef_power, x_val))
             
-            # Se houver pontos de interseção válidos, utiliza o primeiro ponto para calcular os valores
-            if intersection_points.size > 0:
-                x_val = float(intersection_points[0])
-                y_val = float(np.polyval(coef_system_curve, x_val))
-                intersections = [[x_val], [y_val]]
-                
-                # Calcula os valores de eficiência, NPSHr e potência para o ponto de interseção escolhido
-                pump_eff = float(np.polyval(coef_eff, x_val))
-                pump_npshr = float(np.polyval(coef_npshr, x_val))
-                pump_power = float(np.polyval(coef_power, x_val))
-                
-                results.append({
-                    "marca": marca,
-                    "modelo": modelo,
-                    "diametro": diametro,
-                    "rotacao": rotacao,
-                    "estagios": estagios,
-                    "intersecoes": intersections,
-                    "pump_coef_head": coef_pump,
-                    "pump_coef_eff": coef_eff,
-                    "pump_coef_npshr": coef_npshr,
-                    "pump_coef_power": coef_power,
-                    "pump_vazao_min": pump_vazao_min,
-                    "pump_vazao_max": pump_vazao_max,
-                    "pump_eff": pump_eff,
-                    "pump_npshr": pump_npshr,
-                    "pump_power": pump_power
-                })
-    finally:
-        cursor.close()
-        conn.close()
+            results.append({
+                "marca": marca,
+                "modelo": modelo,
+                "diametro": diametro,
+                "rotacao": rotacao,
+                "estagios": estagios,
+                "intersecoes": intersections,
+                "pump_coef_head": coef_pump,
+                "pump_coef_eff": coef_eff,
+                "pump_coef_npshr": coef_npshr,
+                "pump_coef_power": coef_power,
+                "pump_vazao_min": pump_vazao_min,
+                "pump_vazao_max": pump_vazao_max,
+                "pump_eff": pump_eff,
+                "pump_npshr": pump_npshr,
+                "pump_power": pump_power
+            })
     
     return results
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Módulo: batch_selection.py
+Descrição:
+    Seleção de bombas em lote, sem interface gráfica, para muitas especificações de serviço (duty specs).
+
+    Cada especificação é convertida em um SelectionRequest e selecionada pelo núcleo de cálculo
+    (core.select_pumps), com a mesma sequência da aba de seleção; este módulo cuida da leitura das
+    especificações, da execução em paralelo e da gravação dos resultados.
+
+    As especificações são processadas em um pool de processos. O catálogo é lido do snapshot binário
+    (catalog_snapshot), aberto por memória mapeada: todos os processos compartilham as mesmas páginas em
+    memória. Os resultados são devolvidos na ordem das especificações, à medida que ficam prontos.
+
+Formato de uma especificação (colunas do CSV ou chaves de cada linha JSONL):
+    id                      identificação (padrão: número da linha)
+    vazao                   vazão total de projeto (m³/h)
+    n_bombas                bombas em paralelo (padrão: 1)
+    fluido                  nome do fluido (FLUIDS, padrão: "Água")
+    temperatura             temperatura (°C, padrão: 25)
+    mu, rho                 viscosidade (cP) e massa específica (kg/m³); substituem os valores da tabela
+    rugosidade              rugosidade interna (mm, padrão: 0.045)
+    metodo_perdas           método das perdas localizadas (LOCAL_LOSS_METHODS, padrão: "eq_length")
+    succao_comprimento, succao_altura, succao_diametro, succao_singularidades
+    recalque_comprimento, recalque_altura, recalque_diametro, recalque_singularidades
+        comprimento (m), diferença de altura (m), diâmetro (chave da tabela, ex. '50 (2")', ou o valor
+        nominal em mm) e singularidades: quantidades por coluna da tabela de comprimentos equivalentes,
+        como objeto JSON ou texto "ct_90_rl=2;val_pec=1"
+
+Funcionalidades:
+    - normalize_spec: converte um registro lido em um SelectionRequest.
+    - read_duty_specs: lê especificações de CSV (separador ',', ';' ou tabulação) ou JSONL.
+    - select_duty: executa a seleção de uma especificação e retorna as linhas do ranking.
+    - run_batch: executa a seleção de uma lista de especificações em paralelo (gerador).
+    - write_results: grava as linhas em JSONL ou Parquet (pyarrow, opcional) à medida que chegam.
+"""
+
+import csv
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from core import PipeSection, SystemSpec, FluidState, SelectionRequest, select_pumps
+from UI.extra.local_loss import load_equivalent_length_table, size_dict
+from UI.func.catalog_snapshot import load_snapshot, export_snapshot, SNAPSHOT_PATH, DB_PATH
+
+DEFAULT_SPEC = {"n_bombas": 1, "fluido": "Água", "temperatura": 25.0, "rugosidade": 0.045,
+                "metodo_perdas": "eq_length"}
+OUTPUT_FORMATS = ("jsonl", "parquet")
+
+# Colunas de cada linha de resultado (uma linha por bomba do ranking, ou uma linha sem bomba)
+RESULT_FIELDS = (
+    "id", "rank", "marca", "modelo", "diametro", "rotacao", "estagios",
+    "vazao_bomba", "vazao_total", "head", "eficiencia", "potencia", "potencia_total",
+    "npshr", "npsh_disponivel", "margem_npsh", "mensagem",
+)
+
+
+# --------------------------------------------------------------------------------------------------
+# Leitura das especificações
+# --------------------------------------------------------------------------------------------------
+
+def _to_float(value, decimal_comma=False):
+    if isinstance(value, str):
+        value = value.strip()
+        if decimal_comma:
+            value = value.replace(",", ".")
+    return float(value)
+
+
+def parse_fittings(value):
+    """
+    Quantidades das singularidades na ordem das colunas da tabela de comprimentos equivalentes.
+
+    Parâmetros:
+        value: dicionário {coluna: quantidade}, texto "coluna=quantidade;..." ou vazio
+
+    Retorna:
+        np.ndarray: quantidades [n_singularidades]
+    """
+    _, fittings, _ = load_equivalent_length_table()
+    quantities = np.zeros(len(fittings))
+    if not value:
+        return quantities
+    if isinstance(value, str):
+        value = dict(item.split("=", 1) for item in value.replace(",", ";").split(";") if item.strip())
+    for name, quantity in value.items():
+        name = name.strip()
+        if name not in fittings:
+            raise ValueError(f"Singularidade desconhecida: {name} (disponíveis: {', '.join(fittings)})")
+        quantities[fittings.index(name)] = float(quantity)
+    return quantities
+
+
+def parse_size(value):
+    """Chave da tabela de diâmetros a partir da própria chave ou do diâmetro nominal em mm."""
+    if value in size_dict:
+        return value
+    nominal = int(_to_float(value))
+    for key, size in size_dict.items():
+        if size == nominal:
+            return key
+    raise ValueError(f"Diâmetro desconhecido: {value}")
+
+
+def normalize_spec(record, index, decimal_comma=False):
+    """
+    Converte um registro lido (CSV, JSONL ou corpo de uma requisição) em um pedido de seleção.
+
+    Parâmetros:
+        record (dict): campos da especificação (ver módulo)
+        index (int): posição do registro no arquivo, usada como id padrão
+        decimal_comma (bool): números com vírgula decimal (CSV separado por ';')
+
+    Retorna:
+        SelectionRequest: pedido com os valores padrão (DEFAULT_SPEC) completados
+    """
+    record = {key: value for key, value in record.items() if value not in (None, "")}
+    spec = dict(DEFAULT_SPEC)
+    for key in ("temperatura", "rugosidade", "mu", "rho"):
+        if key in record:
+            spec[key] = _to_float(record[key], decimal_comma)
+    for key in ("fluido", "metodo_perdas"):
+        if key in record:
+            spec[key] = str(record[key]).strip()
+
+    sections = {}
+    for section in ("succao", "recalque"):
+        sections[section] = PipeSection(
+            _to_float(record[f"{section}_comprimento"], decimal_comma),
+            _to_float(record[f"{section}_altura"], decimal_comma),
+            parse_size(record[f"{section}_diametro"]),
+            tuple(parse_fittings(record.get(f"{section}_singularidades"))),
+        )
+    return SelectionRequest(
+        system=SystemSpec(_to_float(record["vazao"], decimal_comma), sections["succao"], sections["recalque"],
+                          spec["rugosidade"], spec["metodo_perdas"]),
+        fluid=FluidState.from_table(spec["fluido"], spec["temperatura"], spec.get("mu"), spec.get("rho")),
+        n_bombas=int(_to_float(record.get("n_bombas", spec["n_bombas"]), decimal_comma)),
+        top=int(record["top"]) if "top" in record else None,
+        id=str(record.get("id", index + 1)),
+    )
+
+
+def read_duty_specs(path):
+    """
+    Lê as especificações de um arquivo CSV ou JSONL (pela extensão: .jsonl/.json ou .csv).
+
+    Registros inválidos não interrompem a leitura: são devolvidos como {'id', 'erro'} e aparecem no
+    resultado com a mensagem de erro.
+
+    Retorna:
+        list: pedidos de seleção (normalize_spec) ou registros de erro
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith((".jsonl", ".json")):
+            records = [json.loads(line) for line in f if line.strip()]
+            decimal_comma = False
+        else:
+            sample = f.read(4096)
+            f.seek(0)
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+            records = list(csv.DictReader(f, dialect=dialect))
+            decimal_comma = dialect.delimiter != ","
+
+    specs = []
+    for index, record in enumerate(records):
+        try:
+            specs.append(normalize_spec(record, index, decimal_comma))
+        except (KeyError, ValueError, TypeError) as e:
+            message = f"campo ausente: {e}" if isinstance(e, KeyError) else str(e)
+            specs.append({"id": str(record.get("id", index + 1)), "erro": message})
+    return specs
+
+
+# --------------------------------------------------------------------------------------------------
+# Seleção de uma especificação
+# --------------------------------------------------------------------------------------------------
+
+def select_duty(request, top=None):
+    """
+    Executa a seleção de bombas de uma especificação.
+
+    Parâmetros:
+        request (SelectionRequest): pedido normalizado (normalize_spec) ou registro de erro {'id', 'erro'}
+        top (int): número máximo de bombas no ranking (padrão: request.top, ou todas)
+
+    Retorna:
+        list: linhas do resultado (RESULT_FIELDS), uma por bomba aprovada em ordem de classificação, ou
+              uma única linha com a mensagem quando nenhuma bomba atende
+    """
+    if isinstance(request, dict):
+        return [_message_row(request["id"], f"Especificação inválida: {request['erro']}")]
+
+    try:
+        pumps = select_pumps(request)
+    except Exception as e:
+        logging.error(f"Erro na seleção da especificação {request.id}: {e}", exc_info=True)
+        return [_message_row(request.id, f"Erro na seleção: {e}")]
+    if isinstance(pumps, str):
+        return [_message_row(request.id, pumps)]
+
+    top = top if top is not None else request.top
+    return [pump_row(request, pump, rank) for rank, pump in enumerate(pumps[:top], start=1)]
+
+
+def pump_row(request, pump, rank=None):
+    """
+    Linha do resultado (RESULT_FIELDS) de uma bomba com o ponto de operação calculado (core.operating_point).
+    """
+    n_bombas = request.n_bombas
+    power = pump.get("pump_power")
+    return {
+        "id": request.id,
+        "rank": rank,
+        "marca": pump.get("marca"),
+        "modelo": pump.get("modelo"),
+        "diametro": pump.get("diametro"),
+        "rotacao": pump.get("rotacao"),
+        "estagios": pump.get("estagios"),
+        "vazao_bomba": _float(pump["vazao_bomba"]),
+        "vazao_total": _float(pump["vazao_total"]),
+        "head": _float(pump["head_value"]),
+        "eficiencia": _float(pump.get("pump_eff")),
+        "potencia": _float(power),
+        "potencia_total": _float(power * n_bombas) if power is not None else None,
+        "npshr": _float(pump.get("pump_npshr")),
+        "npsh_disponivel": _float(pump["npsh_disponivel_ponto"]),
+        "margem_npsh": _float(pump.get("npsh_margin")),
+        "mensagem": None,
+    }
+
+
+def _float(value):
+    return None if value is None else float(value)
+
+
+def _message_row(request_id, message):
+    row = dict.fromkeys(RESULT_FIELDS)
+    row.update(id=request_id, mensagem=message)
+    return row
+
+
+# --------------------------------------------------------------------------------------------------
+# Execução em lote
+# --------------------------------------------------------------------------------------------------
+
+def ensure_snapshot(snapshot_path=SNAPSHOT_PATH, db_path=DB_PATH):
+    """Garante um snapshot do catálogo atualizado, para que os processos compartilhem o mesmo arquivo mapeado."""
+    if load_snapshot(snapshot_path, db_path) is None and os.path.exists(db_path):
+        n = export_snapshot(db_path, snapshot_path)
+        logging.info(f"Snapshot do catálogo atualizado: {n} bombas em {snapshot_path}")
+
+
+def _select_chunk(job):
+    specs, top = job
+    return [select_duty(spec, top) for spec in specs]
+
+
+def run_batch(specs, top=None, max_workers=None, chunksize=None):
+    """
+    Executa a seleção de uma lista de especificações.
+
+    Parâmetros:
+        specs (list): especificações (read_duty_specs)
+        top (int): número máximo de bombas por especificação
+        max_workers (int): processos de trabalho (padrão: número de CPUs; 1 executa no próprio processo)
+        chunksize (int): especificações por tarefa enviada aos processos
+
+    Retorna:
+        gerador: linhas do resultado, na ordem das especificações, à medida que ficam prontas
+    """
+    ensure_snapshot()
+    n_workers = max_workers or os.cpu_count() or 1
+    if n_workers == 1 or len(specs) <= 1:
+        for spec in specs:
+            yield from select_duty(spec, top)
+        return
+
+    chunksize = chunksize or max(1, min(32, len(specs) // (4 * n_workers)))
+    jobs = [(specs[i:i + chunksize], top) for i in range(0, len(specs), chunksize)]
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        for chunk in executor.map(_select_chunk, jobs):
+            for rows in chunk:
+                yield from rows
+
+
+def write_results(rows, output_path, output_format=None, batch_size=1000):
+    """
+    Grava as linhas do resultado à medida que são produzidas.
+
+    Parâmetros:
+        rows: iterável de linhas (RESULT_FIELDS)
+        output_path (str): arquivo de saída ('-' para a saída padrão, apenas JSONL)
+        output_format (str): 'jsonl' ou 'parquet' (padrão: pela extensão do arquivo)
+        batch_size (int): linhas por grupo gravado no Parquet
+
+    Retorna:
+        int: número de linhas gravadas
+    """
+    output_format = output_format or ("parquet" if output_path.lower().endswith(".parquet") else "jsonl")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Formato de saída não suportado: {output_format}")
+    if output_format == "parquet":
+        return _write_parquet(rows, output_path, batch_size)
+
+    count = 0
+    f = open(output_path, "w", encoding="utf-8") if output_path != "-" else None
+    out = f if f is not None else sys.stdout
+    try:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            out.flush()
+            count += 1
+    finally:
+        if f is not None:
+            f.close()
+    return count
+
+
+def _write_parquet(rows, output_path, batch_size):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:  # pyarrow é opcional
+        raise RuntimeError("A saída Parquet requer o pacote pyarrow (pip install pyarrow).")
+
+    text = pa.string()
+    schema = pa.schema([(field, text if field in ("id", "marca", "modelo", "diametro", "rotacao", "estagios",
+                                                   "mensagem")
+                         else pa.int32() if field == "rank" else pa.float64())
+                        for field in RESULT_FIELDS])
+    count = 0
+    batch = []
+    with pq.ParquetWriter(output_path, schema) as writer:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Módulo: catalog_snapshot.py
+Descrição:
+    Exporta o catálogo de bombas (tabela pump_models) para um snapshot binário compacto e versionado,
+    e carrega esse snapshot via np.memmap, sem ler o arquivo inteiro na abertura.
+
+Formato do arquivo (little-endian, blocos alinhados em ALIGNMENT bytes):
+    - Cabeçalho fixo (HEADER_STRUCT): assinatura, versão, número de bombas, largura dos vetores de
+      coeficientes, número de campos escalares e o deslocamento de cada bloco.
+    - Bloco de escalares: float64 [n_bombas, len(SCALAR_FIELDS)] (NULL gravado como NaN), incluindo a
+      rotação e o número de estágios convertidos para número (SCALAR_EXPRESSIONS).
+    - Bloco de coeficientes: float64 [n_bombas, len(CURVE_FIELDS), largura], com os coeficientes
+      alinhados à direita e completados com zeros à esquerda (np.polyval não é afetado).
+    - Índice de textos: int64 [n_bombas * len(STRING_FIELDS) + 1] com os deslocamentos de cada texto.
+    - Tabela de textos: UTF-8 concatenado (marca, modelo, diametro, rotacao, estagios de cada bomba).
+
+Funcionalidades:
+    - export_snapshot: lê o banco SQLite e grava o snapshot de forma atômica.
+    - CatalogSnapshot: abre o snapshot por memória mapeada; as páginas só são lidas quando acessadas
+      e são compartilhadas entre processos que abrem o mesmo arquivo.
+    - load_snapshot: retorna o snapshot se ele existir e estiver atualizado em relação ao banco.
+"""
+
+import json
+import os
+import sqlite3
+import struct
+
+import numpy as np
+
+# Caminhos padrão
+DB_PATH = "./src/db/pump_data.db"
+SNAPSHOT_PATH = "./src/db/pump_catalog.bin"
+
+MAGIC = b"PUMPCAT\0"
+FORMAT_VERSION = 2
+ALIGNMENT = 64
+
+# assinatura, versão, n_bombas, largura dos coeficientes, n_escalares,
+# deslocamentos: escalares, coeficientes, índice de textos, tabela de textos
+HEADER_STRUCT = struct.Struct("<8sIIII4Q")
+
+SCALAR_FIELDS = (
+    "vazao_min", "vazao_max", "eff_bop", "eff_bop_flow", "p80_eff_bop_flow", "p110_eff_bop_flow",
+    "shutoff_head", "max_head", "head_bop", "power_bop", "rotacao_rpm", "n_estagios",
+)
+# Campos escalares derivados de colunas de texto do banco (rotação e número de estágios numéricos)
+SCALAR_EXPRESSIONS = {"rotacao_rpm": "CAST(rotacao AS REAL)", "n_estagios": "CAST(estagios AS REAL)"}
+CURVE_FIELDS = ("coef_head", "coef_eff", "coef_npshr", "coef_power")
+STRING_FIELDS = ("marca", "modelo", "diametro", "rotacao", "estagios")
+
+
+def _align(offset: int) -> int:
+    """Arredonda o deslocamento para o próximo múltiplo de ALIGNMENT."""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def read_catalog(db_path: str = DB_PATH):
+    """
+    Lê todo o catálogo do banco de dados nos arrays usados pelo snapshot.
+
+    Parâmetros:
+        db_path (str): Caminho do banco de dados SQLite.
+
+    Retorna:
+        tuple: (strings, scalars, coefs)
+            strings: lista de tuplas com os campos de STRING_FIELDS de cada bomba
+            scalars: float64 [n_bombas, len(SCALAR_FIELDS)] (NULL como NaN)
+            coefs: float64 [n_bombas, len(CURVE_FIELDS), largura], alinhados à direita
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        columns = STRING_FIELDS + tuple(SCALAR_EXPRESSIONS.get(f, f) for f in SCALAR_FIELDS) + CURVE_FIELDS
+        rows = conn.execute(f"SELECT {', '.join(columns)} FROM pump_models ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+    n_pumps = len(rows)
+    n_str, n_scalar = len(STRING_FIELDS), len(SCALAR_FIELDS)
+
+    # Escalares: NULL vira NaN
+    scalars = np.array([[np.nan if v is None else v for v in row[n_str:n_str + n_scalar]] for row in rows],
+                       dtype="<f8").reshape(n_pumps, n_scalar)
+
+    # Coeficientes alinhados à direita em uma matriz de largura fixa
+    curves = [[json.loads(c) for c in row[n_str + n_scalar:]] for row in rows]
+    width = max((len(c) for pump in curves for c in pump), default=1)
+    coefs = np.zeros((n_pumps, len(CURVE_FIELDS), width), dtype="<f8")
+    for i, pump in enumerate(curves):
+        for j, c in enumerate(pump):
+            if c:
+                coefs[i, j, width - len(c):] = c
+
+    return [tuple(str(v) for v in row[:n_str]) for row in rows], scalars, coefs
+
+
+def export_snapshot(db_path: str = DB_PATH, snapshot_path: str = SNAPSHOT_PATH) -> int:
+    """
+    Exporta todo o catálogo do banco de dados para o snapshot binário.
+
+    O arquivo é gravado em um temporário e renomeado ao final, de modo que leitores
+    nunca vejam um snapshot incompleto.
+
+    Parâmetros:
+        db_path (str): Caminho do banco de dados SQLite.
+        snapshot_path (str): Caminho do snapshot de saída.
+
+    Retorna:
+        int: Número de bombas exportadas.
+    """
+    strings, scalars, coefs = read_catalog(db_path)
+    n_pumps, n_scalar = scalars.shape
+    width = coefs.shape[2]
+
+    # Tabela de textos com índice de deslocamentos
+    encoded = [v.encode("utf-8") for row in strings for v in row]
+    string_index = np.zeros(len(encoded) + 1, dtype="<i8")
+    string_index[1:] = np.cumsum([len(b) for b in encoded])
+    string_blob = b"".join(encoded)
+
+    scalars_offset = _align(HEADER_STRUCT.size)
+    coefs_offset = _align(scalars_offset + scalars.nbytes)
+    index_offset = _align(coefs_offset + coefs.nbytes)
+    strings_offset = _align(index_offset + string_index.nbytes)
+
+    header = HEADER_STRUCT.pack(MAGIC, FORMAT_VERSION, n_pumps, width, n_scalar,
+                                scalars_offset, coefs_offset, index_offset, strings_offset)
+
+    tmp_path = snapshot_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for offset, block in ((0, header), (scalars_offset, scalars.tobytes()), (coefs_offset, coefs.tobytes()),
+                              (index_offset, string_index.tobytes()), (strings_offset, string_blob)):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(block)
+    os.replace(tmp_path, snapshot_path)
+
+    return n_pumps
+
+
+class CatalogSnapshot:
+    """
+    Catálogo de bombas carregado de um snapshot binário por memória mapeada.
+
+    Os blocos numéricos são visões (np.ndarray) sobre o np.memmap do arquivo; nada é copiado
+    na abertura e os textos só são decodificados quando uma bomba é acessada.
+    """
+
+    def __init__(self, snapshot_path: str = SNAPSHOT_PATH):
+        self.path = snapshot_path
+        self._buffer = np.memmap(snapshot_path, dtype=np.uint8, mode="r")
+        if self._buffer.size < HEADER_STRUCT.size:
+            raise ValueError(f"Snapshot inválido: {snapshot_path}")
+
+        (magic, version, n_pumps, width, n_scalar,
+         scalars_offset, coefs_offset, index_offset, strings_offset) = HEADER_STRUCT.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Snapshot inválido: {snapshot_path}")
+        if version != FORMAT_VERSION or n_scalar != len(SCALAR_FIELDS):
+            raise ValueError(f"Versão do snapshot não suportada: {version}")
+
+        self.n_pumps = n_pumps
+        self.scalars = np.ndarray((n_pumps, n_scalar), dtype="<f8", buffer=self._buffer, offset=scalars_offset)
+        self.coefs = np.ndarray((n_pumps, len(CURVE_FIELDS), width), dtype="<f8",
+                                buffer=self._buffer, offset=coefs_offset)
+        self._string_index = np.ndarray(n_pumps * len(STRING_FIELDS) + 1, dtype="<i8",
+                                        buffer=self._buffer, offset=index_offset)
+        self._strings_offset = strings_offset
+
+    def __len__(self) -> int:
+        return self.n_pumps
+
+    def scalar(self, field: str) -> np.ndarray:
+        """Retorna a coluna de um campo escalar para todas as bombas (NaN onde não houver valor)."""
+        return self.scalars[:, SCALAR_FIELDS.index(field)]
+
+    def curve(self, field: str) -> np.ndarray:
+        """Retorna a matriz [n_bombas, largura] de coeficientes de uma curva."""
+        return self.coefs[:, CURVE_FIELDS.index(field)]
+
+    def strings(self, index: int) -> dict:
+        """Decodifica os campos de texto (marca, modelo, diametro, rotacao, estagios) de uma bomba."""
+        base = index * len(STRING_FIELDS)
+        bounds = self._string_index[base:base + len(STRING_FIELDS) + 1] + self._strings_offset
+        return {
+            field: bytes(self._buffer[bounds[k]:bounds[k + 1]]).decode("utf-8")
+            for k, field in enumerate(STRING_FIELDS)
+        }
+
+    def pump(self, index: int) -> dict:
+        """
+        Retorna uma bomba no mesmo formato de uma linha de pump_models.
+
+        Os coeficientes são devolvidos sem os zeros de preenchimento à esquerda.
+        """
+        record = self.strings(index)
+        for k, field in enumerate(SCALAR_FIELDS):
+            value = float(self.scalars[index, k])
+            record[field] = None if np.isnan(value) else value
+        for k, field in enumerate(CURVE_FIELDS):
+            coef = np.trim_zeros(self.coefs[index, k], "f")
+            record[field] = np.array(coef if coef.size else [0.0])
+        return record
+
+
+# Snapshots abertos neste processo: caminho -> (identificação do arquivo, CatalogSnapshot)
+_snapshot_cache = {}
+
+
+def load_snapshot(snapshot_path: str = SNAPSHOT_PATH, db_path: str = DB_PATH):
+    """
+    Abre o snapshot do catálogo, se ele existir e não for mais antigo que o banco de dados.
+
+    O snapshot aberto fica em cache no processo e é reaproveitado enquanto o arquivo não for substituído
+    (export_snapshot grava um novo arquivo), sem reabrir o mapeamento a cada chamada.
+
+    Parâmetros:
+        snapshot_path (str): Caminho do snapshot.
+        db_path (str): Caminho do banco de dados usado para verificar se o snapshot está atualizado.
+
+    Retorna:
+        CatalogSnapshot ou None: None se o snapshot não existir, estiver desatualizado ou for inválido.
+    """
+    try:
+        stat = os.stat(snapshot_path)
+        if os.path.exists(db_path) and stat.st_mtime < os.path.getmtime(db_path):
+            return None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = _snapshot_cache.get(snapshot_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        snapshot = CatalogSnapshot(snapshot_path)
+        _snapshot_cache[snapshot_path] = (key, snapshot)
+        return snapshot
+    except (OSError, ValueError):
+        return None
+
+
+def load_catalog_arrays(snapshot_path: str = SNAPSHOT_PATH, db_path: str = DB_PATH):
+    """
+    Retorna o catálogo completo em arrays, a partir do snapshot (se atualizado) ou do banco de dados.
+
+    Retorna:
+        tuple: (scalars, coefs, strings), onde scalars e coefs seguem o formato do snapshot e
+               strings(index) retorna o dicionário de textos (marca, modelo, ...) de uma bomba.
+    """
+    snapshot = load_snapshot(snapshot_path, db_path)
+    if snapshot is not None:
+        return snapshot.scalars, snapshot.coefs, snapshot.strings
+
+    rows, scalars, coefs = read_catalog(db_path)
+    return scalars, coefs, lambda index: dict(zip(STRING_FIELDS, rows[index]))
+
+
+if __name__ == "__main__":
+    n = export_snapshot()
+    print(f"{n} bombas exportadas para {SNAPSHOT_PATH}")
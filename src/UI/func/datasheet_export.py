@@ -0,0 +1,191 @@
+"""
+Módulo: datasheet_export.py
+Descrição:
+    Exportação, sem interface gráfica, das folhas de dados (datasheets) de seleções de bombas.
+
+    Cada seleção (sistema + bomba) é desenhada com a mesma lógica de plotagem da aba de seleção
+    (PumpGraphPlotter), sobre o canvas Agg do matplotlib, sem Qt. As seleções são renderizadas em
+    processos separados; cada processo cria uma única figura e a reaproveita para todas as suas seleções,
+    atualizando os artistas em vez de recriar a figura.
+
+Funcionalidades:
+    - HeadlessPumpGraph: PumpGraphPlotter com canvas Agg.
+    - render_datasheet: desenha uma seleção e grava a folha de dados nos formatos pedidos.
+    - export_datasheets: exporta uma lista de seleções em paralelo (ProcessPoolExecutor).
+
+Formato de uma seleção (dicionário):
+    'pump': dicionário da bomba no formato de auto_pump_selection (com 'ponto_intersecao')
+    'system_curve': coeficientes da curva do sistema (head x vazão total)
+    'target_flow': vazão total de projeto (m³/h)
+    'n_bombas': número de bombas em paralelo (padrão: 1)
+    'npsh_disponivel': NPSH disponível, valor único ou par (vazões, valores) interpolado na grade
+                       dos gráficos (opcional)
+    'name': nome base dos arquivos de saída (opcional)
+"""
+
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from UI.pump_graph_plotter import PumpGraphPlotter
+
+EXPORT_FORMATS = ("png", "svg", "pdf")
+DATASHEET_FIGSIZE = (8.27, 11.69)   # A4 retrato (polegadas)
+DATASHEET_DPI = 150
+FLOW_MARGIN = 1.4                   # vazão máxima dos gráficos em relação à vazão de projeto por bomba
+N_FLOW_POINTS = 500                 # pontos da grade de vazões dos gráficos
+DATASHEET_TOP = 0.91                # topo dos gráficos, abaixo do título da folha de dados
+
+
+class HeadlessPumpGraph(PumpGraphPlotter):
+    """Gráficos de seleção de bombas desenhados no canvas Agg, sem interface gráfica."""
+
+    def __init__(self, figsize=DATASHEET_FIGSIZE):
+        super().__init__()
+        self.create_figure(figsize)
+        self.figure.subplots_adjust(top=DATASHEET_TOP)
+        self.canvas = FigureCanvasAgg(self.figure)
+
+    def refresh(self, full=False, axes=None, relayout=False):
+        """Nada a fazer: o layout é fixo e a figura só é desenhada ao ser salva."""
+
+
+def _npsh_on_grid(npsh_disponivel, flow_values):
+    """NPSH disponível na grade de vazões: valor único, par (vazões, valores) interpolado ou None."""
+    if npsh_disponivel is None or isinstance(npsh_disponivel, (int, float)):
+        return npsh_disponivel
+    flow, values = npsh_disponivel
+    return np.interp(flow_values, flow, values)
+
+
+def datasheet_title(pump, n_bombas):
+    """Título da folha de dados: identificação da bomba e resumo do ponto de operação."""
+    suffix = 's' if n_bombas > 1 else ''
+    identification = (f"{pump.get('marca', 'N/D')} {pump.get('modelo', 'N/D')} - rotor {pump.get('diametro', 'N/D')}, "
+                      f"{pump.get('rotacao', 'N/D')} rpm, {pump.get('estagios', 'N/D')} estágio(s)")
+    operating_point = (f"Q = {pump.get('vazao_bomba', 0):.2f} m³/h por bomba ({n_bombas} bomba{suffix}), "
+                       f"H = {pump.get('head_value', 0):.2f} m, η = {pump.get('pump_eff', 0):.1f}%, "
+                       f"P = {pump.get('pump_power', 0):.2f} cv, NPSHr = {pump.get('pump_npshr', 0):.2f} m")
+    return f"{identification}\n{operating_point}"
+
+
+def datasheet_name(index, selection):
+    """Nome base dos arquivos de uma seleção (campo 'name' ou número, marca, modelo e diâmetro)."""
+    if selection.get('name'):
+        return selection['name']
+    pump = selection['pump']
+    name = f"{index + 1:03d}_{pump.get('marca', '')}_{pump.get('modelo', '')}_{pump.get('diametro', '')}"
+    return re.sub(r'[^\w.-]+', '_', name)
+
+
+def render_datasheet(graph, selection, output_base, formats=("pdf",), dpi=DATASHEET_DPI):
+    """
+    Desenha uma seleção na figura informada e grava a folha de dados.
+
+    Reproduz a sequência da aba de seleção: atualização do sistema para o número de bombas em paralelo
+    (update_parallel_pumps) seguida da bomba selecionada (update_plots), com as mesmas grades de vazão.
+
+    Parâmetros:
+        graph (PumpGraphPlotter): gráficos a reaproveitar (ex.: HeadlessPumpGraph)
+        selection (dict): seleção no formato descrito no módulo
+        output_base (str): caminho dos arquivos de saída, sem extensão
+        formats (tuple): formatos de saída (subconjunto de EXPORT_FORMATS)
+        dpi (int): resolução das imagens PNG
+
+    Retorna:
+        list: caminhos dos arquivos gravados
+    """
+    pump = selection['pump']
+    system_curve = selection['system_curve']
+    n_bombas = int(selection.get('n_bombas', 1))
+    npsh_disponivel = selection.get('npsh_disponivel')
+    vazao_por_bomba = selection['target_flow'] / n_bombas
+
+    system_flow = np.linspace(0, vazao_por_bomba * FLOW_MARGIN, N_FLOW_POINTS)
+    pump_flow = np.linspace(0, max(pump.get('pump_vazao_max', 0), vazao_por_bomba * FLOW_MARGIN), N_FLOW_POINTS)
+    intersection_point = pump.get('ponto_intersecao', [pump.get('vazao_bomba', 0), pump.get('head_value', 0)])
+
+    graph.reset_scales()
+    graph.update_parallel_pumps(system_curve, system_flow, n_bombas, _npsh_on_grid(npsh_disponivel, system_flow))
+    graph.update_plots(
+        system_curve=system_curve,
+        pump_data=pump,
+        flow_values=pump_flow,
+        n_bombas=n_bombas,
+        intersection_point=intersection_point,
+        npsh_disponivel=_npsh_on_grid(npsh_disponivel, pump_flow),
+        is_new_system=False
+    )
+    graph.update_legends()
+    graph.figure.suptitle(datasheet_title(pump, n_bombas), fontsize=10, y=0.985)
+
+    paths = []
+    for fmt in formats:
+        path = f"{output_base}.{fmt}"
+        graph.figure.savefig(path, format=fmt, dpi=dpi)
+        paths.append(path)
+    return paths
+
+
+# Figura de cada processo de trabalho, criada uma única vez pelo inicializador do pool
+_worker_graph = None
+
+
+def _init_worker(figsize):
+    """Inicializador dos processos de trabalho: cria a figura reaproveitada por todas as seleções."""
+    global _worker_graph
+    _worker_graph = HeadlessPumpGraph(figsize)
+
+
+def _render_job(job):
+    """Renderiza uma seleção na figura do processo de trabalho."""
+    selection, output_base, formats, dpi = job
+    return render_datasheet(_worker_graph, selection, output_base, formats, dpi)
+
+
+def export_datasheets(selections, output_dir, formats=("pdf",), max_workers=None,
+                      figsize=DATASHEET_FIGSIZE, dpi=DATASHEET_DPI):
+    """
+    Exporta as folhas de dados de uma lista de seleções.
+
+    Parâmetros:
+        selections (list): seleções no formato descrito no módulo
+        output_dir (str): diretório de saída (criado se não existir)
+        formats (tuple): formatos de saída (subconjunto de EXPORT_FORMATS)
+        max_workers (int): número máximo de processos de renderização (padrão: número de CPUs)
+        figsize (tuple): tamanho da figura em polegadas
+        dpi (int): resolução das imagens PNG
+
+    Retorna:
+        list: caminhos dos arquivos gravados, na ordem das seleções
+    """
+    invalid = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if invalid:
+        raise ValueError(f"Formato(s) de exportação não suportado(s): {', '.join(invalid)}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = [(selection, os.path.join(output_dir, datasheet_name(i, selection)), tuple(formats), dpi)
+            for i, selection in enumerate(selections)]
+    if not jobs:
+        return []
+
+    if len(jobs) == 1 or max_workers == 1:
+        # Poucas seleções não compensam o custo de subir o pool de processos
+        graph = HeadlessPumpGraph(figsize)
+        results = [render_datasheet(graph, *job) for job in jobs]
+    else:
+        n_workers = max_workers or os.cpu_count() or 1
+        # spawn: o processo chamador pode ser a interface Qt, que não deve ser duplicada por fork
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(figsize,)) as executor:
+            chunksize = max(1, len(jobs) // (4 * n_workers))
+            results = list(executor.map(_render_job, jobs, chunksize=chunksize))
+
+    paths = [path for result in results for path in result]
+    logging.info("%d folha(s) de dados exportada(s) em %s", len(jobs), output_dir)
+    return paths
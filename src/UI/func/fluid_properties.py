@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Módulo: fluid_properties.py
+Descrição:
+    Serviço de propriedades de fluidos em função da temperatura: massa específica, viscosidade dinâmica
+    e pressão de vapor do líquido, a partir de tabelas pré-calculadas com o CoolProp.
+
+Funcionalidades:
+    - Monta, no primeiro uso de cada fluido, uma tabela densa T -> (rho, mu, p_vap) com a interface de
+      baixo nível do CoolProp (AbstractState), sem chamar PropsSI ponto a ponto.
+    - Abaixo da temperatura de ebulição a 1 atm, usa o líquido a pressão atmosférica; acima dela, o
+      líquido saturado (a bomba precisa operar com líquido).
+    - Grava a tabela em disco (TABLE_DIR ou, se este não puder ser gravado, USER_TABLE_DIR); as próximas
+      execuções apenas leem o arquivo. O arquivo é refeito se a versão do CoolProp ou os parâmetros da
+      grade mudarem.
+    - FluidPropertyTable interpola os valores de forma vetorizada (viscosidade e pressão de vapor em
+      escala logarítmica), para um valor ou para um array de temperaturas.
+"""
+
+import os
+from functools import lru_cache
+from importlib import metadata
+
+import numpy as np
+
+# Fluidos disponíveis: nome exibido -> nome no CoolProp
+FLUIDS = {
+    "Água": "Water",
+    "Etanol": "Ethanol",
+    "Metanol": "Methanol",
+    "Tolueno": "Toluene",
+    "Benzeno": "Benzene",
+    "n-Hexano": "n-Hexane",
+    "n-Heptano": "n-Heptane",
+}
+
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "db", "fluid_tables")
+# Cache do usuário, usado quando TABLE_DIR não existe e não pode ser criado ou gravado (ex.: instalação
+# somente leitura)
+USER_TABLE_DIR = os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "selecionador_bombas", "fluid_tables"
+)
+# Ordem de leitura e de gravação; a variável de ambiente FLUID_TABLE_DIR substitui ambos os diretórios
+# (ex.: benchmark de inicialização com cache frio)
+TABLE_DIRS = (os.environ["FLUID_TABLE_DIR"],) if os.environ.get("FLUID_TABLE_DIR") else (TABLE_DIR, USER_TABLE_DIR)
+TABLE_FORMAT_VERSION = 1
+TABLE_POINTS = 600           # pontos da tabela por fluido
+T_MAX_REDUCED = 0.9          # temperatura máxima da tabela como fração da temperatura crítica
+P_ATM = 101325.0             # pressão de referência (Pa)
+
+
+def _table_signature():
+    """Identifica a versão do formato, da grade e do CoolProp usados para montar as tabelas."""
+    try:
+        coolprop_version = metadata.version("CoolProp")
+    except metadata.PackageNotFoundError:
+        coolprop_version = "?"
+    return f"v{TABLE_FORMAT_VERSION};n={TABLE_POINTS};tr={T_MAX_REDUCED};p={P_ATM};coolprop={coolprop_version}"
+
+
+def build_table(coolprop_name):
+    """
+    Calcula a tabela de propriedades de um fluido com o CoolProp.
+
+    Parâmetros:
+        coolprop_name (str): Nome do fluido no CoolProp (ex.: "Water").
+
+    Retorna:
+        tuple: (T, rho, mu, p_vap) com T em K, rho em kg/m³, mu em Pa.s e p_vap em Pa
+    """
+    import CoolProp.CoolProp as CP
+
+    state = CP.AbstractState("HEOS", coolprop_name)
+    T = np.linspace(state.Ttriple() + 0.01, T_MAX_REDUCED * state.T_critical(), TABLE_POINTS)
+    rho, mu, p_vap = np.empty_like(T), np.empty_like(T), np.empty_like(T)
+
+    for i, temperature in enumerate(T):
+        state.unspecify_phase()
+        state.update(CP.QT_INPUTS, 0.0, temperature)
+        p_vap[i] = state.p()
+        if p_vap[i] < P_ATM:
+            # Líquido comprimido à pressão atmosférica
+            state.specify_phase(CP.iphase_liquid)
+            state.update(CP.PT_INPUTS, P_ATM, temperature)
+        rho[i] = state.rhomass()
+        mu[i] = state.viscosity()
+
+    return T, rho, mu, p_vap
+
+
+class FluidPropertyTable:
+    """
+    Tabela de propriedades de um fluido, com interpolação vetorizada em função da temperatura (°C).
+    """
+
+    def __init__(self, name, T, rho, mu, p_vap):
+        self.name = name
+        self.T = np.asarray(T)
+        self._rho = np.asarray(rho)
+        self._log_mu = np.log(mu)
+        self._log_p_vap = np.log(p_vap)
+
+    @property
+    def t_min(self):
+        """Menor temperatura da tabela (°C)."""
+        return float(self.T[0] - 273.15)
+
+    @property
+    def t_max(self):
+        """Maior temperatura da tabela (°C)."""
+        return float(self.T[-1] - 273.15)
+
+    def _kelvin(self, temperature):
+        T = np.asarray(temperature, dtype=float) + 273.15
+        if np.any(T < self.T[0]) or np.any(T > self.T[-1]):
+            raise ValueError(f"Temperatura fora da faixa da tabela de {self.name} "
+                             f"({self.t_min:.1f} a {self.t_max:.1f} °C).")
+        return T
+
+    def rho(self, temperature):
+        """Massa específica (kg/m³) para uma ou mais temperaturas (°C)."""
+        return np.interp(self._kelvin(temperature), self.T, self._rho)
+
+    def mu(self, temperature):
+        """Viscosidade dinâmica (Pa.s) para uma ou mais temperaturas (°C)."""
+        return np.exp(np.interp(self._kelvin(temperature), self.T, self._log_mu))
+
+    def p_vapor(self, temperature):
+        """Pressão de vapor (Pa) para uma ou mais temperaturas (°C)."""
+        return np.exp(np.interp(self._kelvin(temperature), self.T, self._log_p_vap))
+
+    def __call__(self, temperature):
+        """Retorna um dicionário com 'rho' (kg/m³), 'mu' (Pa.s) e 'p_vapor' (Pa)."""
+        return {"rho": self.rho(temperature), "mu": self.mu(temperature), "p_vapor": self.p_vapor(temperature)}
+
+
+@lru_cache(maxsize=None)
+def get_fluid_table(fluid, table_dir=None):
+    """
+    Retorna a tabela de propriedades de um fluido, lendo-a do disco ou calculando-a no primeiro uso.
+
+    Parâmetros:
+        fluid (str): Nome exibido (chave de FLUIDS) ou nome no CoolProp.
+        table_dir (str): Diretório do cache das tabelas. Por padrão, TABLE_DIRS: a tabela é lida do
+                         primeiro diretório que a tiver e gravada no primeiro que aceitar a gravação.
+
+    Retorna:
+        FluidPropertyTable
+    """
+    coolprop_name = FLUIDS.get(fluid, fluid)
+    table_dirs = TABLE_DIRS if table_dir is None else (table_dir,)
+    signature = _table_signature()
+
+    for directory in table_dirs:
+        try:
+            with np.load(os.path.join(directory, f"{coolprop_name}.npz")) as data:
+                if str(data["signature"]) == signature:
+                    return FluidPropertyTable(fluid, data["T"], data["rho"], data["mu"], data["p_vap"])
+        except (OSError, KeyError, ValueError):
+            pass
+
+    T, rho, mu, p_vap = build_table(coolprop_name)
+    for directory in table_dirs:
+        path = os.path.join(directory, f"{coolprop_name}.npz")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, signature=signature, T=T, rho=rho, mu=mu, p_vap=p_vap)
+            os.replace(tmp_path, path)
+            break
+        except OSError:
+            # Sem permissão de escrita: tenta o próximo diretório (a tabela continua válida em memória)
+            continue
+    return FluidPropertyTable(fluid, T, rho, mu, p_vap)
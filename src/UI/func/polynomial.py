@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Módulo: polynomial.py
+Descrição:
+    Avaliação vetorizada dos polinômios do catálogo (coeficientes na ordem de np.polyval, alinhados à
+    direita e completados com zeros). Não depende de outros módulos do aplicativo, de modo que pode ser
+    importado pela seleção, pela correção de viscosidade e pelos otimizadores sem ciclos de importação.
+
+Funcionalidades:
+    - polyval_rows: avalia um polinômio por linha de coeficientes pelo método de Horner.
+"""
+
+import numpy as np
+
+
+def polyval_rows(coefs, x):
+    """
+    Avalia vários polinômios de uma vez pelo método de Horner.
+
+    Parâmetros:
+        coefs: array [n, grau + 1] com os coeficientes de cada polinômio (ordem de np.polyval)
+        x: array de pontos, com broadcasting contra a primeira dimensão de coefs (ex.: [n, F] ou [n, 1, 1])
+
+    Retorna:
+        Array com o valor de cada polinômio nos pontos correspondentes
+    """
+    coefs = np.asarray(coefs)
+    shape = (coefs.shape[0],) + (1,) * (np.ndim(x) - 1)
+    result = np.zeros(np.broadcast(coefs[:, 0].reshape(shape), x).shape)
+    for k in range(coefs.shape[1]):
+        result = result * x + coefs[:, k].reshape(shape)
+    return result
@@ -0,0 +1,257 @@
+"""
+Módulo: pipe_network.py
+Descrição:
+    Resolve redes de tubulação com ramificações e malhas (coletores, anéis) pelo método do gradiente
+    global (Newton-Raphson de Todini-Pilati) e gera a curva do sistema vista pela bomba.
+
+Funcionalidades:
+    - PipeNetwork: grafo de nós (com cota e consumo), reservatórios (carga fixa) e tubos (diâmetro,
+      comprimento efetivo e soma dos coeficientes de perda local K).
+    - solve: calcula vazões nos tubos e cargas nos nós. As perdas de todos os tubos são avaliadas de
+      uma vez pelo mesmo núcleo vetorizado da curva do sistema (friction_head_loss / Colebrook-White).
+    - system_curve: altura manométrica exigida da bomba para uma lista de vazões, reaproveitando a
+      solução anterior como estimativa inicial de cada ponto.
+
+    O sistema linear de cada iteração (complemento de Schur A21·D⁻¹·A12, simétrico e esparso) é montado
+    em formato de triplas (COO). Se o scipy estiver instalado, é resolvido como matriz esparsa; caso
+    contrário, é montado denso com NumPy, o que é suficiente para redes de algumas centenas de nós.
+"""
+
+import numpy as np
+
+from UI.func.pressure_drop.total_head_loss import friction_head_loss
+
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.linalg import spsolve
+except ImportError:  # scipy é opcional
+    coo_matrix = None
+    spsolve = None
+
+# Acima deste número de nós com carga desconhecida, usa o solver esparso (se disponível)
+SPARSE_MIN_NODES = 200
+# Velocidade usada na estimativa inicial das vazões (m/s)
+INITIAL_VELOCITY = 1.0
+# Limites da faixa de transição laminar-turbulento
+LAMINAR_RE = 2000.0
+TURBULENT_RE = 4000.0
+
+
+class PipeNetwork:
+    """
+    Rede de tubulação descrita como grafo de nós e tubos.
+
+    Convenções:
+        - Vazões e consumos em m³/h; cargas, cotas e comprimentos em m; diâmetros em m.
+        - A vazão de um tubo é positiva no sentido start -> end.
+        - O consumo (demand) de um nó é positivo quando o fluido sai da rede naquele nó.
+        - A carga (head) de um nó é a carga piezométrica (cota + pressão / ρg).
+    """
+
+    def __init__(self):
+        self.node_names = []
+        self._node_index = {}
+        self.elevations = []
+        self.demands = []
+        self.fixed_heads = {}
+        self._pipes = []
+
+    def _add(self, name, elevation, demand):
+        if name in self._node_index:
+            raise ValueError(f"Nó duplicado: {name}")
+        self._node_index[name] = len(self.node_names)
+        self.node_names.append(name)
+        self.elevations.append(float(elevation))
+        self.demands.append(float(demand))
+        return self._node_index[name]
+
+    def add_node(self, name, elevation=0.0, demand=0.0):
+        """Adiciona um nó de junção com cota (m) e consumo (m³/h)."""
+        self._add(name, elevation, demand)
+
+    def add_reservoir(self, name, head):
+        """Adiciona um reservatório (nó de carga fixa, m); a cota é igual ao nível."""
+        index = self._add(name, head, 0.0)
+        self.fixed_heads[index] = float(head)
+
+    def add_pipe(self, start, end, D, L, K=0.0):
+        """
+        Adiciona um tubo entre dois nós.
+
+        Parâmetros:
+            start, end: nomes dos nós de início e fim
+            D: diâmetro interno (m)
+            L: comprimento efetivo (m), podendo incluir o comprimento equivalente das singularidades
+            K: soma dos coeficientes de perda local do tubo
+        """
+        try:
+            self._pipes.append((self._node_index[start], self._node_index[end], float(D), float(L), float(K)))
+        except KeyError as e:
+            raise ValueError(f"Nó não encontrado: {e.args[0]}")
+
+    def index(self, name):
+        """Índice de um nó pelo nome."""
+        return self._node_index[name]
+
+    def _arrays(self):
+        pipes = np.array(self._pipes, dtype=float).reshape(-1, 5)
+        return (pipes[:, 0].astype(int), pipes[:, 1].astype(int), pipes[:, 2], pipes[:, 3], pipes[:, 4])
+
+    def head_losses(self, q, D, L, K, mu, rho, roughness, g=9.81):
+        """
+        Perda de carga (com sinal) e sua derivada em relação à vazão, para todos os tubos de uma vez.
+
+        Parâmetros:
+            q: vazões dos tubos (m³/s)
+            D, L, K: arrays com diâmetro, comprimento efetivo e K de cada tubo
+            mu: viscosidade dinâmica (Pa.s)
+
+        Retorna:
+            tuple: (perda de carga com o sinal da vazão (m), derivada dH/dq (s/m²))
+        """
+        area = np.pi * (D / 2)**2
+        abs_q = np.abs(q)
+        h_f = friction_head_loss(abs_q, D, L, mu, rho, roughness, g)
+        h_k = K * (abs_q / area)**2 / (2 * g)
+
+        # Derivada: laminar h_f ∝ q; turbulento h_f ≈ q² (a variação de f com q é desprezada)
+        laminar_coef = 32.0 * mu * L / (rho * g * D**2 * area)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = 2.0 * h_f / abs_q
+
+        # Laminar (Re < 2000) e faixa de transição (2000 <= Re < 4000): a perda é interpolada
+        # linearmente entre os dois regimes, para que H(q) seja contínua e o Newton não oscile
+        q_laminar = LAMINAR_RE * mu * area / (rho * D)
+        q_turbulent = TURBULENT_RE * mu * area / (rho * D)
+        laminar = abs_q < q_laminar
+        slope[laminar] = laminar_coef[laminar]
+        transition = ~laminar & (abs_q < q_turbulent)
+        if transition.any():
+            h_a = laminar_coef[transition] * q_laminar[transition]
+            h_b = friction_head_loss(q_turbulent[transition], D[transition], L[transition], mu, rho, roughness, g)
+            slope[transition] = (h_b - h_a) / (q_turbulent[transition] - q_laminar[transition])
+            h_f[transition] = h_a + slope[transition] * (abs_q[transition] - q_laminar[transition])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = slope + np.where(abs_q > 0, 2.0 * h_k / abs_q, 0.0)
+
+        return np.sign(q) * (h_f + h_k), slope
+
+    def solve(self, mu, rho, roughness, extra_demands=None, tol=1e-9, max_iter=50, initial=None, g=9.81):
+        """
+        Resolve a rede pelo método do gradiente global.
+
+        Parâmetros:
+            mu: viscosidade dinâmica (cP)
+            rho: densidade (kg/m³)
+            roughness: rugosidade absoluta (m)
+            extra_demands: dicionário {nome do nó: consumo (m³/h)} somado aos consumos dos nós
+            tol: tolerância na maior correção de vazão (m³/s)
+            max_iter: número máximo de iterações
+            initial: solução anterior (retorno de solve) usada como estimativa inicial
+
+        Retorna:
+            dict com 'flows' (m³/h por tubo), 'heads' (m por nó), 'pressure_heads' (m por nó,
+            carga - cota) e 'iterations'
+        """
+        if not self.fixed_heads:
+            raise ValueError("A rede precisa de ao menos um reservatório (nó de carga fixa).")
+
+        start, end, D, L, K = self._arrays()
+        mu = mu / 1000  # cP -> Pa.s
+        n_nodes = len(self.node_names)
+
+        demands = np.array(self.demands) / 3600.0
+        for name, value in (extra_demands or {}).items():
+            demands[self._node_index[name]] += value / 3600.0
+
+        fixed = np.zeros(n_nodes, dtype=bool)
+        fixed[list(self.fixed_heads)] = True
+        unknown = np.flatnonzero(~fixed)
+        position = np.full(n_nodes, -1)
+        position[unknown] = np.arange(unknown.size)
+
+        heads = np.zeros(n_nodes)
+        heads[list(self.fixed_heads)] = list(self.fixed_heads.values())
+        if initial is not None:
+            q = np.asarray(initial["flows"], dtype=float) / 3600.0
+            heads[unknown] = np.asarray(initial["heads"])[unknown]
+        else:
+            q = INITIAL_VELOCITY * np.pi * (D / 2)**2
+            heads[unknown] = np.mean(list(self.fixed_heads.values()))
+
+        # Tubos com cada extremidade desconhecida, para montar o complemento de Schur
+        s_pos, e_pos = position[start], position[end]
+        s_ok, e_ok = s_pos >= 0, e_pos >= 0
+        both = s_ok & e_ok
+
+        for iteration in range(1, max_iter + 1):
+            h_loss, slope = self.head_losses(q, D, L, K, mu, rho, roughness, g)
+            inv_slope = 1.0 / slope
+
+            # Resíduos: energia em cada tubo e continuidade em cada nó
+            f_energy = heads[end] - heads[start] + h_loss
+            f_mass = np.zeros(n_nodes)
+            np.add.at(f_mass, end, q)
+            np.add.at(f_mass, start, -q)
+            f_mass -= demands
+
+            # (A21·D⁻¹·A12)·dH = F2 - A21·D⁻¹·F1
+            w = inv_slope * f_energy
+            rhs_full = f_mass.copy()
+            np.add.at(rhs_full, end, -w)
+            np.add.at(rhs_full, start, w)
+            rhs = rhs_full[unknown]
+
+            rows = np.concatenate([s_pos[s_ok], e_pos[e_ok], s_pos[both], e_pos[both]])
+            cols = np.concatenate([s_pos[s_ok], e_pos[e_ok], e_pos[both], s_pos[both]])
+            vals = np.concatenate([inv_slope[s_ok], inv_slope[e_ok], -inv_slope[both], -inv_slope[both]])
+
+            if coo_matrix is not None and unknown.size >= SPARSE_MIN_NODES:
+                matrix = coo_matrix((vals, (rows, cols)), shape=(unknown.size, unknown.size)).tocsr()
+                d_heads = spsolve(matrix, rhs)
+            else:
+                matrix = np.zeros((unknown.size, unknown.size))
+                np.add.at(matrix, (rows, cols), vals)
+                d_heads = np.linalg.solve(matrix, rhs)
+
+            d_heads_full = np.zeros(n_nodes)
+            d_heads_full[unknown] = d_heads
+            d_q = -inv_slope * (f_energy + d_heads_full[end] - d_heads_full[start])
+
+            heads += d_heads_full
+            q += d_q
+            if np.max(np.abs(d_q), initial=0.0) < tol:
+                break
+
+        return {
+            "flows": q * 3600.0,
+            "heads": heads,
+            "pressure_heads": heads - np.array(self.elevations),
+            "iterations": iteration,
+        }
+
+    def system_curve(self, inlet, outlet, flow_values, mu, rho, roughness, **kwargs):
+        """
+        Curva do sistema vista por uma bomba instalada entre os nós inlet (sucção) e outlet (recalque).
+
+        Para cada vazão Q, a bomba retira Q da rede em inlet e a injeta em outlet; a altura manométrica
+        exigida é a diferença de carga entre os dois nós. Cada ponto parte da solução do anterior.
+
+        Parâmetros:
+            inlet, outlet: nomes dos nós de sucção e recalque da bomba
+            flow_values: vazões da bomba (m³/h)
+            mu, rho, roughness: propriedades do fluido e da tubulação (ver solve)
+            **kwargs: repassados para solve (tol, max_iter)
+
+        Retorna:
+            np.ndarray: altura manométrica exigida (m) para cada vazão
+        """
+        i_in, i_out = self._node_index[inlet], self._node_index[outlet]
+        heads = []
+        solution = None
+        for flow in np.atleast_1d(flow_values):
+            solution = self.solve(mu, rho, roughness, extra_demands={inlet: flow, outlet: -flow},
+                                  initial=solution, **kwargs)
+            heads.append(solution["heads"][i_out] - solution["heads"][i_in])
+        return np.array(heads)
@@ -1,6 +1,6 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from UI.extra.local_loss import size_dict_internal_diameter_sch40, size_dict, get_size_singularities_loss_values
+from UI.extra.local_loss import (size_dict_internal_diameter_sch40, size_dict, fittings_equivalent_length,
+                                 fittings_k_coefficients)
 import logging
 
 def friction_factor(Re, roughness, D, tol=1e-9, max_iter=100):
@@ -51,6 +51,45 @@ def friction_factor(Re, roughness, D, tol=1e-9, max_iter=100):
 
 
 
+def friction_factor_array(Re, roughness, D, tol=1e-9, max_iter=100):
+    """
+    Versão vetorizada de friction_factor: resolve Colebrook-White para todos os Reynolds de uma vez.
+    
+    A iteração de ponto fixo é aplicada ao array inteiro até que a maior variação seja menor
+    que a tolerância.
+    
+    Parâmetros:
+        Re: Números de Reynolds (escalar ou array)
+        roughness: Rugosidade absoluta da tubulação (m)
+        D: Diâmetro da tubulação (m)
+        tol: Tolerância para o critério de convergência
+        max_iter: Número máximo de iterações
+    
+    Retorna:
+        Array com o fator de atrito (f) para cada Reynolds
+    """
+    Re = np.atleast_1d(np.asarray(Re, dtype=float))
+    f = np.empty_like(Re)
+    
+    # Fluxo laminar
+    laminar = Re < 2000
+    with np.errstate(divide='ignore'):
+        f[laminar] = 64.0 / Re[laminar]
+    
+    # Fluxo turbulento - estimativa inicial de Swamee-Jain e iteração de Colebrook-White
+    Re_t = Re[~laminar]
+    epsilon = roughness / D
+    f_t = 0.25 / np.log10(epsilon/3.7 + 5.74/(Re_t**0.9))**2
+    for _ in range(max_iter):
+        f_new = (-2.0 * np.log10(epsilon/3.7 + 2.51/(Re_t * np.sqrt(f_t))))**(-2)
+        converged = f_new.size == 0 or np.max(np.abs(f_new - f_t)) < tol
+        f_t = f_new
+        if converged:
+            break
+    f[~laminar] = f_t
+    
+    return f
+
 def pressure_loss(D, L, Q, mu, rho, g, h, K, roughness):
     """
     Calcula a perda de carga total (em metros de coluna de fluido) para um trecho de tubulação,
@@ -82,11 +121,8 @@ def pressure_loss(D, L, Q, mu, rho, g, h, K, roughness):
     # Número de Reynolds
     Re = (rho * V * D) / mu
 
-    # Cálculo do fator de atrito para cada valor de Re, usando critério unificado: Re < 2000 é laminar
-    f = np.array([
-        64 / Re_i if Re_i < 2000 else friction_factor(Re_i, roughness, D)
-        for Re_i in Re
-    ])
+    # Cálculo do fator de atrito para todos os valores de Re (Re < 2000 é laminar)
+    f = friction_factor_array(Re, roughness, D)
 
     for flow_m3h, friction, reynolds in zip(Q * 3600.0, f, Re):
         logging.info("Vazão: %.6f m³/h, Fator de atrito: %.6f, Número de Reynolds: %.2f", flow_m3h, friction, reynolds)
@@ -109,12 +145,314 @@ def pressure_loss(D, L, Q, mu, rho, g, h, K, roughness):
     # Retorna escalar se a entrada era um único valor de vazão
     return h_total[0] if h_total.size == 1 else h_total
 
+def friction_head_loss(Q, D, L, mu, rho, roughness, g=9.81):
+    """
+    Perda de carga distribuída (m) por Darcy-Weisbach, com broadcasting entre Q, D, L, mu, rho e roughness.
+    
+    No regime laminar usa a forma de Hagen-Poiseuille, que é finita em Q = 0.
+    
+    Parâmetros:
+        Q: Vazão em m³/s (escalar ou array)
+        D: Diâmetro interno (m) (escalar ou array compatível com Q)
+        L: Comprimento efetivo (m) (escalar ou array compatível com Q)
+        mu: Viscosidade dinâmica (Pa.s) (escalar ou array compatível com Q)
+        rho: Densidade (kg/m³) (escalar ou array compatível com Q)
+        roughness: Rugosidade absoluta (m) (escalar ou array compatível com Q)
+        g: Aceleração da gravidade (m/s²)
+    
+    Retorna:
+        Array com a perda de carga no formato do broadcasting das entradas
+    """
+    Q, D, L, mu, rho, roughness = np.broadcast_arrays(*(np.asarray(v, dtype=float)
+                                                        for v in (Q, D, L, mu, rho, roughness)))
+    V = np.abs(Q) / (np.pi * (D / 2)**2)
+    Re = rho * V * D / mu
+    
+    h_f = np.empty_like(V)
+    laminar = Re < 2000
+    h_f[laminar] = 32.0 * mu[laminar] * L[laminar] * V[laminar] / (rho[laminar] * g * D[laminar]**2)
+    turbulent = ~laminar
+    f = friction_factor_array(Re[turbulent], roughness[turbulent], D[turbulent])
+    h_f[turbulent] = f * (L[turbulent] / D[turbulent]) * V[turbulent]**2 / (2 * g)
+    return h_f
+
+
+def local_head_loss(Q, D, k_coefficients, mu, rho, g=9.81):
+    """
+    Perda de carga localizada (m) pelo método K (constante, 2-K ou 3-K), com broadcasting entre Q e D.
+    
+    Com K_total = a/Re + b + c/D_pol**p (ver fittings_k_coefficients), a perda K·V²/2g fica
+    (a·ν·V/D + (b + c/D_pol**p)·V²) / 2g, que é finita em Q = 0 e custa poucas operações por vazão.
+    
+    Parâmetros:
+        Q: Vazão em m³/s (escalar ou array)
+        D: Diâmetro interno (m) (escalar ou array compatível com Q)
+        k_coefficients: tupla (a, b, c, p) de fittings_k_coefficients
+        mu: Viscosidade dinâmica (Pa.s)
+        rho: Densidade (kg/m³)
+        g: Aceleração da gravidade (m/s²)
+    
+    Retorna:
+        Array com a perda de carga localizada no formato do broadcasting de Q e D
+    """
+    a, b, c, p = k_coefficients
+    D = np.asarray(D, dtype=float)
+    V = np.abs(np.asarray(Q, dtype=float)) / (np.pi * (D / 2)**2)
+    K_turbulent = b + c * (D / 0.0254)**(-p)
+    return (a * (mu / rho) * V / D + K_turbulent * V**2) / (2 * g)
+
+
+# Grau do polinômio substituto da curva do sistema (mantém compatibilidade com quem usa np.polyval)
+SURROGATE_DEGREE = 5
+# Número de nós de Chebyshev usados no ajuste do substituto
+SURROGATE_NODES = 24
+
+
+class SystemCurve:
+    """
+    Curva do sistema H(Q) descrita pelos parâmetros físicos de cada trecho de tubulação.
+    
+    A altura manométrica é avaliada de forma exata e vetorizada sob demanda (Darcy-Weisbach com
+    Colebrook-White). Para busca de raízes e para o código que trabalha com coeficientes, mantém
+    em cache um polinômio substituto ajustado em nós de Chebyshev sobre [0, max_flow], e permite
+    refinar interseções com a curva exata.
+    
+    Parâmetros:
+        sections: lista de tuplas (D, L_eff, h) ou (D, L_eff, h, k) de cada trecho: diâmetro interno (m),
+                  comprimento efetivo (m), diferença de elevação (m) e, opcionalmente, os coeficientes
+                  (a, b, c, p) das perdas localizadas pelo método K (ver local_head_loss)
+        mu: viscosidade dinâmica (Pa.s)
+        rho: densidade (kg/m³)
+        roughness: rugosidade absoluta da tubulação (m)
+        max_flow: vazão máxima da curva (m³/h)
+        g: aceleração da gravidade (m/s²)
+        flow_scale: fator aplicado à vazão antes da avaliação (n bombas em paralelo: Q_total = n * Q)
+    """
+    
+    def __init__(self, sections, mu, rho, roughness, max_flow, g=9.81, flow_scale=1.0):
+        self.sections = [tuple(float(v) for v in section[:3]) for section in sections]
+        self.local_losses = [tuple(section[3]) if len(section) > 3 and section[3] is not None else None
+                             for section in sections]
+        self.mu = mu
+        self.rho = rho
+        self.roughness = roughness
+        self.max_flow = max_flow
+        self.g = g
+        self.flow_scale = flow_scale
+        self._coefficients = None
+    
+    @property
+    def static_head(self):
+        """Altura estática do sistema (m): soma das diferenças de elevação."""
+        return sum(h for _, _, h in self.sections)
+    
+    def section_loss(self, Q, index, include_height=True, mu=None, rho=None, roughness=None):
+        """
+        Perda de carga exata de um trecho (m) para uma ou mais vazões (m³/h).
+        
+        mu, rho e roughness, se informados, substituem os valores da curva e podem ser arrays com
+        broadcasting contra Q (ex.: uma linha por temperatura ou por amostra).
+        """
+        mu = self.mu if mu is None else mu
+        rho = self.rho if rho is None else rho
+        roughness = self.roughness if roughness is None else roughness
+        D, L, h = self.sections[index]
+        Q = np.atleast_1d(np.asarray(Q, dtype=float)) * self.flow_scale / 3600.0
+        h_f = friction_head_loss(Q, D, L, mu, rho, roughness, self.g)
+        if self.local_losses[index] is not None:
+            h_f = h_f + local_head_loss(Q, D, self.local_losses[index], mu, rho, self.g)
+        return h_f + h if include_height else h_f
+    
+    def head_batch(self, Q, mu=None, rho=None, roughness=None):
+        """
+        Altura manométrica (m) com propriedades substituídas, no formato do broadcasting entre Q
+        (m³/h) e os arrays de mu, rho e roughness (ver section_loss).
+        """
+        return sum(self.section_loss(Q, i, mu=mu, rho=rho, roughness=roughness) for i in range(len(self.sections)))
+    
+    def head(self, Q):
+        """Altura manométrica exata do sistema (m) para uma ou mais vazões (m³/h)."""
+        Q = np.asarray(Q, dtype=float)
+        total = sum(self.section_loss(Q, i) for i in range(len(self.sections)))
+        return total.reshape(Q.shape) if Q.ndim else float(total[0])
+    
+    __call__ = head
+    
+    @property
+    def coefficients(self):
+        """
+        Coeficientes (ordem de np.polyval) do polinômio substituto de grau SURROGATE_DEGREE.
+        
+        Ajustado por mínimos quadrados em SURROGATE_NODES nós de Chebyshev, o que aproxima o ajuste
+        minimax sem a varredura densa de vazões; calculado uma única vez por curva.
+        """
+        if self._coefficients is None:
+            k = np.arange(SURROGATE_NODES)
+            nodes = 0.5 * self.max_flow * (1 - np.cos(np.pi * (k + 0.5) / SURROGATE_NODES))
+            cheb = np.polynomial.Chebyshev.fit(nodes, self.head(nodes), SURROGATE_DEGREE,
+                                               domain=[0, self.max_flow])
+            self._coefficients = cheb.convert(kind=np.polynomial.Polynomial).coef[::-1]
+        return self._coefficients
+    
+    def for_parallel_pumps(self, n_bombas):
+        """Curva do sistema vista por cada uma de n bombas idênticas em paralelo (Q_total = n * Q)."""
+        sections = [section + (k,) for section, k in zip(self.sections, self.local_losses)]
+        return SystemCurve(sections, self.mu, self.rho, self.roughness, self.max_flow / n_bombas,
+                           g=self.g, flow_scale=self.flow_scale * n_bombas)
+    
+    def refine_intersection(self, coef_pump, x0, tol=1e-9, max_iter=20):
+        """
+        Refina uma interseção com a curva da bomba usando a curva exata do sistema.
+        
+        Usa iterações de Newton em H(Q) - H_bomba(Q), com a derivada obtida do polinômio
+        substituto (que difere pouco da derivada exata).
+        
+        Parâmetros:
+            coef_pump: coeficientes da curva de head da bomba
+            x0: estimativa inicial (interseção com o substituto)
+        
+        Retorna:
+            float: vazão da interseção (m³/h)
+        """
+        d_diff = np.polyder(np.polysub(self.coefficients, coef_pump))
+        x = float(x0)
+        for _ in range(max_iter):
+            slope = np.polyval(d_diff, x)
+            if slope == 0:
+                break
+            step = (self.head(x) - np.polyval(coef_pump, x)) / slope
+            x -= step
+            if abs(step) < tol * max(1.0, abs(x)):
+                break
+        return x
+
+
+def build_system_curve(suction_array, suction_size, discharge_array, discharge_size, target_flow_value, mu, rho, roughness,
+                       local_loss_method="eq_length"):
+    """
+    Monta a curva do sistema (SystemCurve) a partir das entradas da aba de sistema.
+    
+    Parâmetros: os mesmos de calculate_pipe_system_head_loss, além de
+        local_loss_method: método das perdas localizadas (LOCAL_LOSS_METHODS): "eq_length" soma o
+                           comprimento equivalente das singularidades ao comprimento do trecho;
+                           "k", "2k" e "3k" calculam a perda K·V²/2g junto com o atrito
+    
+    Retorna:
+        SystemCurve: curva com os trechos [sucção, descarga] e vazão máxima target_flow_value * 1.40
+    """
+    suction_array = np.array(suction_array)
+    discharge_array = np.array(discharge_array)
+    
+    # --- Comprimento efetivo e perdas localizadas de cada trecho ---
+    if local_loss_method == "eq_length":
+        # Comprimento físico + comprimento equivalente das singularidades informadas
+        # (quantidade de cada singularidade x comprimento equivalente no diâmetro do trecho)
+        L_eff_suction = suction_array[0] + fittings_equivalent_length(suction_array[2:], suction_size)
+        L_eff_discharge = discharge_array[0] + fittings_equivalent_length(discharge_array[2:], discharge_size)
+        k_suction = k_discharge = None
+    else:
+        L_eff_suction, L_eff_discharge = suction_array[0], discharge_array[0]
+        k_suction = fittings_k_coefficients(suction_array[2:], local_loss_method)
+        k_discharge = fittings_k_coefficients(discharge_array[2:], local_loss_method)
+    
+    # --- Diâmetros internos (convertendo de mm para m) ---
+    D_suction = size_dict_internal_diameter_sch40[suction_size] / 1000
+    D_discharge = size_dict_internal_diameter_sch40[discharge_size] / 1000
+    
+    # A altura de sucção entra com sinal negativo (sucção positiva reduz a altura manométrica)
+    sections = [
+        (D_suction, L_eff_suction, -suction_array[1], k_suction),
+        (D_discharge, L_eff_discharge, discharge_array[1], k_discharge),
+    ]
+    
+    # Viscosidade informada em cP; convertida para Pa.s
+    return SystemCurve(sections, mu / 1000, rho, roughness, max_flow=target_flow_value * 1.40)
+
+
+def evaluate_size_grid(suction_array, discharge_array, flow_values, mu, rho, roughness, p_vapor,
+                       p_atm=101325, sizes=None, g=9.81, local_loss_method="eq_length"):
+    """
+    Avalia a curva do sistema para todos os pares (diâmetro de sucção x diâmetro de recalque) de uma vez.
+    
+    As perdas de cada trecho são calculadas em uma única passada vetorizada sobre a grade
+    (diâmetros x vazões); a altura manométrica de cada par é obtida por broadcasting da soma
+    sucção + recalque, sem recalcular nenhum trecho. Usa as mesmas regras de comprimento efetivo
+    de build_system_curve, de modo que cada curva coincide com a de "Calcular" para o mesmo par.
+    
+    Parâmetros:
+        suction_array: [comprimento_sucção, altura_sucção, ...perdas_locais_sucção]
+        discharge_array: [comprimento_descarga, altura_descarga, ...perdas_locais_descarga]
+        flow_values: vazões (m³/h) em que as curvas são avaliadas
+        mu: viscosidade dinâmica (cP)
+        rho: densidade (kg/m³)
+        roughness: rugosidade absoluta da tubulação (m)
+        p_vapor: pressão de vapor do fluido (Pa)
+        p_atm: pressão atmosférica (Pa)
+        sizes: lista de chaves de size_dict a considerar (padrão: todas)
+        g: aceleração da gravidade (m/s²)
+        local_loss_method: método das perdas localizadas (ver build_system_curve)
+    
+    Retorna:
+        dict com:
+            'sizes': chaves dos diâmetros, na ordem dos eixos
+            'flow_values': vazões (m³/h), shape (F,)
+            'head': altura manométrica do sistema (m), shape (S, S, F) indexada por [sucção, recalque, vazão]
+            'velocity_suction', 'velocity_discharge': velocidades (m/s), shape (S, F)
+            'npsh_disponivel': NPSH disponível (m), shape (S, F) (depende apenas do diâmetro de sucção)
+    """
+    sizes = list(size_dict.keys()) if sizes is None else list(sizes)
+    suction_array = np.asarray(suction_array, dtype=float)
+    discharge_array = np.asarray(discharge_array, dtype=float)
+    flow_values = np.asarray(flow_values, dtype=float)
+    mu = mu / 1000  # cP -> Pa.s
+    
+    # Diâmetros internos (m) e comprimento efetivo de cada trecho em cada diâmetro
+    # (produto das quantidades de singularidades pela matriz de comprimentos equivalentes)
+    D = np.array([size_dict_internal_diameter_sch40[size] for size in sizes]) / 1000
+    if local_loss_method == "eq_length":
+        L_suction = suction_array[0] + fittings_equivalent_length(suction_array[2:], sizes)
+        L_discharge = discharge_array[0] + fittings_equivalent_length(discharge_array[2:], sizes)
+    else:
+        L_suction = np.full(len(sizes), suction_array[0])
+        L_discharge = np.full(len(sizes), discharge_array[0])
+    
+    # Grade (diâmetros x vazões)
+    Q = flow_values[np.newaxis, :] / 3600.0
+    area = np.pi * (D[:, np.newaxis] / 2)**2
+    velocity = Q / area
+    
+    loss_suction = friction_head_loss(Q, D[:, np.newaxis], L_suction[:, np.newaxis], mu, rho, roughness, g)
+    loss_discharge = friction_head_loss(Q, D[:, np.newaxis], L_discharge[:, np.newaxis], mu, rho, roughness, g)
+    if local_loss_method != "eq_length":
+        k_suction = fittings_k_coefficients(suction_array[2:], local_loss_method)
+        k_discharge = fittings_k_coefficients(discharge_array[2:], local_loss_method)
+        loss_suction += local_head_loss(Q, D[:, np.newaxis], k_suction, mu, rho, g)
+        loss_discharge += local_head_loss(Q, D[:, np.newaxis], k_discharge, mu, rho, g)
+    
+    # Altura manométrica de cada par: a altura de sucção entra com sinal negativo
+    static_head = discharge_array[1] - suction_array[1]
+    head = static_head + loss_suction[:, np.newaxis, :] + loss_discharge[np.newaxis, :, :]
+    
+    # NPSH disponível com a perda de sucção exata em cada vazão
+    npsh_disponivel = (p_atm - p_vapor) / (rho * g) + suction_array[1] - loss_suction
+    
+    return {
+        "sizes": sizes,
+        "flow_values": flow_values,
+        "head": head,
+        "velocity_suction": velocity,
+        "velocity_discharge": velocity.copy(),
+        "npsh_disponivel": npsh_disponivel,
+    }
+
+
 def calculate_pipe_system_head_loss(suction_array, suction_size, discharge_array, discharge_size, target_flow_value, mu, rho, roughness):
     """
     Calcula a curva de perda de carga do sistema considerando:
         - Trecho de sucção: inclui comprimento físico, perdas locais (singularidades) e elevação.
         - Trecho de descarga: inclui comprimento físico, perdas locais (singularidades) e elevação.
-    Realiza o ajuste polinomial de grau 5 da perda total x vazão.
+    A curva é avaliada de forma exata por SystemCurve; os coeficientes retornados são os do
+    polinômio substituto de grau 5 (nós de Chebyshev), sem a varredura de 1000 vazões.
 
     Parâmetros:
         suction_array: [comprimento_sucção, altura_sucção, ...perdas_locais_sucção]
@@ -127,103 +465,25 @@ def calculate_pipe_system_head_loss(suction_array, suction_size, discharge_array
         roughness: rugosidade absoluta da tubulação (m)
     
     Retorna:
-        head_values_coef: coeficientes do polinômio ajustado (grau 5)
+        head_values_coef: coeficientes do polinômio substituto (grau 5)
         min_flow: vazão mínima (0)
         max_flow: vazão máxima (target_flow_value * 1.40)
         suction_friction_loss: perda de carga na sucção para a vazão de projeto (m)
         suction_height: altura de sucção (m) - valor do segundo elemento do suction_array
     """
-    import numpy as np
+    system = build_system_curve(suction_array, suction_size, discharge_array, discharge_size,
+                                target_flow_value, mu, rho, roughness)
 
-    # Converte as entradas para arrays
-    suction_array = np.array(suction_array)
-    discharge_array = np.array(discharge_array)
-
-    # Gera um array de vazões (m³/h) de 0.001 até target_flow_value * 1.40 (evitando divisão por zero)
-    n_max_points = 1000 
-    n_points = min(int(target_flow_value * 1.40 / 0.001), n_max_points)
-    flow_values_array = np.linspace(0.001, target_flow_value * 1.40, n_points)
-
-
-    # --- Extração dos parâmetros de sucção ---
-    suction_length = suction_array[0] # comprimento de sucção (m)
-    suction_height = suction_array[1]*(-1)   # altura de sucção (m)
-    suction_local_loss = suction_array[2:]  # perdas locais fornecidas pelo usuário
-
-    # --- Extração dos parâmetros de descarga ---
-    discharge_length = discharge_array[0]  # comprimento de descarga (m)
-    discharge_height = discharge_array[1] # altura de descarga (m)
-    discharge_local_loss = discharge_array[2:]  # perdas locais fornecidas pelo usuário
-
-    # --- Comprimento equivalente das singularidades baseado no diâmetro padrão ---
-    suction_eq_loss = np.sum(get_size_singularities_loss_values(get_size_value(suction_size)))
-    discharge_eq_loss = np.sum(get_size_singularities_loss_values(get_size_value(discharge_size)))
-
-    # --- Comprimento efetivo de cada trecho ---
-    # Soma do comprimento físico, perdas equivalentes (padrão) e perdas locais (informadas)
-    L_eff_suction = suction_length + suction_eq_loss + np.sum(suction_local_loss)
-    L_eff_discharge = discharge_length + discharge_eq_loss + np.sum(discharge_local_loss)
+    # Define os limites de vazão
+    min_flow = 0
+    max_flow = system.max_flow
 
-    # --- Diâmetros internos (convertendo de mm para m) ---
-    D_suction = size_dict_internal_diameter_sch40[suction_size] / 1000
-    D_discharge = size_dict_internal_diameter_sch40[discharge_size] / 1000
+    # Perda de carga por atrito na sucção para a vazão de projeto (sem a elevação)
+    suction_friction_loss = float(system.section_loss(target_flow_value, 0, include_height=False)[0])
 
-    # --- Cálculo das perdas de carga para cada trecho ---
-    # Utiliza a função pressure_loss_array (já adaptada para operar com array de vazões)
-    head_loss_suction = pressure_loss(
-        D_suction,
-        L_eff_suction,
-        flow_values_array,
-        mu / 1000,    # ajuste da viscosidade, conforme padrão anterior
-        rho,
-        g=9.81,
-        h=suction_height,
-        K=0,          # K = 0 se todas as perdas locais já forem convertidas em comprimento equivalente 
-        roughness=roughness
-        )
-
-    head_loss_discharge = pressure_loss(
-        D_discharge,
-        L_eff_discharge,
-        flow_values_array,
-        mu / 1000,
-        rho,
-        g=9.81,
-        h=discharge_height,
-        K=0,
-        roughness=roughness
-        )
-
-    # --- Perda de carga total do sistema ---
-    total_head_loss = head_loss_suction + head_loss_discharge
-
-    # --- Ajuste polinomial de grau 5 ---
-    head_values_coef = np.polyfit(flow_values_array, total_head_loss, 5)
+    suction_height = suction_array[1]
 
-    # Define os limites de vazão
-    min_flow = 0
-    max_flow = target_flow_value * 1.40
-    
-    # Calcular a perda de carga na sucção para a vazão de projeto
-    # Garantindo que o resultado seja tratado corretamente, independentemente se é escalar ou array
-    suction_friction_loss_result = pressure_loss(
-        D_suction,
-        L_eff_suction,
-        np.array([target_flow_value]),
-        mu / 1000,
-        rho,
-        g=9.81,
-        h=0,  # Desconsiderar elevação para obter apenas a perda por fricção
-        K=0,
-        roughness=roughness
-    )
-    
-    # Use np.atleast_1d para garantir que seja tratado como array, mesmo que seja escalar
-    suction_friction_loss = np.atleast_1d(suction_friction_loss_result)[0]
-
-    suction_height = suction_height*(-1)  # Ajuste para o valor correto da altura de sucção
-
-    return head_values_coef, min_flow, max_flow, suction_friction_loss, suction_height
+    return system.coefficients, min_flow, max_flow, suction_friction_loss, suction_height
 
 def calculate_total_equivalent_length(local_loss_array_quantities):
     # Input: local_loss_array_quantities é um numpy array com as quantidades de perda local.
@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Módulo: selection_service.py
+Descrição:
+    Serviço HTTP local de seleção de bombas, para ferramentas de orçamento (ver selection_server.py).
+
+    O servidor é assíncrono (asyncio, apenas a biblioteca padrão) e atende várias conexões simultâneas;
+    os cálculos numéricos são executados em um pool de processos, para que o laço de eventos continue
+    livre. Cada processo de trabalho abre o catálogo uma única vez ao iniciar (snapshot binário por memória
+    mapeada, compartilhado entre os processos) e o reaproveita em todas as requisições: nenhuma requisição
+    abre conexão com o banco SQLite. Quando o banco é alterado com o serviço no ar, o processo principal
+    reexporta o snapshot antes de despachar a próxima requisição que usa o catálogo; os processos de
+    trabalho passam a mapear o novo arquivo e refazem o índice das bombas.
+
+Endpoints (corpo e resposta em JSON):
+    POST /select            especificação de serviço (mesmos campos de batch_selection) e "top" opcional;
+                            retorna o ranking de bombas (linhas RESULT_FIELDS)
+    POST /system-curve      especificação de serviço e "vazoes" opcional (vazões totais, m³/h); retorna os
+                            coeficientes da curva do sistema (total e por bomba), a altura estática, o NPSH
+                            disponível e, se pedido, a curva exata nas vazões informadas
+    POST /operating-point   especificação de serviço e a bomba: do catálogo ("marca", "modelo", "diametro"
+                            e, se necessário, "rotacao") ou por coeficientes ("coef_head" e, opcionalmente,
+                            "coef_eff", "coef_npshr", "coef_power", "vazao_min", "vazao_max"); retorna o
+                            ponto de operação
+    GET  /metrics           latência por endpoint (total e de cálculo, em ms)
+    GET  /health            estado do serviço ("degradado", com status 503, se não houver catálogo carregado)
+
+Funcionalidades:
+    - LatencyMetrics: contagem, erros e percentis de latência por endpoint.
+    - SelectionService: servidor HTTP/1.1 (keep-alive) sobre asyncio.start_server.
+    - run_service: inicia o serviço até ser interrompido.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from core import solve_system, operating_point, operating_grid
+from UI.extra.local_loss import load_equivalent_length_table
+from UI.func.auto_pump_selection import find_intersection_points
+from UI.func.batch_selection import normalize_spec, select_duty, pump_row, ensure_snapshot
+from UI.func.catalog_snapshot import load_snapshot, SCALAR_FIELDS, CURVE_FIELDS
+from UI.func.fluid_properties import get_fluid_table
+from UI.func.viscosity_correction import correct_catalog, kinematic_viscosity, WATER_KINEMATIC_VISCOSITY
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_SIZE = 1 << 20      # bytes
+IDLE_TIMEOUT = 30.0          # segundos de espera por uma nova requisição na mesma conexão
+METRICS_WINDOW = 1024        # requisições recentes usadas nos percentis de latência
+
+ENDPOINTS = {
+    "/select": "select",
+    "/system-curve": "system_curve",
+    "/operating-point": "operating_point",
+}
+
+
+# --------------------------------------------------------------------------------------------------
+# Cálculos (executados nos processos de trabalho)
+# --------------------------------------------------------------------------------------------------
+
+# Índice das bombas do catálogo por (marca, modelo, diametro), construído uma vez por snapshot
+_catalog_index = (None, {})
+
+
+def _key(*values):
+    return tuple(str(value).strip().lower() for value in values)
+
+
+def _pump_index():
+    """
+    Snapshot do catálogo e índice (marca, modelo, diametro) -> posições das bombas.
+
+    O índice é refeito quando o snapshot é substituído. Se o snapshot estiver desatualizado (banco
+    alterado e ainda não reexportado pelo processo principal), continua usando o último snapshot mapeado.
+    """
+    global _catalog_index
+    snapshot = load_snapshot()
+    if snapshot is None:
+        if _catalog_index[0] is not None:
+            return _catalog_index
+        raise RuntimeError("Catálogo de bombas indisponível (snapshot ausente ou desatualizado).")
+    if _catalog_index[0] is not snapshot:
+        index = {}
+        for i in range(len(snapshot)):
+            strings = snapshot.strings(i)
+            index.setdefault(_key(strings["marca"], strings["modelo"], strings["diametro"]), []).append(i)
+        _catalog_index = (snapshot, index)
+    return _catalog_index
+
+
+def _init_worker():
+    """Inicializador dos processos de trabalho: deixa catálogo e tabelas carregados antes da primeira requisição."""
+    _pump_index()
+    load_equivalent_length_table()
+    get_fluid_table("Água")
+
+
+def catalog_pump(payload, mu, rho):
+    """
+    Curvas de uma bomba do catálogo, identificada por marca, modelo, diametro e, se houver mais de uma
+    rotação, rotacao. Para líquidos mais viscosos que a água, as curvas são corrigidas como na seleção.
+
+    Retorna:
+        dict: identificação, coeficientes (pump_coef_head/eff/npshr/power) e faixas de vazão da bomba
+    """
+    snapshot, index = _pump_index()
+    matches = index.get(_key(payload["marca"], payload["modelo"], payload["diametro"]), [])
+    if "rotacao" in payload:
+        matches = [i for i in matches if _key(snapshot.strings(i)["rotacao"]) == _key(payload["rotacao"])]
+    if not matches:
+        raise ValueError(f"Bomba não encontrada no catálogo: {payload['marca']} {payload['modelo']} "
+                         f"{payload['diametro']}")
+    if len(matches) > 1:
+        rotations = ", ".join(snapshot.strings(i)["rotacao"] for i in matches)
+        raise ValueError(f"Mais de uma bomba encontrada; informe a rotação ({rotations})")
+
+    i = matches[0]
+    scalars, coefs = snapshot.scalars[i:i + 1], snapshot.coefs[i:i + 1]
+    if kinematic_viscosity(mu, rho) > WATER_KINEMATIC_VISCOSITY:
+        scalars, coefs, _ = correct_catalog(scalars, coefs, mu, rho)
+
+    pump = snapshot.strings(i)
+    for k, field in enumerate(CURVE_FIELDS):
+        pump[f"pump_{field}"] = np.trim_zeros(coefs[0, k], "f")
+    for field in ("vazao_min", "vazao_max", "p80_eff_bop_flow", "p110_eff_bop_flow"):
+        value = float(scalars[0, SCALAR_FIELDS.index(field)])
+        pump[field] = None if np.isnan(value) else value
+    return pump
+
+
+def coefficient_pump(payload):
+    """Bomba descrita diretamente pelos coeficientes das curvas (ordem de np.polyval)."""
+    pump = {field: payload.get(field) for field in ("marca", "modelo", "diametro", "rotacao", "estagios")}
+    for field in CURVE_FIELDS:
+        pump[f"pump_{field}"] = np.asarray(payload[field], dtype=float) if field in payload else None
+    for field in ("vazao_min", "vazao_max"):
+        pump[field] = float(payload[field]) if field in payload else None
+    pump["p80_eff_bop_flow"] = pump["p110_eff_bop_flow"] = None
+    return pump
+
+
+def service_select(payload):
+    """POST /select: ranking de bombas de uma especificação."""
+    request = normalize_spec(payload, 0)
+    rows = select_duty(request)
+    ranked = [row for row in rows if row["rank"] is not None]
+    return {"id": request.id, "bombas": ranked, "mensagem": None if ranked else rows[0]["mensagem"]}
+
+
+def service_system_curve(payload):
+    """POST /system-curve: curva do sistema de uma especificação."""
+    request = normalize_spec(payload, 0)
+    system_model, npsh = solve_system(request.system, request.fluid)
+    parallel_model = system_model.for_parallel_pumps(request.n_bombas)
+    target_flow = request.system.target_flow
+    result = {
+        "id": request.id,
+        "coeficientes": system_model.coefficients.tolist(),
+        "coeficientes_por_bomba": parallel_model.coefficients.tolist(),
+        "vazao_max": system_model.max_flow,
+        "altura_estatica": system_model.static_head,
+        "head_projeto": system_model(target_flow),
+        "npsh_disponivel_projeto": float(npsh(target_flow)),
+        "mu": request.fluid.mu,
+        "rho": request.fluid.rho,
+    }
+    if payload.get("vazoes") is not None:
+        flow_values = np.asarray(payload["vazoes"], dtype=float)
+        result["curva"] = {
+            "vazao": flow_values.tolist(),
+            "head": np.atleast_1d(system_model(flow_values)).tolist(),
+            "npsh_disponivel": np.atleast_1d(npsh(flow_values)).tolist(),
+        }
+    return result
+
+
+def service_operating_point(payload):
+    """
+    POST /operating-point: ponto de operação de uma bomba no sistema de uma especificação, calculado
+    como na seleção (core.operating_point), para que coincida com o resultado de /select.
+    """
+    request = normalize_spec(payload, 0)
+    system_model, npsh = solve_system(request.system, request.fluid)
+    parallel_model = system_model.for_parallel_pumps(request.n_bombas)
+    adjusted_curve = parallel_model.coefficients
+    if "coef_head" in payload:
+        pump = coefficient_pump(payload)
+    else:
+        pump = catalog_pump(payload, request.fluid.mu, request.fluid.rho)
+
+    flow_min = pump["vazao_min"] if pump["vazao_min"] is not None else 0.0
+    flow_max = pump["vazao_max"] if pump["vazao_max"] is not None else parallel_model.max_flow
+    roots = find_intersection_points(adjusted_curve, pump["pump_coef_head"], flow_min, flow_max)
+    if roots.size == 0:
+        return {"id": request.id, "ponto_operacao": None,
+                "mensagem": "A curva da bomba não intercepta a curva do sistema na faixa de vazão da bomba."}
+
+    vazao_bomba = float(parallel_model.refine_intersection(pump["pump_coef_head"], float(roots.min())))
+    target_flow = request.system.target_flow
+    pump.update(operating_point(pump, vazao_bomba, float(np.polyval(adjusted_curve, vazao_bomba)),
+                                request.n_bombas, target_flow, adjusted_curve, npsh(operating_grid(target_flow))))
+    row = pump_row(request, pump)
+    del row["rank"]
+    p80, p110 = pump["p80_eff_bop_flow"], pump["p110_eff_bop_flow"]
+    row["faixa_preferencial"] = None if p80 is None or p110 is None else bool(p80 <= vazao_bomba <= p110)
+    return {"id": request.id, "ponto_operacao": row, "mensagem": None}
+
+
+HANDLERS = {
+    "select": service_select,
+    "system_curve": service_system_curve,
+    "operating_point": service_operating_point,
+}
+
+
+def run_endpoint(endpoint, payload):
+    """
+    Executa um endpoint no processo de trabalho.
+
+    Retorna:
+        tuple: (status HTTP, corpo da resposta, duração do cálculo em segundos)
+    """
+    start = time.perf_counter()
+    try:
+        status, body = HTTPStatus.OK, HANDLERS[endpoint](payload)
+    except KeyError as e:
+        status, body = HTTPStatus.BAD_REQUEST, {"erro": f"campo ausente: {e}"}
+    except (ValueError, TypeError) as e:
+        status, body = HTTPStatus.BAD_REQUEST, {"erro": str(e)}
+    except Exception as e:
+        logging.error(f"Erro no endpoint {endpoint}: {e}", exc_info=True)
+        status, body = HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": str(e)}
+    return int(status), body, time.perf_counter() - start
+
+
+# --------------------------------------------------------------------------------------------------
+# Métricas
+# --------------------------------------------------------------------------------------------------
+
+class LatencyMetrics:
+    """
+    Métricas de latência por endpoint: total de requisições, erros, requisições em andamento e percentis
+    das últimas `window` latências (total, do recebimento à resposta, e de cálculo, no processo de trabalho).
+    """
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.window = window
+        self._endpoints = {}
+
+    def _entry(self, endpoint):
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = {"requisicoes": 0, "erros": 0, "em_andamento": 0,
+                                         "total": deque(maxlen=self.window),
+                                         "calculo": deque(maxlen=self.window)}
+        return self._endpoints[endpoint]
+
+    def start(self, endpoint):
+        """Registra o início de uma requisição."""
+        self._entry(endpoint)["em_andamento"] += 1
+
+    def finish(self, endpoint, total, compute=None, error=False):
+        """Registra o fim de uma requisição (durações em segundos)."""
+        entry = self._entry(endpoint)
+        entry["em_andamento"] -= 1
+        entry["requisicoes"] += 1
+        entry["erros"] += bool(error)
+        entry["total"].append(total)
+        if compute is not None:
+            entry["calculo"].append(compute)
+
+    @staticmethod
+    def _summary(samples):
+        if not samples:
+            return None
+        values = 1000 * np.asarray(samples)
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {"media": float(values.mean()), "p50": float(p50), "p95": float(p95), "p99": float(p99),
+                "max": float(values.max())}
+
+    def report(self):
+        """Resumo por endpoint, com latências em ms."""
+        return {
+            endpoint: {
+                "requisicoes": entry["requisicoes"],
+                "erros": entry["erros"],
+                "em_andamento": entry["em_andamento"],
+                "latencia_ms": self._summary(entry["total"]),
+                "calculo_ms": self._summary(entry["calculo"]),
+            }
+            for endpoint, entry in self._endpoints.items()
+        }
+
+
+# --------------------------------------------------------------------------------------------------
+# Servidor HTTP
+# --------------------------------------------------------------------------------------------------
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Valor não serializável: {type(value).__name__}")
+
+
+class SelectionService:
+    """
+    Servidor HTTP/1.1 do serviço de seleção.
+
+    Parâmetros:
+        host (str): endereço de escuta
+        port (int): porta de escuta (0 escolhe uma porta livre)
+        max_workers (int): processos de cálculo (padrão: número de CPUs)
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_workers=None):
+        self.host = host
+        self.port = port
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.metrics = LatencyMetrics()
+        self.executor = None
+        self.server = None
+        self.catalog_error = None
+        self._catalog_lock = None
+        self._started = None
+
+    async def start(self):
+        """Atualiza o snapshot do catálogo, inicia os processos de cálculo e abre a porta."""
+        ensure_snapshot()
+        self._catalog_lock = asyncio.Lock()
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+        # Sobe todos os processos antes de aceitar conexões, para que a primeira requisição já os encontre prontos
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, time.sleep, 0)
+                               for _ in range(self.max_workers)))
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self._started = time.monotonic()
+        logging.info(f"Serviço de seleção em http://{self.host}:{self.port} ({self.max_workers} processo(s))")
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        """Fecha a porta e encerra os processos de cálculo."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def refresh_catalog(self):
+        """
+        Reexporta o snapshot do catálogo se o banco de dados foi alterado depois dele.
+
+        A exportação roda em uma thread, uma de cada vez; requisições simultâneas aguardam a mesma
+        exportação. Em caso de falha, o erro fica em catalog_error e é informado em /health.
+
+        Retorna:
+            CatalogSnapshot ou None: snapshot atualizado, ou None se não houver catálogo disponível
+        """
+        snapshot = load_snapshot()
+        if snapshot is not None:
+            return snapshot
+        async with self._catalog_lock:
+            snapshot = load_snapshot()
+            if snapshot is None:
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, ensure_snapshot)
+                    self.catalog_error = None
+                except Exception as e:
+                    logging.error(f"Erro ao atualizar o snapshot do catálogo: {e}", exc_info=True)
+                    self.catalog_error = str(e)
+                snapshot = load_snapshot()
+        return snapshot
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Cliente desconectado, ou conexão ociosa cancelada no encerramento do serviço
+            pass
+        except ValueError:
+            # Linha ou cabeçalho acima do limite do StreamReader
+            await self._respond(writer, HTTPStatus.BAD_REQUEST, {"erro": "requisição inválida"}, False)
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line, reader, writer):
+        """Lê e responde uma requisição; retorna se a conexão deve ser mantida."""
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            await self._respond(writer, HTTPStatus.BAD_REQUEST, {"erro": "linha de requisição inválida"}, False)
+            return False
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            await self._respond(writer, HTTPStatus.LENGTH_REQUIRED, {"erro": "informe Content-Length"}, False)
+            return False
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY_SIZE:
+            await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"erro": "corpo inválido ou grande demais"},
+                                False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        status, response = await self._route(method, urlsplit(target).path, body)
+        await self._respond(writer, status, response, keep_alive)
+        return keep_alive
+
+    async def _route(self, method, path, body):
+        if path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, self.metrics.report()
+        if path == "/health" and method == "GET":
+            snapshot = await self.refresh_catalog()
+            health = {"status": "ok" if snapshot is not None else "degradado",
+                      "bombas": len(snapshot) if snapshot is not None else 0,
+                      "processos": self.max_workers,
+                      "ativo_s": time.monotonic() - self._started}
+            if snapshot is None:
+                health["erro"] = self.catalog_error or "catálogo de bombas indisponível"
+                return HTTPStatus.SERVICE_UNAVAILABLE, health
+            return HTTPStatus.OK, health
+        endpoint = ENDPOINTS.get(path)
+        if endpoint is None:
+            return HTTPStatus.NOT_FOUND, {"erro": f"endpoint desconhecido: {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"erro": "use POST"}
+
+        start = time.perf_counter()
+        self.metrics.start(path)
+        compute = None
+        status = HTTPStatus.INTERNAL_SERVER_ERROR
+        try:
+            try:
+                payload = json.loads(body or b"{}")
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                status = HTTPStatus.BAD_REQUEST
+                return status, {"erro": f"JSON inválido: {e}"}
+            if not isinstance(payload, dict):
+                status = HTTPStatus.BAD_REQUEST
+                return status, {"erro": "o corpo deve ser um objeto JSON"}
+
+            # Endpoints que usam o catálogo: o snapshot é reexportado antes, se o banco mudou, para que
+            # os processos de trabalho não passem a consultar o banco a cada requisição
+            if endpoint == "select" or (endpoint == "operating_point" and "coef_head" not in payload):
+                if await self.refresh_catalog() is None:
+                    status = HTTPStatus.SERVICE_UNAVAILABLE
+                    return status, {"erro": self.catalog_error or "catálogo de bombas indisponível"}
+
+            loop = asyncio.get_running_loop()
+            status, response, compute = await loop.run_in_executor(self.executor, run_endpoint, endpoint, payload)
+            return status, response
+        except Exception as e:
+            logging.error(f"Erro ao executar {path}: {e}", exc_info=True)
+            return status, {"erro": str(e)}
+        finally:
+            self.metrics.finish(path, time.perf_counter() - start, compute, error=status >= 400)
+
+    @staticmethod
+    async def _respond(writer, status, body, keep_alive):
+        status = HTTPStatus(status)
+        payload = json.dumps(body, ensure_ascii=False, default=_json_default).encode("utf-8")
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+
+async def _serve(host, port, max_workers):
+    service = SelectionService(host, port, max_workers)
+    await service.start()
+    # SIGTERM encerra como Ctrl+C, passando pelo close (sem deixar processos de cálculo órfãos)
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, AttributeError):  # Windows
+        pass
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def run_service(host=DEFAULT_HOST, port=DEFAULT_PORT, max_workers=None):
+    """Executa o serviço até ser interrompido (Ctrl+C)."""
+    try:
+        asyncio.run(_serve(host, port, max_workers))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logging.info("Serviço de seleção encerrado")
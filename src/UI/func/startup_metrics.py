@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Módulo: startup_metrics.py
+Descrição:
+    Métricas de inicialização do aplicativo: instantes de cada etapa, medidos a partir da importação
+    deste módulo (que deve ser a primeira do main.py), e duração das importações e construções adiadas
+    para o primeiro uso (matplotlib, pandas, CoolProp).
+
+Funcionalidades:
+    - mark: registra o instante de uma etapa da inicialização.
+    - timed: gerenciador de contexto que registra a duração de um bloco (ex.: criação dos gráficos).
+    - heavy_modules_loaded: dependências pesadas já importadas no processo.
+    - startup_report / log_startup_report: resumo das métricas, como dicionário ou no log.
+"""
+
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+# Dependências cuja importação domina o tempo de inicialização
+HEAVY_MODULES = ("pandas", "matplotlib", "matplotlib.backends.backend_qtagg", "CoolProp", "pyfluids")
+
+_START = time.perf_counter()
+_marks = {}      # etapa -> segundos desde o início
+_durations = {}  # bloco -> duração em segundos
+
+
+def elapsed():
+    """Segundos decorridos desde a importação deste módulo."""
+    return time.perf_counter() - _START
+
+
+def mark(name):
+    """Registra o instante (desde o início) de uma etapa; apenas a primeira ocorrência é mantida."""
+    _marks.setdefault(name, elapsed())
+
+
+@contextmanager
+def timed(name):
+    """Registra a duração do bloco; chamadas repetidas com o mesmo nome são acumuladas."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _durations[name] = _durations.get(name, 0.0) + time.perf_counter() - start
+
+
+def heavy_modules_loaded():
+    """Retorna as dependências de HEAVY_MODULES já importadas."""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def startup_report():
+    """
+    Resumo das métricas de inicialização.
+
+    Retorna:
+        dict: 'etapas' (segundos desde o início), 'duracoes' (segundos) e 'modulos_pesados' carregados
+    """
+    return {
+        "etapas": dict(_marks),
+        "duracoes": dict(_durations),
+        "modulos_pesados": heavy_modules_loaded(),
+    }
+
+
+def log_startup_report():
+    """Escreve o resumo das métricas de inicialização no log."""
+    report = startup_report()
+    stages = ", ".join(f"{name}={1000 * t:.0f} ms" for name, t in report["etapas"].items())
+    durations = ", ".join(f"{name}={1000 * t:.0f} ms" for name, t in report["duracoes"].items())
+    logging.info(f"Inicialização: {stages or '-'}; adiados: {durations or '-'}; "
+                 f"módulos pesados carregados: {', '.join(report['modulos_pesados']) or 'nenhum'}")
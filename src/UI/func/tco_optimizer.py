@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Módulo: tco_optimizer.py
+Descrição:
+    Otimiza o custo total de propriedade (TCO) combinando diâmetros de tubulação e bombas do catálogo.
+
+    Para cada combinação (diâmetro de sucção, diâmetro de recalque, bomba), calcula o ponto de operação
+    sobre as curvas do sistema de evaluate_size_grid e compara o custo anualizado da tubulação
+    (capital) com o custo anual de energia (operação), retornando a fronteira de Pareto.
+
+Funcionalidades:
+    - Pré-filtra as bombas cuja faixa de 80% a 110% da vazão de melhor eficiência contém a vazão alvo,
+      como em auto_pump_selection.
+    - Avalia as curvas de head, potência e NPSHr de todas as bombas de uma vez (Horner vetorizado sobre
+      os coeficientes do catálogo) e encontra o ponto de operação de todas as combinações na mesma grade
+      de vazões.
+    - Considera viáveis as combinações em que a bomba entrega ao menos a vazão alvo dentro da sua faixa,
+      o NPSH disponível supera o NPSHr com a margem informada e a potência estimada é positiva.
+    - Calcula o custo de capital anualizado pelo fator de recuperação de capital e o custo de energia a
+      partir de coef_power, corrigido pela densidade do fluido.
+    - Retorna a fronteira de Pareto (capital x operação) e a combinação de menor custo total.
+"""
+
+import numpy as np
+
+from UI.func.auto_pump_selection import batch_intersections
+from UI.func.catalog_snapshot import load_catalog_arrays, SCALAR_FIELDS, CURVE_FIELDS
+from UI.func.polynomial import polyval_rows
+from UI.func.pressure_drop.total_head_loss import evaluate_size_grid
+from UI.extra.local_loss import size_dict
+
+# Parâmetros econômicos padrão
+ENERGY_PRICE = 0.80          # R$/kWh
+OPERATING_HOURS = 4000.0     # horas de operação por ano na vazão alvo
+DISCOUNT_RATE = 0.10         # taxa de desconto anual
+LIFETIME_YEARS = 15          # vida útil da instalação (anos)
+
+# Custo da tubulação instalada por metro: PIPE_COST_COEF * D_nominal[mm] ** PIPE_COST_EXP (R$/m)
+PIPE_COST_COEF = 2.0
+PIPE_COST_EXP = 1.3
+
+NPSH_MARGIN = 0.5            # margem mínima NPSHd - NPSHr (m)
+N_FLOW_POINTS = 400          # pontos da grade de vazões
+CV_TO_KW = 0.73549875        # as curvas de potência do catálogo estão em cv
+RHO_CATALOG = 1000.0         # densidade de referência das curvas do catálogo (água)
+
+
+def capital_recovery_factor(rate, years):
+    """Fator de recuperação de capital: converte um investimento em custo anual equivalente."""
+    if rate == 0:
+        return 1.0 / years
+    return rate * (1 + rate)**years / ((1 + rate)**years - 1)
+
+
+def default_pipe_cost_per_m(sizes):
+    """Custo padrão da tubulação instalada (R$/m) para cada chave de size_dict."""
+    return np.array([PIPE_COST_COEF * size_dict[size]**PIPE_COST_EXP for size in sizes])
+
+
+def pareto_front(capex, opex):
+    """
+    Retorna os índices das soluções não dominadas (minimizando capital e operação), ordenados por capital.
+    """
+    order = np.lexsort((opex, capex))
+    front = []
+    best_opex = np.inf
+    for index in order:
+        if opex[index] < best_opex:
+            front.append(index)
+            best_opex = opex[index]
+    return np.array(front, dtype=int)
+
+
+def optimize_tco(suction_array, discharge_array, target_flow, mu, rho, roughness, p_vapor,
+                 sizes=None, pipe_cost_per_m=None, energy_price=ENERGY_PRICE,
+                 operating_hours=OPERATING_HOURS, discount_rate=DISCOUNT_RATE,
+                 lifetime_years=LIFETIME_YEARS, npsh_margin=NPSH_MARGIN, n_flow_points=N_FLOW_POINTS):
+    """
+    Busca as combinações (diâmetro de sucção, diâmetro de recalque, bomba) de menor custo total anual.
+
+    O custo de operação considera que o volume anual é fixo (vazão alvo x horas de operação): uma bomba
+    que opera acima da vazão alvo funciona proporcionalmente menos horas.
+
+    Parâmetros:
+        suction_array: [comprimento_sucção, altura_sucção, ...perdas_locais_sucção]
+        discharge_array: [comprimento_descarga, altura_descarga, ...perdas_locais_descarga]
+        target_flow: vazão alvo (m³/h)
+        mu: viscosidade dinâmica (cP)
+        rho: densidade (kg/m³)
+        roughness: rugosidade absoluta da tubulação (m)
+        p_vapor: pressão de vapor do fluido (Pa)
+        sizes: chaves de size_dict a considerar (padrão: todas)
+        pipe_cost_per_m: custo da tubulação instalada (R$/m) para cada diâmetro de sizes
+                         (padrão: default_pipe_cost_per_m)
+        energy_price: preço da energia (R$/kWh)
+        operating_hours: horas de operação por ano na vazão alvo
+        discount_rate: taxa de desconto anual
+        lifetime_years: vida útil (anos)
+        npsh_margin: margem mínima entre NPSH disponível e NPSHr (m)
+        n_flow_points: número de pontos da grade de vazões
+
+    Retorna:
+        dict com:
+            'n_combinations': número de combinações avaliadas
+            'n_feasible': número de combinações viáveis
+            'pareto': lista de dicionários da fronteira de Pareto, ordenada por custo de capital
+            'best': dicionário da combinação de menor custo total (ou None)
+    """
+    scalars, coefs, strings = load_catalog_arrays()
+    column = {field: k for k, field in enumerate(SCALAR_FIELDS)}
+
+    # Pré-filtro das bombas pela faixa de 80% a 110% da vazão de melhor eficiência
+    p80 = scalars[:, column["p80_eff_bop_flow"]]
+    p110 = scalars[:, column["p110_eff_bop_flow"]]
+    candidates = np.flatnonzero((p80 <= target_flow) & (p110 >= target_flow))
+
+    grid_sizes = list(size_dict.keys()) if sizes is None else list(sizes)
+    n_sizes = len(grid_sizes)
+    result = {"n_combinations": len(candidates) * n_sizes**2, "n_feasible": 0, "pareto": [], "best": None}
+    if candidates.size == 0:
+        return result
+
+    vazao_min = scalars[candidates, column["vazao_min"]]
+    vazao_max = scalars[candidates, column["vazao_max"]]
+    coef_head = coefs[candidates, CURVE_FIELDS.index("coef_head")]
+    coef_npshr = coefs[candidates, CURVE_FIELDS.index("coef_npshr")]
+    coef_power = coefs[candidates, CURVE_FIELDS.index("coef_power")]
+
+    # Curvas do sistema e NPSH disponível para todos os pares de diâmetros
+    flow_values = np.linspace(0.0, np.max(vazao_max), n_flow_points)
+    grid = evaluate_size_grid(suction_array, discharge_array, flow_values, mu, rho, roughness, p_vapor,
+                              sizes=grid_sizes)
+    system_head = grid["head"]                      # [S, S, F]
+    npsh_disponivel = grid["npsh_disponivel"]       # [S, F]
+
+    # Diferença entre head da bomba e do sistema: [P, S, S, F]
+    pump_head = polyval_rows(coef_head, flow_values[np.newaxis, :])
+    diff = pump_head[:, np.newaxis, np.newaxis, :] - system_head[np.newaxis]
+
+    # Interseção: primeira troca de sinal (+ -> -) dentro da faixa de vazão da bomba
+    in_range = (flow_values >= vazao_min[:, np.newaxis]) & (flow_values <= vazao_max[:, np.newaxis])
+    segment_ok = (in_range[:, :-1] & in_range[:, 1:])[:, np.newaxis, np.newaxis, :]
+    has_crossing, q_op, k, t = batch_intersections(diff, flow_values, segment_ok)   # [P, S, S]
+
+    # NPSH disponível no ponto de operação (depende apenas do diâmetro de sucção)
+    suction_index = np.arange(n_sizes)[np.newaxis, :, np.newaxis]
+    npsh_a = npsh_disponivel[suction_index, k] * (1 - t) + npsh_disponivel[suction_index, k + 1] * t
+    npsh_r = polyval_rows(coef_npshr, q_op)
+    head_op = polyval_rows(coef_head, q_op)
+
+    power_kw = polyval_rows(coef_power, q_op) * CV_TO_KW * (rho / RHO_CATALOG)
+
+    # Potência não positiva indica extrapolação do ajuste de potência fora dos dados do fabricante
+    feasible = has_crossing & (q_op >= target_flow) & (npsh_a - npsh_r >= npsh_margin) & (power_kw > 0)
+    result["n_feasible"] = int(feasible.sum())
+    if not feasible.any():
+        return result
+
+    # Custo de operação: energia para bombear o volume anual fixo
+    run_hours = operating_hours * target_flow / np.where(feasible, q_op, target_flow)
+    opex = power_kw * run_hours * energy_price
+
+    # Custo de capital anualizado da tubulação: [S, S]
+    pipe_cost = default_pipe_cost_per_m(grid_sizes) if pipe_cost_per_m is None else np.asarray(pipe_cost_per_m)
+    pipe_capex = suction_array[0] * pipe_cost[:, np.newaxis] + discharge_array[0] * pipe_cost[np.newaxis, :]
+    capex = np.broadcast_to(pipe_capex * capital_recovery_factor(discount_rate, lifetime_years), opex.shape)
+
+    # Fronteira de Pareto sobre as combinações viáveis
+    p_idx, s_idx, d_idx = np.nonzero(feasible)
+    capex_f, opex_f = capex[feasible], opex[feasible]
+    total = capex_f + opex_f
+
+    def describe(i):
+        pump = strings(int(candidates[p_idx[i]]))
+        pump.update({
+            "suction_size": grid_sizes[s_idx[i]],
+            "discharge_size": grid_sizes[d_idx[i]],
+            "vazao_operacao": float(q_op[feasible][i]),
+            "head_operacao": float(head_op[feasible][i]),
+            "potencia_kw": float(power_kw[feasible][i]),
+            "npsh_margem": float((npsh_a - npsh_r)[feasible][i]),
+            "capex_anual": float(capex_f[i]),
+            "opex_anual": float(opex_f[i]),
+            "custo_total_anual": float(total[i]),
+        })
+        return pump
+
+    result["pareto"] = [describe(i) for i in pareto_front(capex_f, opex_f)]
+    result["best"] = describe(int(np.argmin(total)))
+    return result
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Módulo: temperature_range.py
+Descrição:
+    Seleção de bombas para uma faixa de temperatura de operação, em vez de uma única temperatura.
+
+    As propriedades do fluido (rho, mu, p_vap) vêm das tabelas de fluid_properties. Para cada temperatura
+    da faixa são montadas, em lote, a curva do sistema e a curva de NPSH disponível. O ponto de operação
+    de todas as bombas candidatas do catálogo é calculado de uma vez sobre a matriz
+    (bombas x temperaturas x vazões).
+
+Funcionalidades:
+    - Pré-filtra as bombas cuja faixa de 80% a 110% da vazão de melhor eficiência contém a vazão alvo,
+      como em auto_pump_selection.
+    - Aprova apenas as bombas que, em todas as temperaturas, têm ponto de operação na sua faixa de vazão,
+      entregam a vazão alvo (com a tolerância informada) e mantêm a margem mínima de NPSH.
+    - Retorna, para cada bomba aprovada, a faixa de vazão de operação e a pior margem de NPSH, com a
+      temperatura em que ela ocorre.
+"""
+
+import numpy as np
+
+from UI.func.auto_pump_selection import batch_intersections
+from UI.func.catalog_snapshot import load_catalog_arrays, SCALAR_FIELDS, CURVE_FIELDS
+from UI.func.fluid_properties import get_fluid_table
+from UI.func.polynomial import polyval_rows
+
+N_TEMPERATURES = 11          # temperaturas avaliadas na faixa
+N_FLOW_POINTS = 400          # pontos da grade de vazões
+NPSH_MARGIN = 0.5            # margem mínima NPSHd - NPSHr (m)
+FLOW_TOLERANCE = 0.10        # a vazão de operação pode ficar até 10% abaixo da vazão alvo
+
+
+def pump_key(pump):
+    """Identifica uma bomba pelos campos de texto (marca, modelo, diametro, rotacao, estagios)."""
+    return tuple(str(pump[field]) for field in ("marca", "modelo", "diametro", "rotacao", "estagios"))
+
+
+def select_over_temperature_range(system_model, target_flow, fluid, t_min, t_max,
+                                  n_temperatures=N_TEMPERATURES, npsh_margin=NPSH_MARGIN,
+                                  flow_tolerance=FLOW_TOLERANCE, p_atm=101325, n_flow_points=N_FLOW_POINTS):
+    """
+    Seleciona as bombas que atendem ao sistema em toda a faixa de temperatura.
+
+    Parâmetros:
+        system_model: SystemCurve do sistema (ou for_parallel_pumps(n) para bombas em paralelo);
+                      o primeiro trecho deve ser a sucção. Os valores de mu e rho do modelo são
+                      substituídos pelos da tabela do fluido em cada temperatura.
+        target_flow: vazão alvo por bomba (m³/h)
+        fluid: nome do fluido (chave de FLUIDS)
+        t_min, t_max: limites da faixa de temperatura (°C)
+        n_temperatures: número de temperaturas avaliadas
+        npsh_margin: margem mínima entre NPSH disponível e NPSHr (m)
+        flow_tolerance: fração da vazão alvo que a vazão de operação pode ficar abaixo dela
+        p_atm: pressão atmosférica (Pa)
+        n_flow_points: número de pontos da grade de vazões
+
+    Retorna:
+        dict com:
+            'temperatures', 'rho', 'mu', 'p_vapor': propriedades em cada temperatura
+            'n_candidates': número de bombas pré-filtradas
+            'pumps': lista de dicionários das bombas aprovadas (campos de texto, 'vazao_min_faixa',
+                     'vazao_max_faixa', 'npsh_margem_min', 'temperatura_npsh_critica')
+    """
+    table = get_fluid_table(fluid)
+    temperatures = np.linspace(t_min, t_max, n_temperatures)
+    rho, mu, p_vapor = table.rho(temperatures), table.mu(temperatures), table.p_vapor(temperatures)
+    result = {"temperatures": temperatures, "rho": rho, "mu": mu, "p_vapor": p_vapor,
+              "n_candidates": 0, "pumps": []}
+
+    scalars, coefs, strings = load_catalog_arrays()
+    column = {field: k for k, field in enumerate(SCALAR_FIELDS)}
+    p80 = scalars[:, column["p80_eff_bop_flow"]]
+    p110 = scalars[:, column["p110_eff_bop_flow"]]
+    candidates = np.flatnonzero((p80 <= target_flow) & (p110 >= target_flow))
+    result["n_candidates"] = int(candidates.size)
+    if candidates.size == 0:
+        return result
+
+    vazao_min = scalars[candidates, column["vazao_min"]]
+    vazao_max = scalars[candidates, column["vazao_max"]]
+    coef_head = coefs[candidates, CURVE_FIELDS.index("coef_head")]
+    coef_npshr = coefs[candidates, CURVE_FIELDS.index("coef_npshr")]
+
+    # Curva do sistema e NPSH disponível em cada temperatura: [T, F]
+    flow_values = np.linspace(0.0, np.max(vazao_max), n_flow_points)
+    Q = flow_values[np.newaxis, :]
+    mu_t, rho_t = mu[:, np.newaxis], rho[:, np.newaxis]
+    system_head = system_model.head_batch(Q, mu=mu_t, rho=rho_t)
+    suction_loss = system_model.section_loss(Q, 0, include_height=False, mu=mu_t, rho=rho_t)
+    suction_height = -system_model.sections[0][2]
+    npsh_disponivel = (p_atm - p_vapor[:, np.newaxis]) / (rho_t * system_model.g) + suction_height - suction_loss
+
+    # Ponto de operação de todas as bombas em todas as temperaturas: [P, T]
+    pump_head = polyval_rows(coef_head, Q)
+    diff = pump_head[:, np.newaxis, :] - system_head[np.newaxis]
+    in_range = (flow_values >= vazao_min[:, np.newaxis]) & (flow_values <= vazao_max[:, np.newaxis])
+    segment_ok = (in_range[:, :-1] & in_range[:, 1:])[:, np.newaxis, :]
+    has_crossing, q_op, k, t = batch_intersections(diff, flow_values, segment_ok)
+
+    temperature_index = np.arange(n_temperatures)[np.newaxis, :]
+    npsh_a = npsh_disponivel[temperature_index, k] * (1 - t) + npsh_disponivel[temperature_index, k + 1] * t
+    margin = npsh_a - polyval_rows(coef_npshr, q_op)
+
+    ok = has_crossing & (q_op >= (1 - flow_tolerance) * target_flow) & (margin >= npsh_margin)
+    for p in np.flatnonzero(ok.all(axis=1)):
+        pump = strings(int(candidates[p]))
+        worst = int(np.argmin(margin[p]))
+        pump.update({
+            "vazao_min_faixa": float(q_op[p].min()),
+            "vazao_max_faixa": float(q_op[p].max()),
+            "npsh_margem_min": float(margin[p, worst]),
+            "temperatura_npsh_critica": float(temperatures[worst]),
+        })
+        result["pumps"].append(pump)
+    return result
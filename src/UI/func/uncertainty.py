@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Módulo: uncertainty.py
+Descrição:
+    Análise de sensibilidade e incerteza da curva do sistema para uma bomba escolhida.
+
+    Rugosidade, viscosidade e altura estática raramente são conhecidas com exatidão. Este módulo sorteia
+    milhares de combinações desses parâmetros (Monte Carlo ou hipercubo latino), avalia todas as curvas
+    do sistema perturbadas de uma vez sobre uma matriz (amostras x vazões) e encontra o ponto de operação
+    de cada amostra com a bomba selecionada.
+
+Funcionalidades:
+    - latin_hypercube: amostragem estratificada em [0, 1)^d apenas com NumPy.
+    - sample_parameters: sorteia rugosidade e viscosidade (variação relativa) e altura estática
+      (variação absoluta, em m) em torno dos valores nominais.
+    - uncertainty_sweep: avalia as curvas perturbadas com o núcleo vetorizado de atrito, calcula as
+      interseções com a curva da bomba em lote e retorna as distribuições de vazão, head e margem de NPSH
+      no ponto de operação, com os percentis P5/P50/P95.
+"""
+
+import numpy as np
+
+from UI.func.auto_pump_selection import batch_intersections, parse_coef_string
+
+# Meia-largura padrão das faixas de incerteza (distribuição uniforme em torno do nominal)
+UNCERTAINTY_SPREADS = {
+    "roughness": 0.5,     # ±50% da rugosidade
+    "viscosity": 0.1,     # ±10% da viscosidade
+    "static_head": 1.0,   # ±1 m na altura estática
+}
+
+N_SAMPLES = 2000          # amostras padrão
+N_FLOW_POINTS = 400       # pontos da grade de vazões na faixa da bomba
+PERCENTILES = (5, 50, 95)
+
+
+def latin_hypercube(n_samples, n_dims, rng):
+    """
+    Amostragem por hipercubo latino em [0, 1)^n_dims.
+
+    Cada dimensão é dividida em n_samples estratos de mesma probabilidade e cada estrato recebe
+    exatamente uma amostra, em ordem aleatória e independente entre as dimensões.
+    """
+    strata = rng.permuted(np.tile(np.arange(n_samples), (n_dims, 1)), axis=1).T
+    return (strata + rng.random((n_samples, n_dims))) / n_samples
+
+
+def sample_parameters(n_samples, roughness, mu, spreads=None, method="lhs", seed=None):
+    """
+    Sorteia os parâmetros incertos em torno dos valores nominais.
+
+    Parâmetros:
+        n_samples: número de amostras
+        roughness: rugosidade nominal (m)
+        mu: viscosidade nominal (Pa.s)
+        spreads: meia-largura de cada faixa (padrão: UNCERTAINTY_SPREADS)
+        method: "lhs" (hipercubo latino) ou "mc" (Monte Carlo simples)
+        seed: semente do gerador aleatório
+
+    Retorna:
+        dict com os arrays (n_samples,) 'roughness' (m), 'mu' (Pa.s) e 'static_head_delta' (m)
+    """
+    spreads = {**UNCERTAINTY_SPREADS, **(spreads or {})}
+    rng = np.random.default_rng(seed)
+    if method == "lhs":
+        u = latin_hypercube(n_samples, 3, rng)
+    elif method == "mc":
+        u = rng.random((n_samples, 3))
+    else:
+        raise ValueError(f"Método de amostragem desconhecido: {method}")
+
+    # Uniforme em [-1, 1) em cada dimensão
+    z = 2.0 * u - 1.0
+    return {
+        "roughness": roughness * (1.0 + spreads["roughness"] * z[:, 0]),
+        "mu": mu * (1.0 + spreads["viscosity"] * z[:, 1]),
+        "static_head_delta": spreads["static_head"] * z[:, 2],
+    }
+
+
+def uncertainty_sweep(system_model, pump, p_vapor, p_atm=101325, n_samples=N_SAMPLES, spreads=None,
+                      method="lhs", seed=None, n_flow_points=N_FLOW_POINTS):
+    """
+    Avalia a distribuição do ponto de operação de uma bomba sob incerteza nos parâmetros do sistema.
+
+    A altura estática perturbada é a do recalque; a altura de sucção (usada no NPSH disponível) é
+    mantida no valor nominal.
+
+    Parâmetros:
+        system_model: SystemCurve nominal (ex.: get_system_model(), ou for_parallel_pumps(n) para
+                      bombas em paralelo); o primeiro trecho deve ser a sucção
+        pump: dicionário da bomba no formato de auto_pump_selection (pump_coef_head, pump_coef_npshr,
+              pump_vazao_min, pump_vazao_max)
+        p_vapor: pressão de vapor do fluido (Pa)
+        p_atm: pressão atmosférica (Pa)
+        n_samples: número de amostras
+        spreads: meia-largura de cada faixa de incerteza (ver UNCERTAINTY_SPREADS)
+        method: "lhs" ou "mc"
+        seed: semente do gerador aleatório
+        n_flow_points: pontos da grade de vazões na faixa da bomba
+
+    Retorna:
+        dict com:
+            'samples': parâmetros sorteados (ver sample_parameters)
+            'has_crossing': (n_samples,) se a amostra possui ponto de operação na faixa da bomba
+            'vazao', 'head', 'npsh_margem': (n_samples,) ponto de operação de cada amostra (NaN sem interseção)
+            'percentis': {grandeza: {5: ..., 50: ..., 95: ...}} sobre as amostras com interseção
+            'fracao_operando': fração das amostras com ponto de operação
+            'fracao_npsh_insuficiente': fração das amostras com ponto de operação e margem de NPSH negativa
+    """
+    coef_head = parse_coef_string(pump["pump_coef_head"])
+    coef_npshr = parse_coef_string(pump["pump_coef_npshr"])
+    samples = sample_parameters(n_samples, system_model.roughness, system_model.mu, spreads, method, seed)
+    mu = samples["mu"][:, np.newaxis]
+    roughness = samples["roughness"][:, np.newaxis]
+
+    # Curvas perturbadas na grade (amostras x vazões) da faixa da bomba
+    flow_values = np.linspace(pump["pump_vazao_min"], pump["pump_vazao_max"], n_flow_points)
+    system_head = (system_model.head_batch(flow_values[np.newaxis, :], mu=mu, roughness=roughness)
+                   + samples["static_head_delta"][:, np.newaxis])
+
+    diff = np.polyval(coef_head, flow_values)[np.newaxis, :] - system_head
+    has_crossing, q_op, _, _ = batch_intersections(diff, flow_values)
+
+    # NPSH disponível exato em cada ponto de operação (perda de sucção sem a elevação)
+    g, rho = system_model.g, system_model.rho
+    suction_height = -system_model.sections[0][2]
+    suction_loss = system_model.section_loss(q_op, 0, include_height=False,
+                                             mu=samples["mu"], roughness=samples["roughness"])
+    npsh_disponivel = (p_atm - p_vapor) / (rho * g) + suction_height - suction_loss
+    npsh_margem = npsh_disponivel - np.polyval(coef_npshr, q_op)
+
+    result = {
+        "samples": samples,
+        "has_crossing": has_crossing,
+        "vazao": np.where(has_crossing, q_op, np.nan),
+        "head": np.where(has_crossing, np.polyval(coef_head, q_op), np.nan),
+        "npsh_margem": np.where(has_crossing, npsh_margem, np.nan),
+        "fracao_operando": float(has_crossing.mean()),
+        "fracao_npsh_insuficiente": float((has_crossing & (npsh_margem < 0)).mean()),
+        "percentis": {},
+    }
+    if has_crossing.any():
+        for key in ("vazao", "head", "npsh_margem"):
+            values = np.percentile(result[key][has_crossing], PERCENTILES)
+            result["percentis"][key] = dict(zip(PERCENTILES, values.tolist()))
+    return result
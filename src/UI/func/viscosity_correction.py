@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Módulo: viscosity_correction.py
+Descrição:
+    Correção de desempenho de bombas centrífugas para líquidos viscosos pelo método do Hydraulic
+    Institute (ANSI/HI 9.6.7), aplicada de uma vez a todo o catálogo.
+
+    As curvas do catálogo são curvas em água. Para um líquido de viscosidade cinemática ν, o parâmetro
+
+        B = 16,5 · ν^0,5 · H_BEP^0,0625 / (Q_BEP^0,375 · N^0,25)
+
+    (ν em cSt, H_BEP por estágio em m, Q_BEP em m³/h, N em rpm) define os fatores de correção
+
+        C_Q = exp(-0,165 · (log10 B)^3,15)              vazão (e head no BEP)
+        C_H = 1 - (1 - C_Q) · (Q_W / Q_BEP-W)^0,75      head fora do BEP
+        C_η = B^-(0,0547 · B^0,69)                      eficiência
+
+    com fatores iguais a 1 para B <= 1. Como as curvas já representam a bomba em água, os fatores são
+    tomados em relação aos da água (WATER_KINEMATIC_VISCOSITY), de modo que a correção é exatamente nula
+    para água e para líquidos menos viscosos.
+
+Funcionalidades:
+    - correction_factors: fatores C_Q, C_η e o parâmetro B para arrays de bombas (broadcasting).
+    - correct_catalog: aplica a correção às colunas escalares e aos coeficientes das curvas de todas as
+      bombas do catálogo, sem laço em Python por bomba:
+        - vazões (faixa de operação, BEP, 80%/110% do BEP) multiplicadas por C_Q;
+        - eficiência e NPSHr por substituição Q_W = Q / C_Q nos polinômios (eficiência também
+          multiplicada por C_η; o NPSHr não é corrigido pelo método);
+        - head e potência reamostrados com C_H(Q_W) e reajustados em lote na mesma grade normalizada;
+          a potência, P = ρ·g·Q·H/η, também é multiplicada pela densidade relativa ρ / WATER_DENSITY.
+      Bombas sem rotação conhecida ou com B acima de B_MAX ficam fora da faixa do método: são mantidas
+      sem correção até UNCORRECTED_MAX_VISCOSITY (correção desprezível) e marcadas como inválidas acima
+      disso.
+"""
+
+import numpy as np
+
+from UI.func.catalog_snapshot import SCALAR_FIELDS, CURVE_FIELDS
+from UI.func.polynomial import polyval_rows
+
+WATER_KINEMATIC_VISCOSITY = 1.0   # cSt, referência das curvas do catálogo
+WATER_DENSITY = 1000.0            # kg/m³, referência das curvas de potência do catálogo
+B_MAX = 40.0                      # limite superior de B do método
+UNCORRECTED_MAX_VISCOSITY = 4.3   # cSt: até aqui, bombas fora da faixa do método são mantidas sem correção
+N_FIT_POINTS = 60                 # pontos da reamostragem das curvas de head e potência
+
+
+def kinematic_viscosity(mu, rho):
+    """
+    Viscosidade cinemática (cSt) a partir da dinâmica (cP) e da massa específica (kg/m³).
+    """
+    return mu / (rho / 1000.0)
+
+
+def _factors(B):
+    """Fatores C_Q e C_η do HI 9.6.7 para um array de B (iguais a 1 para B <= 1)."""
+    B = np.maximum(B, 1.0)
+    c_q = np.exp(-0.165 * np.log10(B)**3.15)
+    c_eta = B**-(0.0547 * B**0.69)
+    return c_q, c_eta
+
+
+def correction_factors(nu, q_bep, h_bep, n_rpm):
+    """
+    Fatores de correção em relação à água para uma ou mais bombas.
+
+    Parâmetros:
+        nu: viscosidade cinemática do líquido (cSt)
+        q_bep: vazão de melhor eficiência em água (m³/h)
+        h_bep: head por estágio no ponto de melhor eficiência em água (m)
+        n_rpm: rotação (rpm)
+
+    Retorna:
+        dict com os arrays 'B', 'C_Q', 'C_eta' e 'valid' (B finito e dentro da faixa do método,
+        ou líquido com viscosidade de até UNCORRECTED_MAX_VISCOSITY)
+    """
+    q_bep, h_bep, n_rpm = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (q_bep, h_bep, n_rpm)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        B = 16.5 * nu**0.5 * h_bep**0.0625 / (q_bep**0.375 * n_rpm**0.25)
+        B_water = B * (WATER_KINEMATIC_VISCOSITY / nu)**0.5
+    in_range = np.isfinite(B) & (B > 0) & (B <= B_MAX)
+
+    # Fora da faixa do método os fatores ficam iguais a 1
+    c_q, c_eta = _factors(np.where(in_range, B, 1.0))
+    c_q_water, c_eta_water = _factors(np.where(in_range, B_water, 1.0))
+    return {
+        "B": B,
+        "C_Q": np.minimum(c_q / c_q_water, 1.0),
+        "C_eta": np.minimum(c_eta / c_eta_water, 1.0),
+        "valid": in_range | (nu <= UNCORRECTED_MAX_VISCOSITY),
+    }
+
+
+def head_factor(c_q, flow_ratio):
+    """Fator de correção do head C_H para a razão Q_W / Q_BEP-W (C_H = C_Q no BEP)."""
+    return 1.0 - (1.0 - c_q) * np.maximum(flow_ratio, 0.0)**0.75
+
+
+def _substitute(coefs, scale):
+    """Coeficientes de p(x / scale) a partir dos de p(x), alinhados à direita [n, largura]."""
+    degree = np.arange(coefs.shape[-1] - 1, -1, -1)
+    return coefs / scale[:, np.newaxis]**degree
+
+
+def correct_catalog(scalars, coefs, mu, rho, n_fit_points=N_FIT_POINTS):
+    """
+    Aplica a correção de viscosidade a todo o catálogo.
+
+    Parâmetros:
+        scalars: float64 [n_bombas, len(SCALAR_FIELDS)] (formato do snapshot)
+        coefs: float64 [n_bombas, len(CURVE_FIELDS), largura] (formato do snapshot)
+        mu: viscosidade dinâmica do líquido (cP)
+        rho: massa específica do líquido (kg/m³)
+        n_fit_points: pontos da reamostragem das curvas de head e potência
+
+    Retorna:
+        tuple: (scalars, coefs, valid) corrigidos, no mesmo formato das entradas, e a máscara das bombas
+               dentro da faixa do método. Sem correção (água ou líquido menos viscoso), devolve as
+               próprias entradas.
+    """
+    nu = kinematic_viscosity(mu, rho)
+    column = {field: k for k, field in enumerate(SCALAR_FIELDS)}
+    n_stages = np.where(scalars[:, column["n_estagios"]] > 0, scalars[:, column["n_estagios"]], 1.0)
+    q_bep = scalars[:, column["eff_bop_flow"]]
+    factors = correction_factors(nu, q_bep, scalars[:, column["head_bop"]] / n_stages,
+                                 scalars[:, column["rotacao_rpm"]])
+    c_q, c_eta, valid = factors["C_Q"], factors["C_eta"], factors["valid"]
+    if np.all(c_q == 1.0) and np.all(c_eta == 1.0):
+        return scalars, coefs, valid
+
+    # Escalares: vazões escalam com C_Q; no BEP, C_H = C_Q; o head em vazão nula não é corrigido.
+    # A potência segue P = ρ·g·Q·H/η: fatores de vazão, head e eficiência e a densidade relativa
+    specific_gravity = rho / WATER_DENSITY
+    scalars = np.array(scalars)
+    for field in ("vazao_min", "vazao_max", "eff_bop_flow", "p80_eff_bop_flow", "p110_eff_bop_flow"):
+        scalars[:, column[field]] *= c_q
+    scalars[:, column["head_bop"]] *= c_q
+    scalars[:, column["eff_bop"]] *= c_eta
+    scalars[:, column["power_bop"]] *= c_q * c_q / c_eta * specific_gravity
+
+    # Eficiência e NPSHr: substituição exata Q_W = Q / C_Q nos polinômios
+    original, coefs = coefs, np.array(coefs)
+    curve = {field: k for k, field in enumerate(CURVE_FIELDS)}
+    coefs[:, curve["coef_eff"]] = _substitute(coefs[:, curve["coef_eff"]], c_q) * c_eta[:, np.newaxis]
+    coefs[:, curve["coef_npshr"]] = _substitute(coefs[:, curve["coef_npshr"]], c_q)
+
+    # Head e potência: reamostragem em água na grade u = Q_W / vazao_max e reajuste em lote.
+    # Como Q = C_Q · Q_W, a grade normalizada em Q / (C_Q · vazao_max) é a mesma para todas as bombas
+    # e o ajuste por mínimos quadrados se reduz a um único produto pela pseudoinversa.
+    q_max = np.where(np.isfinite(scalars[:, column["vazao_max"]]), scalars[:, column["vazao_max"]], 0.0)
+    q_max_water = np.where(c_q > 0, q_max / c_q, 0.0)
+    u = np.linspace(0.0, 1.0, n_fit_points)
+    q_water = q_max_water[:, np.newaxis] * u
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c_h = head_factor(c_q[:, np.newaxis], np.where(q_bep[:, np.newaxis] > 0, q_water / q_bep[:, np.newaxis], 0.0))
+
+    width = coefs.shape[-1]
+    head_water = polyval_rows(coefs[:, curve["coef_head"]], q_water)
+    power_water = polyval_rows(coefs[:, curve["coef_power"]], q_water)
+    fit = np.linalg.pinv(np.vander(u, width))
+    head_u = (c_h * head_water) @ fit.T
+    power_u = (power_water * c_q[:, np.newaxis] * c_h / c_eta[:, np.newaxis] * specific_gravity) @ fit.T
+    scale = np.where(q_max > 0, q_max, 1.0)
+    coefs[:, curve["coef_head"]] = _substitute(head_u, scale)
+    coefs[:, curve["coef_power"]] = _substitute(power_u, scale)
+
+    # Bombas sem correção (fatores iguais a 1) mantêm as curvas originais; só a potência muda com ρ
+    unchanged = (c_q == 1.0) & (c_eta == 1.0)
+    coefs[unchanged] = original[unchanged]
+    coefs[unchanged, curve["coef_power"]] *= specific_gravity
+    return scalars, coefs, valid
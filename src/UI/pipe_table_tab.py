@@ -10,11 +10,19 @@ from PyQt6.QtCore import Qt, pyqtSignal
 
 from UI.data.input_variables import *
 from UI.extra.local_loss import size_dict_internal_diameter_sch40
-from UI.func.pressure_drop.total_head_loss import calculate_pipe_system_head_loss
+from UI.func.pressure_drop.total_head_loss import build_system_curve
+from core import npsh_available, temperature_range, vapor_pressure
 import numpy as np
-import pandas as pd
 import logging
 
+# Descrição exibida para cada método de perdas localizadas
+LOCAL_LOSS_METHOD_LABELS = {
+    "eq_length": "Comprimento equivalente",
+    "k": "Coeficiente K",
+    "2k": "Método 2-K (Hooper)",
+    "3k": "Método 3-K (Darby)",
+}
+
 class SystemInputWidget(QWidget):
     # Sinal para indicar que o cálculo foi concluído
     calculoCompleto = pyqtSignal()
@@ -28,6 +36,7 @@ class SystemInputWidget(QWidget):
         
         # Armazenamento de resultados calculados
         self.system_curve = None
+        self.system_model = None
         self.flow_values = None
         self.target_flow = None
         self.suction_friction_loss = None
@@ -62,6 +71,18 @@ class SystemInputWidget(QWidget):
         vazao_layout.addWidget(self.line_edit_vazao)
         
         flow_layout.addLayout(vazao_layout)
+        
+        # Método de cálculo das perdas localizadas
+        metodo_layout = QHBoxLayout()
+        label_metodo = QLabel("Perdas localizadas:")
+        metodo_layout.addWidget(label_metodo)
+        
+        self.combo_local_loss_method = QComboBox()
+        for metodo, descricao in LOCAL_LOSS_METHOD_LABELS.items():
+            self.combo_local_loss_method.addItem(descricao, metodo)
+        metodo_layout.addWidget(self.combo_local_loss_method)
+        
+        flow_layout.addLayout(metodo_layout)
         flow_group.setLayout(flow_layout)
         main_layout.addWidget(flow_group)
         
@@ -354,45 +375,29 @@ class SystemInputWidget(QWidget):
     
     def calcular_pressao_vapor(self, temperatura):
         """
-        Calcula a pressão de vapor da água com base na temperatura.
-        Esta é uma aproximação para água entre 0°C e 100°C.
+        Calcula a pressão de vapor do fluido selecionado com base na temperatura (core.vapor_pressure),
+        avisando quando a temperatura estiver fora da faixa da tabela de propriedades.
         
         Parâmetros:
-            temperatura: Temperatura da água em °C
+            temperatura: Temperatura do fluido em °C
             
         Retorna:
             Pressão de vapor em Pa
         """
-        # Equação aproximada para pressão de vapor da água
-        # Baseada na equação de Antoine (simplificada)
-        # Válida para água entre 0°C e 100°C
-        if temperatura < 0 or temperatura > 100:
-            QMessageBox.warning(self, "Aviso", "Temperatura fora do intervalo válido (0-100°C).")
-            temperatura = max(0, min(temperatura, 100))
-        
-        # Valores aproximados para água com base na equação de Antoine
-        if temperatura <= 60:
-            # Aproximação para 0-60°C
-            pressao_vapor = 10**(8.07131 - 1730.63/(233.426 + temperatura)) * 133.322
-        else:
-            # Aproximação para 61-100°C
-            pressao_vapor = 10**(8.14019 - 1810.94/(244.485 + temperatura)) * 133.322
+        fluid = self.window().fluid_prop_input_widget.get_fluid_name()
+        t_min, t_max = temperature_range(fluid)
+        
+        if temperatura < t_min or temperatura > t_max:
+            QMessageBox.warning(self, "Aviso", f"Temperatura fora do intervalo válido ({t_min:.1f} a {t_max:.1f} °C).")
         
-        return pressao_vapor
+        return vapor_pressure(fluid, temperatura)
     
     def calcular_npsh_disponivel(self, suction_height, suction_friction_loss, flow_values=None):
         """
-        Calcula o NPSH disponível do sistema para uma faixa de vazões.
-        
-        NPSH_d = P_atm/ρg + h_s - h_v - h_f_sucção(Q)
+        Calcula o NPSH disponível do sistema (core.npsh_available) com o fluido e a vazão de projeto
+        informados nas abas.
         
-        Onde:
-        - P_atm: pressão atmosférica (Pa)
-        - ρ: densidade do fluido (kg/m³)
-        - g: aceleração da gravidade (9.81 m/s²)
-        - h_s: altura estática da sucção (m)
-        - h_v: pressão de vapor do fluido (m coluna de fluido)
-        - h_f_sucção(Q): perda de carga na linha de sucção em função da vazão (m)
+        NPSH_d = P_atm/ρg + h_s - h_v - h_f_sucção(Q), com h_f_sucção escalada por (Q / Q_projeto)²
         
         Parâmetros:
             suction_height: Altura estática da sucção (m)
@@ -404,67 +409,25 @@ class SystemInputWidget(QWidget):
             Se flow_values for fornecido: Array com valores de NPSH disponível para cada vazão
         """
         try:
-            # Obter acesso ao widget de propriedades do fluido
-            main_window = self.window()
-            fluid_prop_widget = main_window.fluid_prop_input_widget
-            
-            # Obter densidade do fluido
+            fluid_prop_widget = self.window().fluid_prop_input_widget
             rho = fluid_prop_widget.get_rho_input_value()  # kg/m³
+            p_vapor = self.calcular_pressao_vapor(fluid_prop_widget.temperature_input.value())  # Pa
             
-            # Pressão atmosférica padrão ao nível do mar (101325 Pa)
-            p_atm = 101325  # Pa
-            
-            # Pressão de vapor do fluido - baseada na temperatura
-            temperatura = fluid_prop_widget.temperature_input.value()  # °C
-            p_vapor = self.calcular_pressao_vapor(temperatura)  # Pa
-            
-            # Converter pressões para metros de coluna de fluido
-            h_atm = p_atm / (rho * 9.81)
-            h_vapor = p_vapor / (rho * 9.81)
-            
-            logging.info(f"Altura equivalente atmosférica: {h_atm:.2f} m")
-            logging.info(f"Altura equivalente da pressão de vapor: {h_vapor:.2f} m")
-            logging.info(f"Altura estática da sucção: {suction_height:.2f} m")
-            logging.info(f"Perda de carga na vazão de projeto: {suction_friction_loss:.2f} m")
-            
-            # Se não forneceu vazões, retorna apenas para a vazão de projeto
-            if flow_values is None:
-                npsh_disponivel = h_atm + suction_height - h_vapor - suction_friction_loss
-                logging.info(f"NPSH disponível calculado (ponto único): {npsh_disponivel:.2f} m")
-                return npsh_disponivel
-            
-            # Caso contrário, calcula para cada vazão
-            # Precisamos escalar a perda de carga de acordo com a lei quadrática (Q²)
-            vazao_projeto = float(self.line_edit_vazao.text())
-            
-            # Verificar se a vazão de projeto é válida
+            # Vazão de projeto usada no cálculo da perda na sucção
+            vazao_projeto = self.target_flow if self.target_flow else float(self.line_edit_vazao.text())
             if vazao_projeto <= 0:
                 logging.warning("Vazão de projeto inválida, usando 1.0 m³/h como fallback")
                 vazao_projeto = 1.0
             
-            # Array para armazenar valores de NPSH
-            npsh_values = np.zeros_like(flow_values)
-            
-            # Filtrar valores negativos ou zero (para evitar problemas no cálculo)
-            valid_indices = flow_values > 0
-            
-            # Para valores válidos, calcular NPSH disponível
-            for i, vazao in enumerate(flow_values):
-                if vazao > 0:  # Evitar divisão por zero
-                    # A perda de carga varia com o quadrado da vazão
-                    perda_carga_proporcional = suction_friction_loss * (vazao / vazao_projeto) ** 2
-                    
-                    # Cálculo do NPSH disponível para cada vazão
-                    npsh_values[i] = h_atm + suction_height - h_vapor - perda_carga_proporcional
-                else:
-                    # Para vazão zero, a perda de carga é zero
-                    npsh_values[i] = h_atm + suction_height - h_vapor
-            
-            # Log dos resultados para depuração
-            min_npsh = np.min(npsh_values)
-            max_npsh = np.max(npsh_values)
-            logging.info(f"Curva de NPSH disponível calculada: {len(npsh_values)} pontos, range [{min_npsh:.2f}, {max_npsh:.2f}]")
+            if flow_values is None:
+                npsh_disponivel = float(npsh_available(vazao_projeto, vazao_projeto, suction_height,
+                                                       suction_friction_loss, rho, p_vapor))
+                logging.info(f"NPSH disponível calculado (ponto único): {npsh_disponivel:.2f} m")
+                return npsh_disponivel
             
+            npsh_values = npsh_available(flow_values, vazao_projeto, suction_height, suction_friction_loss, rho, p_vapor)
+            logging.info(f"Curva de NPSH disponível calculada: {len(npsh_values)} pontos, "
+                         f"range [{np.min(npsh_values):.2f}, {np.max(npsh_values):.2f}]")
             return npsh_values
             
         except Exception as e:
@@ -508,17 +471,20 @@ class SystemInputWidget(QWidget):
         roughness = fluid_prop_widget.get_roughness_value()  # Obtém o valor de rugosidade do tubo em mm
         
         try:
-            # Calcular a curva do sistema
-            result = calculate_pipe_system_head_loss(
+            # Montar a curva do sistema (avaliada de forma exata, sem varredura de vazões)
+            system_model = build_system_curve(
                 spinbox_suction, suction_size,
                 spinbox_discharge, discharge_size,
-                self.target_flow, mu_value, rho_value, roughness/1000  # Converte rugosidade de mm para m
+                self.target_flow, mu_value, rho_value, roughness/1000,  # Converte rugosidade de mm para m
+                local_loss_method=self.get_local_loss_method()
             )
             
-            # Desempacotar resultados
-            head_values_coef, min_flow, max_flow, suction_friction_loss, suction_height = result
+            head_values_coef = system_model.coefficients
+            suction_friction_loss = float(system_model.section_loss(self.target_flow, 0, include_height=False)[0])
+            suction_height = spinbox_suction[1]
             
             # Armazenar valores para uso posterior
+            self.system_model = system_model
             self.system_curve = head_values_coef
             self.suction_friction_loss = suction_friction_loss
             self.suction_height = suction_height
@@ -559,6 +525,10 @@ class SystemInputWidget(QWidget):
         """Retorna os valores dos spinboxes de recalque"""
         return [spin_box.value() for spin_box in self.quantity_discharge]
 
+    def get_local_loss_method(self):
+        """Retorna o método de perdas localizadas selecionado (ver LOCAL_LOSS_METHODS)"""
+        return self.combo_local_loss_method.currentData()
+
     def get_suction_size(self):
         """Retorna o tamanho selecionado para sucção"""
         return self.combo_diametro_suction.currentText()
@@ -575,6 +545,10 @@ class SystemInputWidget(QWidget):
         """Retorna os coeficientes da curva do sistema"""
         return self.system_curve
     
+    def get_system_model(self):
+        """Retorna a curva do sistema (SystemCurve) com avaliação exata de H(Q)"""
+        return self.system_model
+    
     def get_npsh_disponivel(self, flow_values=None):
         """
         Retorna o NPSH disponível calculado.
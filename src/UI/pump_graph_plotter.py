@@ -0,0 +1,934 @@
+"""
+Módulo: pump_graph_plotter.py
+Descrição:
+    Lógica de plotagem dos gráficos de seleção de bombas, independente do Qt.
+
+    PumpGraphPlotter cria a figura com os quatro gráficos (Head, NPSH, Potência e Eficiência) e os seus
+    artistas persistentes, e implementa a atualização das curvas do sistema e da bomba, das escalas, da
+    sobreposição das candidatas e das tabelas de consulta das curvas. É a base do componente da
+    interface (PumpGraphComponent, que acrescenta o canvas Qt, o blitting e a interação com o mouse)
+    e da exportação sem interface (datasheet_export), que usa o canvas Agg.
+
+Funcionalidades:
+    - stack_coefficients: empilha coeficientes de polinômios de graus diferentes numa matriz.
+    - PumpGraphPlotter: figura, artistas e métodos de plotagem compartilhados.
+"""
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+import logging
+from typing import Dict, List, Optional, Tuple, Any, Union
+
+# Estilo das anotações dos pontos de operação
+ANNOTATION_BOX = dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.5)
+
+# Sobreposição das bombas candidatas
+OVERLAY_POINTS = 200     # pontos da grade de vazões das curvas sobrepostas
+
+
+def stack_coefficients(coef_list):
+    """
+    Empilha coeficientes de polinômios (ordem de np.polyval) alinhados à direita numa matriz [n, largura].
+    Linhas sem coeficientes ficam com NaN.
+    """
+    width = max((len(c) for c in coef_list if c is not None), default=1)
+    stacked = np.full((len(coef_list), width), np.nan)
+    for row, coefs in zip(stacked, coef_list):
+        if coefs is not None and len(coefs) > 0:
+            row[:] = 0.0
+            row[width - len(coefs):] = coefs
+    return stacked
+
+
+class PumpGraphPlotter:
+    """
+    Gráficos de desempenho de bombas sobre uma figura do matplotlib, sem dependência do Qt.
+
+    Exibe quatro gráficos:
+    1. Vazão x Head (40% da altura vertical)
+    2. Vazão x NPSHr (20% da altura vertical)
+    3. Vazão x Potência (20% da altura vertical)
+    4. Vazão x Eficiência (20% da altura vertical)
+
+    Todos os artistas (curvas, pontos de operação, linhas auxiliares e anotações) são criados uma única
+    vez por create_figure e atualizados com set_data, de modo que a mesma figura pode ser reaproveitada
+    para sucessivas seleções. As subclasses decidem como desenhar: ANIMATED define se os artistas da
+    bomba são animados (blitting) e refresh é chamado ao fim de cada atualização.
+    """
+
+    ANIMATED = False  # artistas da bomba animados (desenhados por blitting, fora de savefig)
+
+    def __init__(self):
+        self.system_max_head = None  # Para armazenar o head máximo encontrado na curva do sistema
+        self.system_max_flow = None  # Para armazenar a vazão máxima encontrada na curva do sistema
+        self.system_flow_range = None  # Para armazenar o range do eixo X que será comum para todos os gráficos
+        self.head_scale_set = False  # Flag para indicar se a escala do gráfico Head já foi definida
+
+    def create_figure(self, figsize=(8, 12)):
+        """
+        Cria a figura com os quatro gráficos, aplica as configurações iniciais e cria os artistas.
+
+        Parâmetros:
+            figsize (tuple): Tamanho da figura em polegadas
+        """
+        # Criar figura com subplots proporcional e margens reduzidas
+        self.figure = Figure(figsize=figsize)
+        self.figure.subplots_adjust(left=0.1, right=0.95, top=0.95, bottom=0.05)  # Reduzir margens da figura
+
+        # Criar subplots com diferentes tamanhos (Head: 2/5, outros: 1/5 cada)
+        # Total de 5 unidades de altura, com espaçamento vertical reduzido
+        gs = self.figure.add_gridspec(5, 1, hspace=0.25)  # Espaçamento vertical reduzido
+
+        # Criar os eixos para cada gráfico com as proporções especificadas
+        self.ax_head = self.figure.add_subplot(gs[0:2, 0])   # 2/5 para Head (40%)
+        self.ax_npshr = self.figure.add_subplot(gs[2, 0])    # 1/5 para NPSHr (20%)
+        self.ax_power = self.figure.add_subplot(gs[3, 0])    # 1/5 para Potência (20%)
+        self.ax_eff = self.figure.add_subplot(gs[4, 0])      # 1/5 para Eficiência (20%)
+        self.axes = (self.ax_head, self.ax_npshr, self.ax_power, self.ax_eff)
+
+        # Configurações iniciais dos gráficos e criação dos artistas persistentes
+        self.setup_plots()
+        self.create_artists()
+
+    def setup_plots(self):
+        """Configuração inicial dos gráficos."""
+        # Gráfico de Head
+        self.ax_head.set_ylabel("Head (m)")
+        self.ax_head.set_title("Curva do Sistema x Curva da Bomba")
+        self.ax_head.grid(True, linestyle='--', alpha=0.7)
+        self.ax_head.set_ylim(bottom=0)  # Começar em zero para melhor visualização
+        self.ax_head.tick_params(labelbottom=False)  # Remover labels do eixo X
+
+        # Gráfico de NPSHr
+        self.ax_npshr.set_ylabel("NPSH (m)")
+        self.ax_npshr.set_title("NPSHr x NPSH disponível")
+        self.ax_npshr.grid(True, linestyle='--', alpha=0.7)
+        self.ax_npshr.set_ylim(bottom=0)  # Começar em zero para melhor visualização
+        self.ax_npshr.tick_params(labelbottom=False)  # Remover labels do eixo X
+
+        # Gráfico de Potência
+        self.ax_power.set_ylabel("Potência (cv)")
+        self.ax_power.set_title("Curva de Potência")
+        self.ax_power.grid(True, linestyle='--', alpha=0.7)
+        self.ax_power.set_ylim(bottom=0)  # Começar em zero para melhor visualização
+        self.ax_power.tick_params(labelbottom=False)  # Remover labels do eixo X
+
+        # Gráfico de Eficiência - Único com label do eixo X
+        self.ax_eff.set_xlabel("Vazão (m³/h)")
+        self.ax_eff.set_ylabel("Eficiência (%)")
+        self.ax_eff.set_title("Curva de Eficiência")
+        self.ax_eff.grid(True, linestyle='--', alpha=0.7)
+        self.ax_eff.set_ylim(bottom=0)  # Começar em zero para melhor visualização
+
+    def create_artists(self):
+        """
+        Cria, uma única vez, todos os artistas dos gráficos, inicialmente vazios.
+
+        A curva do sistema (system_head_line) é desenhada com o fundo. Com ANIMATED verdadeiro, a curva de
+        NPSH disponível, cuja grade de vazões acompanha a bomba selecionada, e os artistas da bomba
+        (self.pump_artists[ax], na ordem de desenho) são animados, para serem redesenhados sobre o fundo
+        em cache.
+        """
+        # Curvas do sistema
+        self.system_head_line = self.ax_head.plot([], [], linestyle='-', color='blue', linewidth=2,
+                                                  label='Curva do Sistema')[0]
+        self.system_npsh_line = self.ax_npshr.plot([], [], linestyle='-', color='blue', linewidth=2,
+                                                   label='NPSH disponível', animated=self.ANIMATED)[0]
+
+        def curve(ax, label, **style):
+            return ax.plot([], [], linewidth=2, label=label, animated=self.ANIMATED, **style)[0]
+
+        def point(ax, label, fmt='ro'):
+            return ax.plot([], [], fmt, markersize=8, label=label, animated=self.ANIMATED)[0]
+
+        def vline(ax, color='gray'):
+            return ax.axvline(x=0, color=color, linestyle=':', alpha=0.5, animated=self.ANIMATED)
+
+        def annotation(ax, offset):
+            return ax.annotate('', xy=(0, 0), xytext=offset, textcoords='offset points',
+                               bbox=ANNOTATION_BOX, animated=self.ANIMATED, clip_on=True)
+
+        # Head
+        self.pump_head_line = curve(self.ax_head, 'Curva da Bomba', linestyle='--', color='green')
+        self.head_point = point(self.ax_head, 'Ponto de Operação')
+        self.head_hline = self.ax_head.axhline(y=0, color='r', linestyle=':', alpha=0.5, animated=self.ANIMATED)
+        self.head_vline = vline(self.ax_head, color='r')
+        self.head_annotation = annotation(self.ax_head, (10, 10))
+
+        # NPSH
+        self.npshr_line = curve(self.ax_npshr, 'NPSHr', linestyle='-', color='red')
+        self.npsh_disp_point = point(self.ax_npshr, 'NPSH disp. no ponto de operação', 'bo')
+        self.npshr_point = point(self.ax_npshr, 'NPSHr no ponto de operação')
+        self.npsh_vline = vline(self.ax_npshr)
+        self.npsh_annotation = annotation(self.ax_npshr, (10, 0))
+
+        # Potência
+        self.power_line = curve(self.ax_power, 'Potência', linestyle='-', color='purple')
+        self.power_point = point(self.ax_power, 'Ponto de operação')
+        self.power_vline = vline(self.ax_power)
+        self.power_annotation = annotation(self.ax_power, (10, 10))
+
+        # Eficiência
+        self.eff_line = curve(self.ax_eff, 'Eficiência', linestyle='-', color='green')
+        self.eff_point = point(self.ax_eff, 'Ponto de operação')
+        self.eff_vline = vline(self.ax_eff)
+        self.eff_annotation = annotation(self.ax_eff, (10, 10))
+
+        self.pump_artists = {
+            self.ax_head: [self.pump_head_line, self.head_hline, self.head_vline, self.head_point, self.head_annotation],
+            self.ax_npshr: [self.npshr_line, self.npsh_vline, self.npsh_disp_point, self.npshr_point,
+                            self.npsh_annotation],
+            self.ax_power: [self.power_line, self.power_vline, self.power_point, self.power_annotation],
+            self.ax_eff: [self.eff_line, self.eff_vline, self.eff_point, self.eff_annotation],
+        }
+        self.system_artists = {self.ax_head: [self.system_head_line], self.ax_npshr: [self.system_npsh_line],
+                               self.ax_power: [], self.ax_eff: []}
+
+        # Sobreposição das candidatas: uma coleção de linhas por gráfico (parte do fundo) e a curva
+        # destacada
+        self.overlay_coef_keys = {self.ax_head: 'pump_coef_head', self.ax_npshr: 'pump_coef_npshr',
+                                  self.ax_power: 'pump_coef_power', self.ax_eff: 'pump_coef_eff'}
+        self.overlay_collections = {}
+        self.overlay_highlights = {}
+        for ax in self.axes:
+            collection = LineCollection([], colors='gray', linewidths=0.8, alpha=0.35, zorder=1.5)
+            ax.add_collection(collection, autolim=False)
+            self.overlay_collections[ax] = collection
+            self.system_artists[ax].append(collection)
+            self.overlay_highlights[ax] = ax.plot([], [], color='orange', linewidth=2.5, label='_destaque',
+                                                  animated=self.ANIMATED)[0]
+        self._overlay = None
+
+        self._curve_tables = {}
+
+        for artist in (self.system_head_line, self.system_npsh_line):
+            artist.set_visible(False)
+        self.hide_pump_artists()
+        self.hide_overlay()
+
+    def hide_pump_artists(self, axes=None):
+        """Oculta os artistas da bomba (todos os gráficos ou apenas os informados)."""
+        for ax in axes or self.axes:
+            for artist in self.pump_artists[ax]:
+                artist.set_visible(False)
+
+    def hide_operating_point(self, ax):
+        """Oculta os marcadores, linhas auxiliares e anotação do ponto de operação de um gráfico."""
+        for artist in self.pump_artists[ax][1:]:
+            artist.set_visible(False)
+
+    def update_legends(self):
+        """Refaz as legendas com os artistas visíveis (as legendas fazem parte do fundo)."""
+        for ax in self.axes:
+            handles = [a for a in self.system_artists[ax] + self.pump_artists[ax]
+                       if a.get_visible() and a.get_label() and not a.get_label().startswith('_')]
+            legend = ax.get_legend()
+            if handles:
+                ax.legend(handles=handles, loc='best')
+            elif legend is not None:
+                legend.remove()
+
+    def refresh(self, full=False, axes=None, relayout=False):
+        """
+        Pedido de redesenho após uma atualização dos gráficos.
+
+        Sem canvas interativo, apenas aplica o tight_layout pedido; a figura é desenhada ao ser salva.
+        PumpGraphComponent redefine este método para agendar o redesenho na tela.
+
+        Parâmetros:
+            full (bool): força o desenho completo da figura
+            axes: gráficos cujos artistas animados mudaram (padrão: todos)
+            relayout (bool): aplica tight_layout antes do desenho
+        """
+        if relayout:
+            self.figure.tight_layout()
+
+    def update_parallel_pumps(self, system_curve, flow_values, n_bombas, npsh_disponivel):
+        """
+        Atualiza os gráficos quando o número de bombas em paralelo é alterado.
+        Recalcula as escalas e a curva do sistema para o novo número de bombas.
+
+        Parâmetros:
+            system_curve: Coeficientes da curva do sistema original
+            flow_values: Valores de vazão para plotagem
+            n_bombas: Novo número de bombas em paralelo
+            npsh_disponivel: NPSH disponível do sistema (valor único ou array)
+        """
+        try:
+            logging.info(f"Atualizando gráficos para {n_bombas} bombas em paralelo")
+
+            # Limpar os elementos da bomba e as curvas do sistema (as escalas são recalculadas abaixo)
+            self.clear_plots()
+
+            # Verificar se temos dados suficientes
+            if system_curve is None:
+                logging.warning("System curve não fornecida para atualização de bombas paralelas")
+                self.refresh(full=True)
+                return
+
+            # Se não houver flow_values, criar um intervalo padrão
+            if flow_values is None or len(flow_values) == 0:
+                flow_values = np.linspace(0.001, 100, 500)
+
+            # Plotar a nova curva do sistema com o número atualizado de bombas
+            self.plot_system_curve(system_curve, flow_values, n_bombas, True)
+
+            # Plotar NPSH disponível - verificar se é um array ou valor escalar
+            if npsh_disponivel is not None:
+                if isinstance(npsh_disponivel, (int, float)):
+                    # Valor único - verificar se é positivo
+                    if npsh_disponivel > 0:
+                        self.plot_npsh_disponivel(flow_values, npsh_disponivel)
+                else:
+                    # Array - verificar se contém valores positivos
+                    if np.any(npsh_disponivel > 0):
+                        self.plot_npsh_disponivel(flow_values, npsh_disponivel)
+
+            # Recalcular e aplicar novas escalas baseadas no novo número de bombas
+            if self.system_max_flow is not None and self.system_max_head is not None:
+                # Arredondamento para cima para obter limites "bonitos"
+                max_flow = self.system_max_flow
+                max_flow_with_margin = np.ceil((max_flow * 1.1) / 5) * 5
+
+                # Dividir vazão máxima pelo número de bombas para plotagem
+                system_flow_range = [0, max_flow_with_margin / n_bombas]
+                self.system_flow_range = system_flow_range
+
+                # Ajustar escala do eixo X para todos os gráficos
+                for ax in self.axes:
+                    ax.set_xlim(*system_flow_range)
+
+                # Manter a mesma escala Y para o Head
+                max_head = self.system_max_head
+                max_head_with_margin = np.ceil((max_head * 1.1) / 5) * 5
+                self.ax_head.set_ylim(0, max_head_with_margin)
+
+                logging.info(f"Escalas atualizadas para bombas em paralelo: X=[0, {system_flow_range[1]:.2f}]")
+
+            # Finalizar
+            self.refresh(relayout=True)
+
+        except Exception as e:
+            logging.error(f"Erro ao atualizar para bombas em paralelo: {e}", exc_info=True)
+
+    def clear_plots(self):
+        """Limpa completamente todos os gráficos - usar apenas para novo sistema."""
+        for line in (self.system_head_line, self.system_npsh_line):
+            line.set_data([], [])
+            line.set_visible(False)
+        self.hide_pump_artists()
+        self.hide_overlay()
+
+        for ax in self.axes:
+            ax.set_ylim(0, 1)
+        self.ax_head.set_title("Curva do Sistema x Curva da Bomba")
+
+    def clear_pump_plots(self):
+        """
+        Limpa apenas os elementos da bomba nos gráficos, mantendo as escalas e as curvas do sistema.
+        """
+        self.hide_pump_artists()
+        logging.info("Limpos apenas os elementos da bomba, preservando escalas")
+
+    def reset_scales(self):
+        """Reseta as escalas e flags quando um novo cálculo do sistema é feito."""
+        self.head_scale_set = False
+        self.system_flow_range = None
+
+    def update_plots(self, system_curve: Optional[np.ndarray],
+             pump_data: Optional[Dict[str, Any]] = None,
+             flow_values: Optional[np.ndarray] = None,
+             n_bombas: int = 1,
+             intersection_point: Optional[List] = None,
+             npsh_disponivel: Optional[Union[float, np.ndarray]] = None,
+             is_new_system: bool = False):
+        """
+        Atualiza todos os gráficos com os dados fornecidos.
+
+        Parâmetros:
+            system_curve (numpy.ndarray): Coeficientes da curva do sistema
+            pump_data (dict): Dados da bomba selecionada (com coeficientes das curvas)
+            flow_values (numpy.ndarray): Valores de vazão para plotagem
+            n_bombas (int): Número de bombas em paralelo
+            intersection_point (list): Ponto de interseção [vazão, head]
+            npsh_disponivel (float ou numpy.ndarray): NPSH disponível do sistema
+            is_new_system (bool): Indica se é um novo cálculo do sistema (reseta scales)
+        """
+        try:
+            # Registrar os dados recebidos para depuração
+            logging.info(f"Atualizando gráficos: system_curve={type(system_curve) if system_curve is not None else None}")
+            logging.info(f"Bomba selecionada: {pump_data.get('marca', 'N/D')} {pump_data.get('modelo', 'N/D')}") if pump_data else logging.info("Nenhuma bomba selecionada")
+            logging.info(f"Número de bombas: {n_bombas}")
+            logging.info(f"Ponto de interseção: {intersection_point}")
+            logging.info(f"É novo sistema: {is_new_system}")
+
+            # Reiniciar escalas se for um novo cálculo do sistema
+            if is_new_system:
+                logging.info("Novo sistema: Resetando escalas e limpando todos os gráficos")
+                self.reset_scales()
+                # Limpar completamente todos os gráficos para novo sistema
+                self.clear_plots()
+            else:
+                # Para seleção de bomba, limpar apenas os elementos da bomba
+                self.clear_pump_plots()
+
+            # Verificar se temos dados suficientes para plotar
+            if system_curve is None:
+                logging.warning("System curve não fornecida para plotagem")
+                self.refresh()
+                return
+
+            # Se não houver flow_values, criar um intervalo padrão
+            if flow_values is None or len(flow_values) == 0:
+                logging.info("Usando valores de vazão padrão")
+                flow_values = np.linspace(0.001, 100, 500)
+
+            # Plotar curva do sistema no gráfico principal (Head) apenas se for um novo sistema
+            # ou se a curva do sistema ainda não existe
+            if is_new_system or not self.system_head_line.get_visible():
+                logging.info("Plotando nova curva do sistema")
+                self.plot_system_curve(system_curve, flow_values, n_bombas, is_new_system)
+
+            # Atualizar NPSH disponível (mesmo que não haja bomba selecionada)
+            if npsh_disponivel is not None:
+                if isinstance(npsh_disponivel, (int, float)):
+                    # Valor único - verificar se é positivo
+                    if npsh_disponivel > 0:
+                        logging.info(f"Plotando novo NPSH disponível (constante): {npsh_disponivel:.2f}")
+                        self.plot_npsh_disponivel(flow_values, npsh_disponivel)
+                else:
+                    # Array - verificar se contém valores positivos e tem o tamanho correto
+                    if isinstance(npsh_disponivel, np.ndarray) and len(npsh_disponivel) > 0:
+                        if np.any(npsh_disponivel > 0):
+                            if len(npsh_disponivel) != len(flow_values):
+                                logging.warning(f"Tamanhos diferentes: NPSH={len(npsh_disponivel)}, flow={len(flow_values)}")
+                                # Ajustar para o mesmo tamanho se necessário
+                                if len(npsh_disponivel) > len(flow_values):
+                                    npsh_disponivel = npsh_disponivel[:len(flow_values)]
+                                else:
+                                    # Preencher com zeros ou interpolar
+                                    temp_npsh = np.zeros_like(flow_values)
+                                    temp_npsh[:len(npsh_disponivel)] = npsh_disponivel
+                                    npsh_disponivel = temp_npsh
+
+                            logging.info(f"Plotando novo NPSH disponível (variável): {len(npsh_disponivel)} pontos")
+                            self.plot_npsh_disponivel(flow_values, npsh_disponivel)
+                        else:
+                            logging.warning("Array de NPSH disponível não contém valores positivos")
+                    else:
+                        logging.warning("Array de NPSH disponível é inválido ou vazio")
+            else:
+                logging.warning("NPSH disponível não fornecido")
+
+            # Se tivermos dados de bomba, atualizar as curvas da bomba
+            if pump_data is not None:
+                self.plot_pump_curves(pump_data, flow_values, intersection_point, npsh_disponivel)
+
+            # Ajuste automático da escala dos gráficos
+            self.adjust_plot_scales(system_curve, pump_data, flow_values, n_bombas, npsh_disponivel, is_new_system)
+
+            # Apenas os artistas da bomba são redesenhados se as escalas não mudaram
+            self.refresh(relayout=is_new_system)
+
+        except Exception as e:
+            logging.error(f"Erro ao atualizar gráficos: {e}", exc_info=True)
+
+    def adjust_plot_scales(self, system_curve, pump_data, flow_values, n_bombas, npsh_disponivel, is_new_system):
+        """
+        Ajusta automaticamente a escala dos gráficos para melhor visualização.
+        
+        Parâmetros:
+            system_curve: Coeficientes da curva do sistema
+            pump_data: Dados da bomba selecionada
+            flow_values: Valores de vazão para plotagem (por bomba)
+            n_bombas: Número de bombas em paralelo
+            npsh_disponivel: NPSH disponível do sistema
+            is_new_system: Indica se é um novo cálculo do sistema
+        """
+        try:
+            # Proteção adicional: Se não for um novo sistema e já temos a escala definida, apenas ajustar gráficos secundários
+            if not is_new_system and self.head_scale_set:
+                logging.info("Mantendo escalas existentes para o gráfico Head (não é um novo sistema)")
+                
+                # Apenas ajustar os eixos Y dos gráficos secundários se houver dados de bomba
+                if pump_data is not None:
+                    self.adjust_secondary_graphs_y_scales(pump_data, npsh_disponivel)
+                
+                return  # Sair da função sem alterar outras escalas
+            
+            # Se for um novo sistema ou a escala do Head ainda não foi definida, ajustar todas as escalas
+            if is_new_system or not self.head_scale_set:
+                if system_curve is not None and self.system_max_flow is not None and self.system_max_head is not None:
+                    # IMPORTANTE: self.system_max_flow já contém a vazão TOTAL máxima
+                    # Dividir essa vazão total pelo número de bombas para obter a escala por bomba
+                    max_flow = self.system_max_flow
+                    
+                    # Adicionar 10% de margem e arredondar para cima para o próximo múltiplo de 5
+                    max_flow_with_margin = np.ceil((max_flow * 1.1) / 5) * 5
+                    
+                    # Dividir vazão máxima pelo número de bombas para plotagem
+                    max_flow_per_pump = max_flow_with_margin / n_bombas
+                    system_flow_range = [0, max_flow_per_pump]
+                    self.system_flow_range = system_flow_range  # Armazenar para usar em todos os gráficos
+                    
+                    # Ajustar escala do eixo X para todos os gráficos usando o mesmo range
+                    self.ax_head.set_xlim(*system_flow_range)
+                    self.ax_npshr.set_xlim(*system_flow_range)
+                    self.ax_power.set_xlim(*system_flow_range)
+                    self.ax_eff.set_xlim(*system_flow_range)
+                    
+                    # Ajustar escala do eixo Y apenas para Head
+                    max_head = self.system_max_head
+                    # Adicionar 10% de margem e arredondar para cima para o próximo múltiplo de 5
+                    max_head_with_margin = np.ceil((max_head * 1.1) / 5) * 5
+                    self.ax_head.set_ylim(0, max_head_with_margin)
+                    
+                    # Marcar que a escala do Head já foi definida
+                    self.head_scale_set = True
+                    
+                    logging.info(f"Escala definida para todos os gráficos: "
+                                f"X=[0, {system_flow_range[1]:.2f}] (vazão por bomba), "
+                                f"Head Y=[0, {max_head_with_margin:.2f}]")
+                    
+                    # Ajustar os gráficos secundários também
+                    if pump_data is not None:
+                        self.adjust_secondary_graphs_y_scales(pump_data, npsh_disponivel)
+                else:
+                    logging.warning("Dados insuficientes para ajustar escalas dos gráficos")
+            else:
+                # Este caso não deveria ocorrer devido ao retorno antecipado acima
+                logging.warning("Condição não esperada no ajuste de escalas")
+                    
+        except Exception as e:
+            logging.error(f"Erro ao ajustar escalas dos gráficos: {e}", exc_info=True)
+
+    def adjust_secondary_graphs_y_scales(self, pump_data, npsh_disponivel):
+        """
+        Ajusta apenas os eixos Y dos gráficos secundários (NPSHr, Potência, Eficiência).
+        """
+        if self.system_flow_range is None:
+            logging.warning("Range do sistema não definido para ajustar escalas Y secundárias")
+            return
+            
+        # Ajuste do gráfico de NPSHr (apenas eixo Y)
+        npshr_coef = pump_data.get('pump_coef_npshr')
+        if npshr_coef is not None:
+            self.adjust_y_scale_only(
+                self.ax_npshr, 
+                npshr_coef, 
+                self.system_flow_range[0], 
+                self.system_flow_range[1], 
+                npsh_disponivel,
+                "NPSHr"
+            )
+        
+        # Ajuste do gráfico de Potência (apenas eixo Y)
+        power_coef = pump_data.get('pump_coef_power')
+        if power_coef is not None:
+            self.adjust_y_scale_only(
+                self.ax_power, 
+                power_coef, 
+                self.system_flow_range[0], 
+                self.system_flow_range[1], 
+                None,
+                "Potência"
+            )
+        
+        # Ajuste do gráfico de Eficiência (apenas eixo Y)
+        eff_coef = pump_data.get('pump_coef_eff')
+        if eff_coef is not None:
+            self.adjust_y_scale_only(
+                self.ax_eff, 
+                eff_coef, 
+                self.system_flow_range[0], 
+                self.system_flow_range[1], 
+                None,
+                "Eficiência",
+                max_y_limit=100  # Eficiência nunca ultrapassa 100%
+            )
+
+    def adjust_y_scale_only(self, ax, coef, min_flow, max_flow, reference_value=None, component_name="", max_y_limit=None):
+        """
+        Ajusta apenas a escala do eixo Y de um componente específico do gráfico.
+        
+        Parâmetros:
+            ax: Eixo do matplotlib a ser ajustado
+            coef: Coeficientes da curva
+            min_flow: Vazão mínima do range do sistema
+            max_flow: Vazão máxima do range do sistema
+            reference_value: Valor de referência (ex: NPSH disponível) - pode ser escalar ou array
+            component_name: Nome do componente para logging
+            max_y_limit: Limite máximo forçado para o eixo Y (opcional)
+        """
+        try:
+            if coef is None:
+                return
+                
+            # Calcular o valor máximo da curva para ajustar o eixo Y
+            flow_values = np.linspace(min_flow, max_flow, 100)
+            y_values = np.polyval(coef, flow_values)
+            max_y = np.max(y_values)
+            
+            # Se tiver um valor de referência (ex: NPSH disponível), incluir na escala
+            if reference_value is not None:
+                if isinstance(reference_value, (int, float)):
+                    # Para valor escalar
+                    max_y = max(max_y, reference_value)
+                else:
+                    # Para array NumPy
+                    try:
+                        max_y = max(max_y, np.max(reference_value))
+                    except:
+                        # Se ocorrer algum erro, mantém o valor anterior
+                        pass
+            
+            # Adicionar margem e arredondar para cima
+            max_y_with_margin = np.ceil((max_y * 1.1) / 5) * 5
+            
+            # Se há um limite máximo definido, usá-lo
+            if max_y_limit is not None and max_y_with_margin > max_y_limit:
+                max_y_with_margin = max_y_limit
+            
+            # A escala só cresce enquanto o sistema não muda (clear_plots a reinicia): ao percorrer a lista de
+            # bombas as curvas ficam na mesma escala e o fundo em cache continua válido
+            max_y_with_margin = max(max_y_with_margin, ax.get_ylim()[1])
+            
+            # Ajustar apenas o eixo Y, mantendo o eixo X inalterado
+            ax.set_ylim(0, max_y_with_margin)
+            logging.info(f"Ajustando apenas eixo Y do gráfico de {component_name}: Y=0-{max_y_with_margin:.2f}")
+            
+        except Exception as e:
+            logging.error(f"Erro ao ajustar escala Y do componente {component_name}: {e}", exc_info=True)
+
+    def plot_system_curve(self, system_curve: np.ndarray, flow_values: np.ndarray, n_bombas: int, is_new_system: bool):
+        """
+        Atualiza a curva do sistema no gráfico de Head.
+
+        Parâmetros:
+            system_curve (numpy.ndarray): Coeficientes da curva do sistema original
+            flow_values (numpy.ndarray): Valores de vazão por bomba para plotagem
+            n_bombas (int): Número de bombas em paralelo
+            is_new_system (bool): Indica se é um novo cálculo do sistema
+        """
+        try:
+            if system_curve is None or len(system_curve) == 0:
+                logging.warning("Coeficientes da curva do sistema vazios ou inválidos")
+                return
+
+            # Os valores de flow_values são vazões por bomba; o head do sistema é calculado com a
+            # vazão total (n_bombas x vazão por bomba) e plotado contra a vazão por bomba
+            system_head_values = np.polyval(system_curve, flow_values * n_bombas)
+
+            # Armazenar os valores máximos para ajuste de escala (apenas se for um novo sistema)
+            if is_new_system:
+                self.system_max_flow = max(flow_values) * n_bombas  # Vazão total máxima
+                self.system_max_head = max(system_head_values)
+                logging.info(f"Novos valores máximos do sistema: "
+                            f"Vazão total={self.system_max_flow:.2f}, "
+                            f"Vazão por bomba={max(flow_values):.2f}, "
+                            f"Head={self.system_max_head:.2f}")
+
+            self.set_curve_data(self.system_head_line, flow_values, system_head_values)
+            self.system_head_line.set_visible(True)
+            self.ax_head.relim(visible_only=True)
+            self.ax_head.autoscale_view()
+
+            # Configurar título com informação de bombas
+            suffix = 's' if n_bombas > 1 else ''
+            self.ax_head.set_title(f"Curva do Sistema x Curva da Bomba ({n_bombas} bomba{suffix} em paralelo)")
+
+        except Exception as e:
+            logging.error(f"Erro ao plotar curva do sistema: {e}", exc_info=True)
+
+    def plot_npsh_disponivel(self, flow_values: np.ndarray, npsh_disponivel):
+        """
+        Atualiza a linha ou curva de NPSH disponível no gráfico de NPSH.
+
+        Parâmetros:
+            flow_values (numpy.ndarray): Valores de vazão para plotagem
+            npsh_disponivel: Valor fixo ou array de valores de NPSH disponível
+        """
+        try:
+            # Verifica se npsh_disponivel é um valor único ou um array
+            if isinstance(npsh_disponivel, (int, float)):
+                if npsh_disponivel <= 0:
+                    logging.warning(f"NPSH disponível inválido: {npsh_disponivel}")
+                    return
+
+                # Criar linha horizontal para NPSH disponível constante
+                npsh_disp_values = np.full_like(flow_values, npsh_disponivel)
+                label = 'NPSH disponível (constante)'
+            else:
+                # Verifica se é um array e tem o mesmo tamanho de flow_values
+                if len(npsh_disponivel) != len(flow_values):
+                    logging.warning(f"Tamanho do array de NPSH disponível ({len(npsh_disponivel)}) não corresponde aos valores de vazão ({len(flow_values)})")
+                    return
+
+                npsh_disp_values = npsh_disponivel
+                label = 'NPSH disponível (variável)'
+
+            self.set_curve_data(self.system_npsh_line, flow_values, npsh_disp_values)
+            self.system_npsh_line.set_label(label)
+            self.system_npsh_line.set_visible(True)
+            self.ax_npshr.relim(visible_only=True)
+            self.ax_npshr.autoscale_view()
+
+        except Exception as e:
+            logging.error(f"Erro ao plotar NPSH disponível: {e}", exc_info=True)
+
+    def set_overlay(self, pumps: Optional[List[Dict[str, Any]]], labels: Optional[List[str]] = None):
+        """
+        Sobrepõe as curvas de todas as bombas candidatas (ou remove a sobreposição, com pumps vazio/None).
+
+        As curvas de cada gráfico são avaliadas de uma vez (produto da matriz de coeficientes empilhados
+        pela matriz de Vandermonde da grade de vazões), restritas à faixa de vazão de cada bomba e
+        desenhadas numa única LineCollection. Para a seleção com o cursor, os valores de cada coluna da
+        grade são ordenados, de modo que a curva mais próxima é encontrada por busca binária.
+
+        Parâmetros:
+            pumps: lista de dicionários das bombas candidatas (mesmo formato de plot_pump_curves)
+            labels: textos exibidos ao passar o cursor sobre cada curva (padrão: marca e modelo)
+        """
+        had_overlay = self._overlay is not None
+        self.hide_overlay()
+        if not pumps:
+            if had_overlay:
+                self.refresh(full=True)
+            return
+
+        try:
+            if self.system_flow_range:
+                x_max = self.system_flow_range[1]
+            else:
+                x_max = max(p.get('pump_vazao_max', 100) for p in pumps)
+            flow = np.linspace(0, x_max, OVERLAY_POINTS)
+            vazao_min = np.array([p.get('pump_vazao_min', 0) for p in pumps], dtype=float)
+            vazao_max = np.array([p.get('pump_vazao_max', x_max) for p in pumps], dtype=float)
+            outside = (flow < vazao_min[:, np.newaxis]) | (flow > vazao_max[:, np.newaxis])
+
+            values, index = {}, {}
+            for ax, key in self.overlay_coef_keys.items():
+                coefs = stack_coefficients([p.get(key) for p in pumps])
+                curves = coefs @ np.vander(flow, coefs.shape[1]).T
+                curves[outside] = np.nan
+                segments = np.stack([np.broadcast_to(flow, curves.shape), curves], axis=-1)
+
+                collection = self.overlay_collections[ax]
+                collection.set_segments(segments)
+                collection.set_visible(True)
+
+                # Índice espacial: valores de cada coluna ordenados (NaN ao final) e número de valores válidos
+                order = np.argsort(curves, axis=0)
+                values[ax] = curves
+                index[ax] = (np.take_along_axis(curves, order, axis=0), order, np.isfinite(curves).sum(axis=0))
+
+            # Legenda apenas no gráfico de Head
+            self.overlay_collections[self.ax_head].set_label(f'Candidatas ({len(pumps)})')
+            if labels is None:
+                labels = [f"{p.get('marca', '')} {p.get('modelo', '')}".strip() for p in pumps]
+            self._overlay = {'flow': flow, 'values': values, 'index': index, 'labels': labels}
+            logging.info(f"Sobreposição de {len(pumps)} bombas candidatas")
+
+        except Exception as e:
+            logging.error(f"Erro ao sobrepor curvas das candidatas: {e}", exc_info=True)
+            self.hide_overlay()
+
+        self.refresh(full=True)
+
+    def hide_overlay(self):
+        """Remove a sobreposição das candidatas e a curva destacada."""
+        self._overlay = None
+        for ax in self.axes:
+            self.overlay_collections[ax].set_segments([])
+            self.overlay_collections[ax].set_visible(False)
+            self.overlay_highlights[ax].set_visible(False)
+
+    def set_curve_data(self, line, x, y):
+        """
+        Atualiza os dados de uma curva desenhada sobre uma grade uniforme de vazões e guarda a tabela de
+        consulta (início, passo e valores) usada por curve_value.
+        """
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        line.set_data(x, y)
+        step = (x[-1] - x[0]) / (len(x) - 1) if len(x) > 1 else 0.0
+        self._curve_tables[line] = (x[0], step, y) if step > 0 else None
+
+    def curve_value(self, line, x):
+        """
+        Valor de uma curva na vazão x por interpolação linear na sua tabela de consulta (cálculo de índice,
+        sem busca). Retorna None se a curva não tiver tabela ou se x estiver fora da grade.
+        """
+        table = self._curve_tables.get(line)
+        if table is None:
+            return None
+        x0, step, y = table
+        position = (x - x0) / step
+        if not 0 <= position <= len(y) - 1:
+            return None
+        k = min(int(position), len(y) - 2)
+        return float(y[k] + (y[k + 1] - y[k]) * (position - k))
+
+    def plot_pump_curves(self, pump_data: Dict[str, Any], flow_values: np.ndarray,
+                      intersection_point: Optional[List], npsh_disponivel: Optional[float]):
+        """
+        Atualiza as curvas da bomba em todos os gráficos.
+
+        Parâmetros:
+            pump_data (dict): Dados da bomba
+            flow_values (numpy.ndarray): Valores de vazão para plotagem
+            intersection_point (list): Ponto de interseção [vazão, head]
+            npsh_disponivel (float): NPSH disponível do sistema
+        """
+        try:
+            # Extrair dados da bomba
+            pump_head_coef = pump_data.get('pump_coef_head')
+            pump_npshr_coef = pump_data.get('pump_coef_npshr')
+            pump_power_coef = pump_data.get('pump_coef_power')
+            pump_eff_coef = pump_data.get('pump_coef_eff')
+            pump_vazao_min = pump_data.get('pump_vazao_min', 0)
+            pump_vazao_max = pump_data.get('pump_vazao_max', 100)
+
+            # Usar o range do sistema para plotar as curvas da bomba
+            if self.system_flow_range:
+                pump_flow_values = np.linspace(self.system_flow_range[0], self.system_flow_range[1], 500)
+            else:
+                # Fallback se não tivermos o range do sistema
+                pump_flow_values = np.linspace(pump_vazao_min, pump_vazao_max, 500)
+
+            # Atualizar cada curva em seu respectivo gráfico
+            self.plot_head_curve(pump_head_coef, pump_flow_values, intersection_point)
+            self.plot_npshr_curve(pump_npshr_coef, pump_flow_values, intersection_point, npsh_disponivel)
+            self.plot_power_curve(pump_power_coef, pump_flow_values, intersection_point)
+            self.plot_eff_curve(pump_eff_coef, pump_flow_values, intersection_point)
+
+        except Exception as e:
+            logging.error(f"Erro ao plotar curvas da bomba: {e}", exc_info=True)
+
+    def _set_operating_point(self, point, vline, annotation, x, y, text):
+        """Posiciona o marcador, a linha vertical e a anotação de um ponto de operação."""
+        point.set_data([x], [y])
+        vline.set_xdata([x, x])
+        annotation.xy = (x, y)
+        annotation.set_text(text)
+        for artist in (point, vline, annotation):
+            artist.set_visible(True)
+
+    def plot_head_curve(self, pump_head_coef: np.ndarray, pump_flow_values: np.ndarray,
+                      intersection_point: Optional[List]):
+        """Atualiza a curva de Head da bomba e o ponto de interseção."""
+        if pump_head_coef is None or len(pump_head_coef) == 0:
+            logging.warning("Coeficientes de Head da bomba vazios ou inválidos")
+            return
+
+        try:
+            self.set_curve_data(self.pump_head_line, pump_flow_values, np.polyval(pump_head_coef, pump_flow_values))
+            self.pump_head_line.set_visible(True)
+
+            if intersection_point is not None and len(intersection_point) >= 2:
+                x, y = intersection_point[0], intersection_point[1]
+                self._set_operating_point(self.head_point, self.head_vline, self.head_annotation,
+                                          x, y, f'({x:.1f}, {y:.1f})')
+                self.head_hline.set_ydata([y, y])
+                self.head_hline.set_visible(True)
+            else:
+                self.hide_operating_point(self.ax_head)
+
+        except Exception as e:
+            logging.error(f"Erro ao plotar curva de Head: {e}", exc_info=True)
+
+    def plot_npshr_curve(self, pump_npshr_coef: np.ndarray, pump_flow_values: np.ndarray,
+                   intersection_point: Optional[List], npsh_disponivel: Optional[Union[float, np.ndarray]]):
+        """
+        Atualiza a curva de NPSHr da bomba e os pontos de NPSH no ponto de operação.
+
+        Parâmetros:
+            pump_npshr_coef (numpy.ndarray): Coeficientes da curva de NPSHr
+            pump_flow_values (numpy.ndarray): Valores de vazão para plotagem
+            intersection_point (list): Ponto de interseção [vazão, head]
+            npsh_disponivel (float ou numpy.ndarray): NPSH disponível do sistema
+        """
+        if pump_npshr_coef is None or len(pump_npshr_coef) == 0:
+            logging.warning("Coeficientes de NPSHr da bomba vazios ou inválidos")
+            return
+
+        try:
+            self.set_curve_data(self.npshr_line, pump_flow_values, np.polyval(pump_npshr_coef, pump_flow_values))
+            self.npshr_line.set_visible(True)
+
+            # Determinar se temos NPSH disponível válido
+            npsh_disp_valid = False
+            if isinstance(npsh_disponivel, (int, float)):
+                npsh_disp_valid = npsh_disponivel > 0
+            elif npsh_disponivel is not None:
+                npsh_disp_valid = np.any(npsh_disponivel > 0)
+
+            if not (npsh_disp_valid and intersection_point is not None and len(intersection_point) >= 2):
+                self.hide_operating_point(self.ax_npshr)
+                return
+
+            x = intersection_point[0]  # Vazão do ponto de operação
+
+            # NPSH disponível e NPSHr no ponto de operação, pelas tabelas das curvas desenhadas
+            if isinstance(npsh_disponivel, (int, float)):
+                npsh_disp_value = npsh_disponivel
+            else:
+                npsh_disp_value = self.curve_value(self.system_npsh_line, x)
+            npshr_value = self.curve_value(self.npshr_line, x)
+            if npsh_disp_value is None or npshr_value is None:
+                self.hide_operating_point(self.ax_npshr)
+                return
+            margin = npsh_disp_value - npshr_value
+
+            self.npsh_disp_point.set_data([x], [npsh_disp_value])
+            self.npsh_disp_point.set_visible(True)
+            self._set_operating_point(self.npshr_point, self.npsh_vline, self.npsh_annotation,
+                                      x, npshr_value, f'Margem: {margin:.1f} m')
+            self.npsh_annotation.xy = (x, (npsh_disp_value + npshr_value) / 2)
+
+        except Exception as e:
+            logging.error(f"Erro ao plotar curva de NPSHr: {e}", exc_info=True)
+
+    def plot_power_curve(self, pump_power_coef: np.ndarray, pump_flow_values: np.ndarray,
+                       intersection_point: Optional[List]):
+        """Atualiza a curva de Potência da bomba e o ponto de operação."""
+        if pump_power_coef is None or len(pump_power_coef) == 0:
+            logging.warning("Coeficientes de Potência da bomba vazios ou inválidos")
+            return
+
+        try:
+            self.set_curve_data(self.power_line, pump_flow_values, np.polyval(pump_power_coef, pump_flow_values))
+            self.power_line.set_visible(True)
+
+            x = intersection_point[0] if intersection_point is not None and len(intersection_point) >= 2 else None
+            power_value = self.curve_value(self.power_line, x) if x is not None else None
+            if power_value is not None:
+                self._set_operating_point(self.power_point, self.power_vline, self.power_annotation,
+                                          x, power_value, f'({x:.1f}, {power_value:.1f} cv)')
+            else:
+                self.hide_operating_point(self.ax_power)
+
+        except Exception as e:
+            logging.error(f"Erro ao plotar curva de Potência: {e}", exc_info=True)
+
+    def plot_eff_curve(self, pump_eff_coef: np.ndarray, pump_flow_values: np.ndarray,
+                      intersection_point: Optional[List]):
+        """Atualiza a curva de Eficiência da bomba e o ponto de operação."""
+        if pump_eff_coef is None or len(pump_eff_coef) == 0:
+            logging.warning("Coeficientes de Eficiência da bomba vazios ou inválidos")
+            return
+
+        try:
+            self.set_curve_data(self.eff_line, pump_flow_values, np.polyval(pump_eff_coef, pump_flow_values))
+            self.eff_line.set_visible(True)
+
+            x = intersection_point[0] if intersection_point is not None and len(intersection_point) >= 2 else None
+            eff_value = self.curve_value(self.eff_line, x) if x is not None else None
+            if eff_value is not None:
+                self._set_operating_point(self.eff_point, self.eff_vline, self.eff_annotation,
+                                          x, eff_value, f'({x:.1f}, {eff_value:.1f}%)')
+            else:
+                self.hide_operating_point(self.ax_eff)
+
+        except Exception as e:
+            logging.error(f"Erro ao plotar curva de Eficiência: {e}", exc_info=True)
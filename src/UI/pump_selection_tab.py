@@ -7,14 +7,17 @@ from PyQt6.QtWidgets import (
     QApplication, QDialog, QTableWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QWidget, QFormLayout, QPushButton,
     QStyledItemDelegate, QGroupBox, QListWidget, QMessageBox,
-    QListWidgetItem, QComboBox
+    QListWidgetItem, QComboBox, QCheckBox, QFileDialog
 )
 from PyQt6.QtGui import QDoubleValidator, QIntValidator
 from typing import Dict, Any, Tuple, Optional
 
 # Importações adicionais
+from core import operating_point, operating_grid, parallel_system_curve
 from UI.func.auto_pump_selection import auto_pump_selection
-from UI.pump_graph import PumpGraphComponent  # Novo componente de gráficos
+from UI.func.uncertainty import uncertainty_sweep, UNCERTAINTY_SPREADS, N_SAMPLES
+from UI.func.temperature_range import select_over_temperature_range, pump_key
+from UI.func.startup_metrics import timed
 
 
 class FloatDelegate(QStyledItemDelegate):
@@ -112,6 +115,7 @@ class PumpSelectionWidget(QWidget):
         self.system_input_widget = system_input_widget
         self.fluid_prop_input_widget = fluid_prop_input_widget
         self.system_curve = None
+        self.system_model = None
         self.system_curve_adjusted = None
         self.target_flow = None
         self.pumps = []
@@ -220,6 +224,21 @@ class PumpSelectionWidget(QWidget):
         self.list_widget.itemDoubleClicked.connect(self.on_item_double_clicked)
         list_layout.addWidget(self.list_widget)
         
+        # Sobreposição das curvas de todas as candidatas nos gráficos
+        self.check_sobreposicao = QCheckBox("Sobrepor curvas das candidatas", pump_list_box)
+        self.check_sobreposicao.toggled.connect(self.atualizar_sobreposicao)
+        list_layout.addWidget(self.check_sobreposicao)
+        
+        # Leitura dos valores das curvas na vazão sob o cursor
+        self.check_leitura_cursor = QCheckBox("Leitura com cursor nos gráficos", pump_list_box)
+        self.check_leitura_cursor.toggled.connect(lambda checked: self.graph_component.set_crosshair_enabled(checked))
+        list_layout.addWidget(self.check_leitura_cursor)
+        
+        # Exportação das folhas de dados de todas as bombas da lista
+        self.btn_exportar_folhas = QPushButton("Exportar Folhas de Dados", pump_list_box)
+        self.btn_exportar_folhas.clicked.connect(self.exportar_folhas_dados)
+        list_layout.addWidget(self.btn_exportar_folhas)
+        
         return pump_list_box
     
     def setup_pump_data_group(self) -> QGroupBox:
@@ -260,20 +279,52 @@ class PumpSelectionWidget(QWidget):
         self.result_npsh_comparison.setReadOnly(True)
         data_layout.addRow("Margem de NPSH:", self.result_npsh_comparison)
         
+        # Botão para análise de incerteza da bomba selecionada
+        self.btn_analise_incerteza = QPushButton("Análise de Incerteza", pump_data_box)
+        self.btn_analise_incerteza.clicked.connect(self.analisar_incerteza)
+        data_layout.addRow(self.btn_analise_incerteza)
+        
         return pump_data_box
     
     def setup_right_panel(self) -> QWidget:
         """Configura o painel direito com os múltiplos gráficos."""
         right_widget = QWidget(self)
-        right_layout = QVBoxLayout(right_widget)
-        right_layout.setContentsMargins(0, 0, 0, 0)  # Remover margens para maximizar espaço
+        self.right_layout = QVBoxLayout(right_widget)
+        self.right_layout.setContentsMargins(0, 0, 0, 0)  # Remover margens para maximizar espaço
         
-        # Usar o componente de gráficos dedicado
-        self.graph_component = PumpGraphComponent(self)
-        right_layout.addWidget(self.graph_component)
+        # O componente de gráficos (e o matplotlib) só é criado quando a aba é exibida pela primeira
+        # vez ou quando algum método precisa dos gráficos (propriedade graph_component)
+        self._graph_component = None
         
         return right_widget
     
+    @property
+    def graph_component(self):
+        """Componente de gráficos, criado no primeiro uso."""
+        return self.criar_graficos()
+    
+    def criar_graficos(self):
+        """Cria o componente de gráficos, se ainda não existir, e o retorna."""
+        if self._graph_component is None:
+            with timed("graficos_selecao"):
+                from UI.pump_graph import PumpGraphComponent
+                self._graph_component = PumpGraphComponent(self)
+                self._graph_component.bombaSobreposicaoClicada.connect(self.selecionar_bomba_sobreposicao)
+                self.right_layout.addWidget(self._graph_component)
+        return self._graph_component
+    
+    def showEvent(self, event):
+        """Na primeira exibição da aba, cria os gráficos logo após os controles serem desenhados."""
+        super().showEvent(event)
+        if self._graph_component is None:
+            QTimer.singleShot(0, self.criar_graficos_apos_pintura)
+    
+    def criar_graficos_apos_pintura(self):
+        """Desenha os controles da aba imediatamente e só então cria os gráficos."""
+        if self._graph_component is None:
+            self.repaint()
+            self.criar_graficos()
+    
     def setup_db_timer(self):
         """Configura um timer para monitorar alterações no banco de dados."""
         self.last_db_mod_time = os.path.getmtime("./src/db/pump_data.db")
@@ -301,6 +352,7 @@ class PumpSelectionWidget(QWidget):
         
         # Obter dados do sistema
         self.system_curve = self.system_input_widget.get_system_curve()
+        self.system_model = self.system_input_widget.get_system_model()
         self.target_flow = self.system_input_widget.get_target_flow()
         npsh_disponivel = self.system_input_widget.get_npsh_disponivel()
         
@@ -428,6 +480,8 @@ class PumpSelectionWidget(QWidget):
         self.result_npsh.setText("")
         self.result_rotor_diametro.setText("")
         self.result_npsh_comparison.setText("")
+        
+        self.atualizar_sobreposicao()
     
     def extrair_valores_intersecao(self, pump: Dict[str, Any], system_curve: Optional[np.ndarray] = None) -> Tuple[float, float]:
         """
@@ -558,7 +612,16 @@ class PumpSelectionWidget(QWidget):
         logging.info(f"Chamando auto_pump_selection com vazão={vazao_por_bomba:.2f}")
         
         # Selecionar bombas usando auto_pump_selection
-        pumps = auto_pump_selection(system_curve_adjusted, vazao_por_bomba)
+        system_model = self.system_model.for_parallel_pumps(n_bombas) if self.system_model is not None else None
+        # As curvas do catálogo (em água) são corrigidas para a viscosidade do fluido (HI 9.6.7)
+        pumps = auto_pump_selection(system_curve_adjusted, vazao_por_bomba, system_model=system_model,
+                                    mu=self.fluid_prop_input_widget.get_mu_input_value(),
+                                    rho=self.fluid_prop_input_widget.get_rho_input_value())
+        
+        # Seleção por faixa de temperatura: mantém apenas as bombas aprovadas em todas as temperaturas
+        temperature_range = self.fluid_prop_input_widget.get_temperature_range()
+        if temperature_range is not None and system_model is not None and not isinstance(pumps, str):
+            pumps = self.filtrar_faixa_temperatura(pumps, system_model, vazao_por_bomba, temperature_range)
         
         # Reset da interface
         self.list_widget.clear()
@@ -568,6 +631,7 @@ class PumpSelectionWidget(QWidget):
         if isinstance(pumps, str):
             self.list_widget.addItem(pumps)
             self.pumps = []
+            self.atualizar_sobreposicao()
             
             # Atualizar o gráfico mesmo sem bomba selecionada
             # Importante: use a vazão por bomba para o flow_values no gráfico
@@ -587,6 +651,41 @@ class PumpSelectionWidget(QWidget):
         self.processar_bombas(pumps, npsh_disponivel_valor, npsh_disponivel_curva, vazao_por_bomba, n_bombas, flow_values)
 
     
+    def filtrar_faixa_temperatura(self, pumps, system_model, vazao_por_bomba, temperature_range):
+        """
+        Filtra as bombas pela seleção em faixa de temperatura (ver select_over_temperature_range).
+        
+        Parâmetros:
+            pumps: Lista de bombas retornadas pelo auto_pump_selection
+            system_model: SystemCurve ajustada para as bombas em paralelo
+            vazao_por_bomba: Vazão alvo por bomba
+            temperature_range: (t_min, t_max) em °C
+        
+        Retorna:
+            Lista das bombas aprovadas em toda a faixa, ou mensagem (str) se nenhuma for aprovada
+        """
+        t_min, t_max = temperature_range
+        try:
+            resultado = select_over_temperature_range(system_model, vazao_por_bomba,
+                                                      self.fluid_prop_input_widget.get_fluid_name(), t_min, t_max)
+        except ValueError as e:
+            QMessageBox.warning(self, "Aviso", f"Seleção por faixa de temperatura indisponível: {e}")
+            return pumps
+        
+        aprovadas = {pump_key(pump): pump for pump in resultado["pumps"]}
+        pumps_faixa = []
+        for pump in pumps:
+            faixa = aprovadas.get(pump_key(pump))
+            if faixa is not None:
+                pump.update({key: faixa[key] for key in ("vazao_min_faixa", "vazao_max_faixa",
+                                                         "npsh_margem_min", "temperatura_npsh_critica")})
+                pumps_faixa.append(pump)
+        
+        logging.info(f"Faixa de {t_min:.1f} a {t_max:.1f} °C: {len(pumps_faixa)} de {len(pumps)} bombas aprovadas")
+        if not pumps_faixa:
+            return f"Nenhuma bomba atende ao sistema em toda a faixa de {t_min:.1f} a {t_max:.1f} °C."
+        return pumps_faixa
+    
     def verificar_precondições_selecao(self) -> bool:
         """Verifica as pré-condições para a seleção de bombas."""
         if self.system_curve is None or self.target_flow is None:
@@ -656,6 +755,7 @@ class PumpSelectionWidget(QWidget):
         if not pumps_filtered:
             self.list_widget.addItem("Nenhuma bomba atende ao critério de NPSH disponível.")
             self.pumps = []
+            self.atualizar_sobreposicao()
             
             # Atualizar o gráfico mesmo sem bomba selecionada
             self.graph_component.update_plots(
@@ -701,9 +801,9 @@ class PumpSelectionWidget(QWidget):
     
     def calcular_ponto_operacao(self, pump, n_bombas):
         """
-        Calcula o ponto de operação da bomba e a margem de NPSH.
-        Usa diretamente as informações de interseção fornecidas por auto_pump_selection.
-        Considera o número de bombas em paralelo para o cálculo correto.
+        Calcula o ponto de operação da bomba e a margem de NPSH (core.operating_point), a partir das
+        interseções fornecidas por auto_pump_selection e da curva de NPSH disponível da aba de sistema.
+        Os valores são gravados no próprio dicionário da bomba.
         
         Parâmetros:
             pump: Dicionário com dados da bomba
@@ -713,75 +813,14 @@ class PumpSelectionWidget(QWidget):
             # Extrair vazão e head do ponto de interseção
             vazao_bomba, head_value = self.extrair_valores_intersecao(pump, self.system_curve_adjusted)
             
-            # Verificação de segurança para vazão inválida
-            if vazao_bomba <= 0:
-                vazao_bomba = self.target_flow / n_bombas
-                head_value = np.polyval(self.system_curve_adjusted, vazao_bomba)
-            
-            # Calcular vazão total
-            vazao_total = vazao_bomba * n_bombas
-            
-            # Armazenar os valores calculados para uso posterior
-            pump['vazao_bomba'] = vazao_bomba
-            pump['vazao_total'] = vazao_total
-            pump['head_value'] = head_value
-            pump['ponto_intersecao'] = [vazao_bomba, head_value]
-            
-            # Criar array com valores de vazão amplos para garantir cobertura
-            flow_values = np.linspace(0, self.target_flow * 1.4, 500)
-            
-            # Obter curva completa de NPSH disponível para visualização e cálculos
-            npsh_disponivel_curva = self.system_input_widget.get_npsh_disponivel(flow_values)
-            
-            # Encontrar o valor exato no ponto de operação por bomba
-            idx_bomba = np.abs(flow_values - vazao_bomba).argmin()
-            
-            # Log dos valores de vazão e índice para depuração
-            logging.info(f"Ponto de operação: vazão por bomba={vazao_bomba:.2f} m³/h, índice={idx_bomba}")
+            # Curva de NPSH disponível na grade de vazões totais do ponto de operação
+            npsh_disponivel_curva = self.system_input_widget.get_npsh_disponivel(operating_grid(self.target_flow))
             
-            # Calcular valores de NPSHr, eficiência e potência no ponto de operação
-            try:
-                # Garantir que temos coeficientes válidos
-                if all(k in pump for k in ['pump_coef_npshr', 'pump_coef_eff', 'pump_coef_power']):
-                    # Calcular NPSHr no ponto de operação
-                    if pump['pump_coef_npshr'] is not None:
-                        npshr_value = np.polyval(pump['pump_coef_npshr'], vazao_bomba)
-                        pump['pump_npshr'] = npshr_value
-                        logging.info(f"NPSHr calculado no ponto de operação: {npshr_value:.2f} m")
-                    
-                    # Calcular eficiência no ponto de operação
-                    if pump['pump_coef_eff'] is not None:
-                        eff_value = np.polyval(pump['pump_coef_eff'], vazao_bomba)
-                        pump['pump_eff'] = eff_value
-                    
-                    # Calcular potência no ponto de operação
-                    if pump['pump_coef_power'] is not None:
-                        power_value = np.polyval(pump['pump_coef_power'], vazao_bomba)
-                        pump['pump_power'] = power_value
-            except Exception as e:
-                logging.error(f"Erro ao calcular valores da bomba no ponto de operação: {e}", exc_info=True)
-            
-            # Calcular margem de NPSH no ponto de operação
-            try:
-                # Verificar se temos o valor de NPSH disponível no ponto específico
-                if idx_bomba < len(npsh_disponivel_curva):
-                    npsh_disponivel_value = npsh_disponivel_curva[idx_bomba]
-                    npsh_requerido = pump.get('pump_npshr', 0)
-                    
-                    # Armazenar os valores específicos
-                    pump['npsh_disponivel_ponto'] = npsh_disponivel_value
-                    margem_npsh = npsh_disponivel_value - npsh_requerido
-                    
-                    # Armazenar a margem calculada
-                    pump['npsh_margin'] = margem_npsh
-                    
-                    logging.info(f"Margem de NPSH calculada: {margem_npsh:.2f} m (NPSH disponível: {npsh_disponivel_value:.2f} m, NPSHr: {npsh_requerido:.2f} m)")
-                else:
-                    logging.warning(f"Índice de vazão fora dos limites: {idx_bomba} >= {len(npsh_disponivel_curva)}")
-            except Exception as e:
-                logging.error(f"Erro ao calcular margem de NPSH: {e}", exc_info=True)
+            pump.update(operating_point(pump, vazao_bomba, head_value, n_bombas, self.target_flow,
+                                        self.system_curve_adjusted, npsh_disponivel_curva))
             
-            logging.info(f"Ponto de operação calculado: vazão={vazao_bomba:.2f}, head={head_value:.2f}, vazão total={vazao_total:.2f}")
+            logging.info(f"Ponto de operação calculado: vazão={pump['vazao_bomba']:.2f}, head={pump['head_value']:.2f}, "
+                         f"vazão total={pump['vazao_total']:.2f}")
             
         except Exception as e:
             logging.error(f"Erro ao calcular ponto de operação: {e}", exc_info=True)
@@ -801,40 +840,41 @@ class PumpSelectionWidget(QWidget):
         
         # Atualizar o estilo da lista
         self.list_widget.setStyleSheet("QListWidget::item:selected { background-color: lightblue; }")
+        
+        self.atualizar_sobreposicao()
+    
+    def atualizar_sobreposicao(self):
+        """Sobrepõe nos gráficos as curvas das bombas da lista, se a opção estiver marcada."""
+        if self.check_sobreposicao.isChecked() and self.pumps:
+            labels = [self.formatar_item_lista(pump)[0] for pump in self.pumps]
+            self.graph_component.set_overlay(self.pumps, labels)
+        else:
+            self.graph_component.set_overlay(None)
+    
+    def selecionar_bomba_sobreposicao(self, index):
+        """Seleciona a bomba clicada na sobreposição, como um duplo clique na lista."""
+        item = self.list_widget.item(index)
+        if item is not None and index < len(self.pumps):
+            self.list_widget.setCurrentRow(index)
+            self.on_item_double_clicked(item)
     
     def adjust_system_curve_for_parallel_pumps(self, original_curve, n_bombas):
         """
-        Ajusta a curva do sistema para considerar bombas em paralelo.
+        Ajusta a curva do sistema para considerar bombas em paralelo (core.parallel_system_curve).
         
         Parâmetros:
             original_curve: coeficientes da curva do sistema original
             n_bombas: número de bombas em paralelo
             
         Retorna:
-            Novos coeficientes para a curva ajustada
+            Novos coeficientes para a curva ajustada, ou None se a curva for inválida
         """
         try:
-            if original_curve is None or len(original_curve) == 0:
-                logging.error("Curva original é inválida")
-                return None
-                
-            # Determinar um intervalo apropriado para os valores de vazão
-            max_flow = getattr(self, 'target_flow', 100.0) * 1.4
-            
-            # Gerar conjunto de valores de vazão (eixo x)
-            x_original = np.linspace(0.001, max_flow, 100)
-            
-            # Calcular os valores de head correspondentes
-            y_original = np.polyval(original_curve, x_original)
-            
-            # Ajustar os valores de vazão dividindo pelo número de bombas
-            x_adjusted = x_original / n_bombas
-            
-            # Realizar um novo ajuste polinomial de grau 5
-            adjusted_curve = np.polyfit(x_adjusted, y_original, 5)
-            
+            # Com a curva física disponível, o substituto é recalculado diretamente para Q_total = n * Q
+            system_model = self.system_model if original_curve is self.system_curve else None
+            adjusted_curve = parallel_system_curve(original_curve, n_bombas, system_model=system_model,
+                                                   max_flow=(self.target_flow or 100.0) * 1.4)
             logging.info(f"Curva ajustada para {n_bombas} bombas: {adjusted_curve[:3]}...")
-            
             return adjusted_curve
             
         except Exception as e:
@@ -966,6 +1006,79 @@ class PumpSelectionWidget(QWidget):
             self.result_npsh_comparison.setText("Erro")
 
     
+    def analisar_incerteza(self):
+        """
+        Avalia o ponto de operação da bomba selecionada com incerteza na rugosidade, na viscosidade
+        e na altura estática, e mostra os percentis P5/P50/P95 de vazão, head e margem de NPSH.
+        """
+        if self.selected_pump_index is None or self.selected_pump_index >= len(self.pumps) or self.system_model is None:
+            QMessageBox.warning(self, "Aviso", "Selecione uma bomba antes de executar a análise de incerteza.")
+            return
+        
+        try:
+            pump = self.pumps[self.selected_pump_index]
+            n_bombas = int(self.combo_n_bombas.currentText())
+            temperatura = self.fluid_prop_input_widget.temperature_input.value()
+            p_vapor = self.system_input_widget.calcular_pressao_vapor(temperatura)
+            
+            resultado = uncertainty_sweep(self.system_model.for_parallel_pumps(n_bombas), pump, p_vapor)
+            if not resultado["percentis"]:
+                QMessageBox.warning(self, "Análise de Incerteza",
+                                    "Nenhuma amostra possui ponto de operação na faixa da bomba.")
+                return
+            
+            def faixa(chave):
+                p = resultado["percentis"][chave]
+                return f"{p[5]:.2f} / {p[50]:.2f} / {p[95]:.2f}".replace('.', ',')
+            
+            spreads = UNCERTAINTY_SPREADS
+            QMessageBox.information(
+                self,
+                "Análise de Incerteza",
+                f"{N_SAMPLES} amostras (rugosidade ±{spreads['roughness']:.0%}, "
+                f"viscosidade ±{spreads['viscosity']:.0%}, altura estática ±{spreads['static_head']:.1f} m)\n\n"
+                f"P5 / P50 / P95 por bomba:\n"
+                f"Vazão (m³/h): {faixa('vazao')}\n"
+                f"Head (m): {faixa('head')}\n"
+                f"Margem de NPSH (m): {faixa('npsh_margem')}\n\n"
+                f"Amostras com ponto de operação: {resultado['fracao_operando']:.1%}\n"
+                f"Amostras com NPSH insuficiente: {resultado['fracao_npsh_insuficiente']:.1%}"
+            )
+        except Exception as e:
+            logging.error(f"Erro na análise de incerteza: {e}", exc_info=True)
+            QMessageBox.critical(self, "Erro", f"Erro na análise de incerteza: {str(e)}")
+    
+    def exportar_folhas_dados(self):
+        """Exporta em PDF as folhas de dados (sistema + bomba) de todas as bombas da lista."""
+        if not self.pumps or self.system_curve is None or self.target_flow is None:
+            QMessageBox.warning(self, "Aviso", "Selecione as bombas antes de exportar as folhas de dados.")
+            return
+        
+        output_dir = QFileDialog.getExistingDirectory(self, "Diretório das Folhas de Dados")
+        if not output_dir:
+            return
+        
+        try:
+            from UI.func.datasheet_export import export_datasheets
+            
+            n_bombas = int(self.combo_n_bombas.currentText())
+            flow_values = np.linspace(0, self.target_flow / n_bombas * 1.4, 500)
+            npsh_disponivel = (flow_values, self.system_input_widget.get_npsh_disponivel(flow_values))
+            selections = [{
+                'pump': pump,
+                'system_curve': self.system_curve,
+                'target_flow': self.target_flow,
+                'n_bombas': n_bombas,
+                'npsh_disponivel': npsh_disponivel,
+            } for pump in self.pumps]
+            
+            paths = export_datasheets(selections, output_dir)
+            QMessageBox.information(self, "Exportar Folhas de Dados",
+                                    f"{len(paths)} folha(s) de dados exportada(s) em:\n{output_dir}")
+        except Exception as e:
+            logging.error(f"Erro ao exportar folhas de dados: {e}", exc_info=True)
+            QMessageBox.critical(self, "Erro", f"Erro ao exportar folhas de dados: {str(e)}")
+    
     def atualizar_grafico_bomba_selecionada(self, pump):
         """Atualiza o gráfico com os dados da bomba selecionada."""
         try:
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Módulo: batch_select.py
+Descrição:
+    Linha de comando para a seleção de bombas em lote, sem interface gráfica (ver UI.func.batch_selection).
+
+    Lê especificações de serviço (vazão, sistema, fluido, temperatura, bombas em paralelo) de um arquivo
+    CSV ou JSONL, seleciona as bombas de cada uma em um pool de processos e grava o ranking, uma linha por
+    bomba, em JSONL ou Parquet à medida que os resultados ficam prontos.
+
+Uso (a partir da raiz do repositório):
+    python src/batch_select.py servicos.csv -o resultado.jsonl [--top 5] [--workers 4]
+    python src/batch_select.py servicos.jsonl -o resultado.parquet
+    python src/batch_select.py servicos.csv -o -          (JSONL na saída padrão)
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from UI.func.batch_selection import read_duty_specs, run_batch, write_results, OUTPUT_FORMATS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seleção de bombas em lote a partir de especificações de serviço.")
+    parser.add_argument("input", help="especificações em CSV ou JSONL")
+    parser.add_argument("-o", "--output", required=True, help="arquivo de saída (.jsonl, .parquet ou '-')")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="formato de saída (padrão: pela extensão)")
+    parser.add_argument("--top", type=int, help="número máximo de bombas por especificação")
+    parser.add_argument("--workers", type=int, help="processos de seleção (padrão: número de CPUs)")
+    parser.add_argument("--chunksize", type=int, help="especificações por tarefa enviada aos processos")
+    parser.add_argument("-v", "--verbose", action="store_true", help="mostra o log detalhado da seleção")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s - %(levelname)s - %(message)s", stream=sys.stderr)
+
+    start = time.perf_counter()
+    specs = read_duty_specs(args.input)
+    rows = run_batch(specs, top=args.top, max_workers=args.workers, chunksize=args.chunksize)
+    try:
+        n_rows = write_results(rows, args.output, args.format)
+    except RuntimeError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    print(f"{len(specs)} especificação(ões), {n_rows} linha(s) gravada(s) em {args.output} "
+          f"({time.perf_counter() - start:.1f} s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
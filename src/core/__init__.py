@@ -0,0 +1,19 @@
+"""
+Pacote: core
+Descrição:
+    Núcleo de cálculo do aplicativo, sem Qt: entradas tipadas (SystemSpec, FluidState, SelectionRequest)
+    e as funções de sistema e de seleção usadas pela interface, pela linha de comando em lote e pelo
+    serviço HTTP. Nada neste pacote lê widgets ou requer uma QApplication.
+"""
+
+from core.specs import PipeSection, SystemSpec, FluidState, SelectionRequest
+from core.system import (build_system, solve_system, parallel_system_curve, temperature_range, vapor_pressure,
+                         npsh_available, suction_friction_loss)
+from core.selection import operating_point, operating_grid, flow_grid, select_pumps, select_many
+
+__all__ = [
+    "PipeSection", "SystemSpec", "FluidState", "SelectionRequest",
+    "build_system", "solve_system", "parallel_system_curve", "temperature_range", "vapor_pressure",
+    "npsh_available", "suction_friction_loss",
+    "operating_point", "operating_grid", "flow_grid", "select_pumps", "select_many",
+]
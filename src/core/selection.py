@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Módulo: selection.py
+Descrição:
+    Seleção de bombas sem interface gráfica, com a mesma sequência da aba de seleção: curva do sistema,
+    curva ajustada para as bombas em paralelo, auto_pump_selection, filtro de NPSH no ponto de operação de
+    cada bomba, cálculo do ponto de operação e ordenação pela proximidade da vazão de projeto por bomba.
+
+Funcionalidades:
+    - flow_grid / operating_grid: grades de vazão por bomba e total usadas nas curvas de NPSH disponível.
+    - operating_point: ponto de operação de uma bomba (vazão, head, eficiência, potência e margem de NPSH).
+    - select_pumps: executa um SelectionRequest e retorna as bombas aprovadas.
+    - select_many: executa uma sequência de pedidos (gerador), no processo atual.
+"""
+
+import logging
+
+import numpy as np
+
+from UI.func.auto_pump_selection import auto_pump_selection
+from core.system import solve_system, FLOW_MARGIN
+
+N_FLOW_POINTS = 500       # pontos das grades de vazão
+
+
+def flow_grid(flow):
+    """Grade de vazões de 0 a flow * FLOW_MARGIN (m³/h)."""
+    return np.linspace(0, flow * FLOW_MARGIN, N_FLOW_POINTS)
+
+
+def operating_grid(target_flow):
+    """Grade de vazões totais em que o NPSH disponível do ponto de operação é tomado."""
+    return flow_grid(target_flow)
+
+
+def nearest_on_grid(flow_values, values, flow):
+    """Valor da curva no ponto da grade mais próximo da vazão informada."""
+    return values[np.abs(flow_values - flow).argmin()]
+
+
+def operating_point(pump, vazao_bomba, head_value, n_bombas, target_flow, adjusted_curve, npsh_curve):
+    """
+    Ponto de operação de uma bomba e margem de NPSH.
+
+    Parâmetros:
+        pump (dict): bomba no formato de auto_pump_selection (coeficientes pump_coef_*; curvas ausentes
+                     ou None mantêm os valores já presentes em pump)
+        vazao_bomba (float): vazão por bomba na interseção (m³/h); não positiva usa a vazão de projeto
+        head_value (float): head na interseção (m)
+        n_bombas (int): número de bombas em paralelo
+        target_flow (float): vazão total de projeto (m³/h)
+        adjusted_curve: coeficientes da curva do sistema para as bombas em paralelo
+        npsh_curve: NPSH disponível na grade operating_grid(target_flow)
+
+    Retorna:
+        dict: vazao_bomba, vazao_total, head_value, ponto_intersecao, pump_npshr, pump_eff, pump_power,
+              npsh_disponivel_ponto e npsh_margin (None sem curva de NPSHr)
+    """
+    if vazao_bomba <= 0:
+        vazao_bomba = target_flow / n_bombas
+        head_value = np.polyval(adjusted_curve, vazao_bomba)
+
+    point = {
+        "vazao_bomba": vazao_bomba,
+        "vazao_total": vazao_bomba * n_bombas,
+        "head_value": head_value,
+        "ponto_intersecao": [vazao_bomba, head_value],
+    }
+    for key in ("npshr", "eff", "power"):
+        coef = pump.get(f"pump_coef_{key}")
+        point[f"pump_{key}"] = np.polyval(coef, vazao_bomba) if coef is not None else pump.get(f"pump_{key}")
+
+    npsh_ponto = nearest_on_grid(operating_grid(target_flow), npsh_curve, vazao_bomba)
+    point["npsh_disponivel_ponto"] = npsh_ponto
+    point["npsh_margin"] = npsh_ponto - point["pump_npshr"] if point["pump_npshr"] is not None else None
+    return point
+
+
+def select_pumps(request):
+    """
+    Executa a seleção de bombas de um pedido.
+
+    Parâmetros:
+        request (SelectionRequest): sistema, fluido, número de bombas e limite de resultados
+
+    Retorna:
+        list ou str: bombas aprovadas (formato de auto_pump_selection acrescido de operating_point),
+                     ordenadas pela proximidade da vazão de projeto por bomba, ou a mensagem quando
+                     nenhuma bomba atende
+    """
+    system_model, npsh = solve_system(request.system, request.fluid)
+    target_flow = request.system.target_flow
+    n_bombas = request.n_bombas
+    vazao_por_bomba = request.flow_per_pump
+
+    # Grade de vazões por bomba usada no filtro de NPSH, como em selecionar_bomba
+    flow_values = flow_grid(vazao_por_bomba)
+    npsh_curve = npsh(flow_values)
+
+    parallel_model = system_model.for_parallel_pumps(n_bombas)
+    adjusted_curve = parallel_model.coefficients
+    pumps = auto_pump_selection(adjusted_curve, vazao_por_bomba, system_model=parallel_model,
+                                mu=request.fluid.mu, rho=request.fluid.rho)
+    if isinstance(pumps, str):
+        return pumps
+
+    npsh_total_curve = npsh(operating_grid(target_flow))
+    accepted = []
+    for pump in pumps:
+        vazao_bomba = float(pump["intersecoes"][0][0])
+        if not pump["pump_npshr"] < nearest_on_grid(flow_values, npsh_curve, vazao_bomba):
+            logging.info(f"Bomba filtrada por NPSH: {pump['marca']} {pump['modelo']} (vazão={vazao_bomba:.2f})")
+            continue
+        head_value = float(np.polyval(adjusted_curve, vazao_bomba))
+        pump.update(operating_point(pump, vazao_bomba, head_value, n_bombas, target_flow, adjusted_curve,
+                                    npsh_total_curve))
+        accepted.append(pump)
+
+    if not accepted:
+        return "Nenhuma bomba atende ao critério de NPSH disponível."
+    accepted.sort(key=lambda pump: abs(pump["vazao_bomba"] - vazao_por_bomba))
+    return accepted[:request.top]
+
+
+def select_many(requests):
+    """
+    Executa uma sequência de pedidos no processo atual.
+
+    Retorna:
+        gerador: (request, resultado de select_pumps) na ordem dos pedidos
+    """
+    for request in requests:
+        yield request, select_pumps(request)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Módulo: specs.py
+Descrição:
+    Entradas tipadas do núcleo de cálculo: trechos de tubulação, sistema, estado do fluido e pedido de
+    seleção. São objetos imutáveis e serializáveis (pickle), que podem ser enviados a threads, processos de
+    trabalho e serviços sem depender dos widgets.
+
+Funcionalidades:
+    - PipeSection: trecho de sucção ou recalque (comprimento, altura, diâmetro e singularidades).
+    - SystemSpec: sistema de bombeamento (vazão de projeto, trechos, rugosidade e método de perdas).
+    - FluidState: propriedades do fluido na temperatura de operação.
+    - SelectionRequest: sistema, fluido e número de bombas em paralelo de uma seleção.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from UI.extra.local_loss import LOCAL_LOSS_METHODS
+from UI.func.fluid_properties import FLUIDS, get_fluid_table
+
+
+@dataclass(frozen=True)
+class PipeSection:
+    """
+    Trecho de tubulação.
+
+    Parâmetros:
+        length: comprimento físico (m)
+        height: diferença de elevação (m)
+        size: chave da tabela de diâmetros (ex.: '50 (2")')
+        fittings: quantidades das singularidades, na ordem das colunas da tabela de comprimentos equivalentes
+    """
+    length: float
+    height: float
+    size: str
+    fittings: Tuple[float, ...] = ()
+
+    @classmethod
+    def from_array(cls, values, size):
+        """Trecho a partir do vetor da aba de sistema: [comprimento, altura, ...singularidades]."""
+        values = [float(v) for v in values]
+        return cls(values[0], values[1], size, tuple(values[2:]))
+
+    def as_array(self):
+        """Vetor no formato de build_system_curve: [comprimento, altura, ...singularidades]."""
+        return [self.length, self.height, *self.fittings]
+
+
+@dataclass(frozen=True)
+class SystemSpec:
+    """
+    Sistema de bombeamento.
+
+    Parâmetros:
+        target_flow: vazão total de projeto (m³/h)
+        suction: trecho de sucção
+        discharge: trecho de recalque
+        roughness: rugosidade absoluta da tubulação (mm)
+        local_loss_method: método das perdas localizadas (LOCAL_LOSS_METHODS)
+    """
+    target_flow: float
+    suction: PipeSection
+    discharge: PipeSection
+    roughness: float = 0.045
+    local_loss_method: str = "eq_length"
+
+    def __post_init__(self):
+        if self.target_flow <= 0:
+            raise ValueError("A vazão deve ser positiva")
+        if self.local_loss_method not in LOCAL_LOSS_METHODS:
+            raise ValueError(f"Método de perdas localizadas desconhecido: {self.local_loss_method}")
+
+
+@dataclass(frozen=True)
+class FluidState:
+    """
+    Propriedades do fluido na temperatura de operação.
+
+    Parâmetros:
+        mu: viscosidade dinâmica (cP)
+        rho: massa específica (kg/m³)
+        p_vapor: pressão de vapor (Pa)
+        temperature: temperatura (°C), se conhecida
+        name: nome do fluido (FLUIDS), se conhecido
+    """
+    mu: float
+    rho: float
+    p_vapor: float
+    temperature: Optional[float] = None
+    name: Optional[str] = None
+
+    @classmethod
+    def from_table(cls, fluid, temperature, mu=None, rho=None):
+        """
+        Estado do fluido a partir da tabela de propriedades (fluid_properties).
+
+        mu e rho informados substituem os da tabela; a temperatura é limitada à faixa da tabela. Fluidos
+        fora de FLUIDS exigem mu e rho e têm pressão de vapor nula.
+
+        Parâmetros:
+            fluid (str): nome do fluido
+            temperature (float): temperatura (°C)
+            mu (float): viscosidade dinâmica (cP), opcional
+            rho (float): massa específica (kg/m³), opcional
+        """
+        if fluid not in FLUIDS:
+            if mu is None or rho is None:
+                raise ValueError(f"Fluido desconhecido: {fluid} (informe mu e rho para fluidos personalizados)")
+            return cls(mu, rho, 0.0, temperature, fluid)
+
+        table = get_fluid_table(fluid)
+        t = min(max(temperature, table.t_min), table.t_max)
+        return cls(
+            mu if mu is not None else float(table.mu(t)) * 1000,   # Pa.s -> cP
+            rho if rho is not None else float(table.rho(t)),
+            float(table.p_vapor(t)),
+            temperature,
+            fluid,
+        )
+
+
+@dataclass(frozen=True)
+class SelectionRequest:
+    """
+    Pedido de seleção de bombas.
+
+    Parâmetros:
+        system: sistema de bombeamento
+        fluid: estado do fluido
+        n_bombas: número de bombas idênticas em paralelo
+        top: número máximo de bombas no resultado (None: todas)
+        id: identificação do pedido
+    """
+    system: SystemSpec
+    fluid: FluidState
+    n_bombas: int = 1
+    top: Optional[int] = None
+    id: str = "1"
+
+    def __post_init__(self):
+        if self.n_bombas < 1:
+            raise ValueError("O número de bombas deve ser pelo menos 1")
+
+    @property
+    def flow_per_pump(self):
+        """Vazão de projeto por bomba (m³/h)."""
+        return self.system.target_flow / self.n_bombas
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Módulo: system.py
+Descrição:
+    Cálculos do sistema de bombeamento sem interface gráfica: curva do sistema, curva vista por cada uma
+    de n bombas em paralelo, pressão de vapor e NPSH disponível. As funções aceitam arrays de vazões (e,
+    onde indicado, de temperaturas) e podem ser usadas em threads, processos e serviços.
+
+Funcionalidades:
+    - build_system: curva do sistema (SystemCurve) de um SystemSpec e um FluidState.
+    - solve_system: curva do sistema e função de NPSH disponível, como na aba de sistema.
+    - parallel_system_curve: coeficientes da curva do sistema para bombas em paralelo.
+    - temperature_range / vapor_pressure: faixa da tabela e pressão de vapor de um fluido.
+    - npsh_available: NPSH disponível para uma ou mais vazões.
+"""
+
+import numpy as np
+
+from UI.func.fluid_properties import get_fluid_table
+from UI.func.pressure_drop.total_head_loss import build_system_curve
+
+P_ATM = 101325.0          # pressão atmosférica padrão ao nível do mar (Pa)
+G = 9.81                  # aceleração da gravidade (m/s²)
+FLOW_MARGIN = 1.4         # vazão máxima das curvas em relação à vazão de projeto
+N_FIT_POINTS = 100        # pontos do reajuste da curva em paralelo quando não há curva física
+
+
+def build_system(spec, fluid):
+    """
+    Monta a curva do sistema.
+
+    Parâmetros:
+        spec (SystemSpec): sistema de bombeamento
+        fluid (FluidState): estado do fluido
+
+    Retorna:
+        SystemCurve: curva com os trechos [sucção, recalque] e vazão máxima spec.target_flow * FLOW_MARGIN
+    """
+    return build_system_curve(
+        spec.suction.as_array(), spec.suction.size,
+        spec.discharge.as_array(), spec.discharge.size,
+        spec.target_flow, fluid.mu, fluid.rho, spec.roughness / 1000,   # mm -> m
+        local_loss_method=spec.local_loss_method
+    )
+
+
+def suction_friction_loss(system_model, target_flow):
+    """Perda de carga na sucção (m) na vazão de projeto, sem a elevação."""
+    return float(system_model.section_loss(target_flow, 0, include_height=False)[0])
+
+
+def solve_system(spec, fluid):
+    """
+    Curva do sistema e NPSH disponível.
+
+    Parâmetros:
+        spec (SystemSpec): sistema de bombeamento
+        fluid (FluidState): estado do fluido
+
+    Retorna:
+        tuple: (system_model, npsh), onde npsh(flow_values) é o NPSH disponível (m) nas vazões informadas
+    """
+    system_model = build_system(spec, fluid)
+    loss = suction_friction_loss(system_model, spec.target_flow)
+
+    def npsh(flow_values):
+        return npsh_available(flow_values, spec.target_flow, spec.suction.height, loss, fluid.rho, fluid.p_vapor)
+
+    return system_model, npsh
+
+
+def parallel_system_curve(system_curve, n_bombas, system_model=None, max_flow=None):
+    """
+    Coeficientes da curva do sistema vista por cada uma de n bombas idênticas em paralelo (Q_total = n * Q).
+
+    Com a curva física (system_model), o polinômio substituto é recalculado diretamente para a nova
+    escala de vazões; caso contrário, a curva é reamostrada até max_flow e reajustada (grau 5).
+
+    Parâmetros:
+        system_curve: coeficientes da curva do sistema
+        n_bombas (int): número de bombas em paralelo
+        system_model (SystemCurve): curva física correspondente a system_curve, opcional
+        max_flow (float): vazão total máxima da reamostragem (m³/h), obrigatória sem system_model
+
+    Retorna:
+        np.ndarray: coeficientes da curva ajustada
+    """
+    if system_curve is None or len(system_curve) == 0:
+        raise ValueError("Curva do sistema inválida")
+    if system_model is not None:
+        return system_model.for_parallel_pumps(n_bombas).coefficients
+
+    x_original = np.linspace(0.001, max_flow, N_FIT_POINTS)
+    y_original = np.polyval(system_curve, x_original)
+    return np.polyfit(x_original / n_bombas, y_original, 5)
+
+
+def temperature_range(fluid):
+    """Faixa de temperaturas (°C) da tabela de propriedades do fluido: (t_min, t_max)."""
+    table = get_fluid_table(fluid)
+    return table.t_min, table.t_max
+
+
+def vapor_pressure(fluid, temperature):
+    """
+    Pressão de vapor (Pa) do fluido para uma ou mais temperaturas (°C), limitadas à faixa da tabela.
+    """
+    table = get_fluid_table(fluid)
+    p_vapor = table.p_vapor(np.clip(temperature, table.t_min, table.t_max))
+    return float(p_vapor) if np.ndim(p_vapor) == 0 else p_vapor
+
+
+def npsh_available(flow_values, design_flow, suction_height, suction_friction_loss, rho, p_vapor):
+    """
+    NPSH disponível (m): NPSH_d = P_atm/ρg + h_s - h_v - h_f_sucção(Q).
+
+    A perda na sucção é escalada pela lei quadrática, h_f_sucção(Q) = h_f(Q_projeto) * (Q / Q_projeto)²,
+    e é nula para vazões não positivas. Os argumentos fazem broadcasting (ex.: vazões x temperaturas).
+
+    Parâmetros:
+        flow_values: vazão ou array de vazões (m³/h)
+        design_flow (float): vazão de projeto (m³/h)
+        suction_height: altura estática da sucção (m)
+        suction_friction_loss: perda de carga na sucção na vazão de projeto (m)
+        rho: massa específica do fluido (kg/m³)
+        p_vapor: pressão de vapor do fluido (Pa)
+    """
+    h_atm = P_ATM / (rho * G)
+    h_vapor = p_vapor / (rho * G)
+    flow_values = np.asarray(flow_values, dtype=float)
+    loss = suction_friction_loss * (np.maximum(flow_values, 0.0) / design_flow) ** 2
+    return h_atm + suction_height - h_vapor - loss
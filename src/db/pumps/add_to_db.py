@@ -4,6 +4,10 @@ import numpy as np
 import os
 import logging
 import json
+import time
+from contextlib import contextmanager
+
+from pump_data_extract import derived_quantities
 
 def create_database(db_path: str) -> None:
     """
@@ -30,11 +34,141 @@ def create_database(db_path: str) -> None:
             eff_bop_flow REAL NOT NULL,
             p80_eff_bop_flow REAL NOT NULL,
             p110_eff_bop_flow REAL NOT NULL,       
+            fit_metrics TEXT,
+            head_monotonic INTEGER,
+            fit_ok INTEGER,
+            shutoff_head REAL,
+            max_head REAL,
+            head_bop REAL,
+            power_bop REAL,
+            coef_dhead BLOB,
             UNIQUE(marca, modelo, diametro, rotacao, estagios)
         )
     """)
+    # Índice usado pela consulta da seleção automática (faixa 80%–110% do BEP)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pump_models_faixa_bop
+        ON pump_models (p80_eff_bop_flow, p110_eff_bop_flow)
+    """)
+    conn.commit()
+    migrar_esquema(conn)
     conn.close()
 
+# Colunas adicionadas após a criação original da tabela (nome, tipo)
+COLUNAS_ADICIONAIS = [
+    ("fit_metrics", "TEXT"),
+    ("head_monotonic", "INTEGER"),
+    ("fit_ok", "INTEGER"),
+    ("shutoff_head", "REAL"),
+    ("max_head", "REAL"),
+    ("head_bop", "REAL"),
+    ("power_bop", "REAL"),
+    ("coef_dhead", "BLOB"),
+]
+
+# Colunas de grandezas derivadas, na ordem usada nas inserções e atualizações
+COLUNAS_DERIVADAS = ["shutoff_head", "max_head", "head_bop", "power_bop", "coef_dhead"]
+
+# Colunas do CSV processado -> colunas da tabela pump_models (na ordem de gravação)
+MAPA_CSV_TABELA = {
+    "Marca": "marca", "Modelo": "modelo", "Diameter": "diametro", "Rotation": "rotacao",
+    "Stages": "estagios", "min_flow": "vazao_min", "max_flow": "vazao_max",
+    "flowxhead": "coef_head", "flowxeff": "coef_eff", "flowxnpsh": "coef_npshr", "flowxpower": "coef_power",
+    "eff_bop": "eff_bop", "eff_bop_flow": "eff_bop_flow",
+    "p80_eff_bop_flow": "p80_eff_bop_flow", "p110_eff_bop_flow": "p110_eff_bop_flow",
+    "fit_metrics": "fit_metrics", "head_monotonic": "head_monotonic", "fit_ok": "fit_ok",
+    **{coluna: coluna for coluna in COLUNAS_DERIVADAS},
+}
+COLUNAS_TABELA = list(MAPA_CSV_TABELA.values())
+CHAVE_UNICA = ("marca", "modelo", "diametro", "rotacao", "estagios")
+# Colunas numéricas da chave, gravadas como texto na forma canônica (ex.: "095" -> "95")
+CHAVE_NUMERICA = ("diametro", "rotacao", "estagios")
+# Colunas que CSVs antigos podem não ter. Um valor ausente mantém o que já está gravado se a curva não
+# mudou; se mudou, grava NULL (os valores gravados descrevem a curva antiga) e as grandezas derivadas
+# são recalculadas por preencher_grandezas_derivadas
+COLUNAS_OPCIONAIS = ("fit_metrics", "head_monotonic", "fit_ok", *COLUNAS_DERIVADAS)
+# Colunas de que dependem as métricas de ajuste e as grandezas derivadas
+COLUNAS_CURVA = ("coef_head", "coef_power", "vazao_min", "vazao_max", "eff_bop_flow")
+CURVA_ALTERADA = " OR ".join(f"excluded.{c} IS NOT {c}" for c in COLUNAS_CURVA)
+
+# Tipos aplicados já na leitura do CSV (flags como float para aceitar valores ausentes;
+# a afinidade INTEGER da tabela as grava como inteiros)
+TIPOS_CSV = {
+    "Marca": str, "Modelo": str, "Diameter": str, "Rotation": str, "Stages": str,
+    "min_flow": float, "max_flow": float,
+    "flowxhead": str, "flowxeff": str, "flowxnpsh": str, "flowxpower": str,
+    "eff_bop": float, "eff_bop_flow": float, "p80_eff_bop_flow": float, "p110_eff_bop_flow": float,
+    "fit_metrics": str, "head_monotonic": float, "fit_ok": float, "coef_dhead": str,
+    "shutoff_head": float, "max_head": float, "head_bop": float, "power_bop": float,
+}
+
+SQL_UPSERT = f"""
+    INSERT INTO pump_models ({', '.join(COLUNAS_TABELA)})
+    VALUES ({', '.join('?' for _ in COLUNAS_TABELA)})
+    ON CONFLICT ({', '.join(CHAVE_UNICA)}) DO UPDATE SET
+    {', '.join(f'{c} = CASE WHEN excluded.{c} IS NOT NULL THEN excluded.{c} '
+               f'WHEN {CURVA_ALTERADA} THEN NULL ELSE {c} END'
+               if c in COLUNAS_OPCIONAIS else f'{c} = excluded.{c}'
+               for c in COLUNAS_TABELA if c not in CHAVE_UNICA)}
+"""
+
+def migrar_esquema(conn: sqlite3.Connection) -> None:
+    """
+    Adiciona à tabela pump_models as colunas que ainda não existirem em bancos antigos.
+    
+    As colunas novas são criadas como anuláveis; os registros existentes ficam com NULL
+    até serem reimportados.
+    """
+    existentes = {linha[1] for linha in conn.execute("PRAGMA table_info(pump_models)")}
+    with conn:
+        for nome, tipo in COLUNAS_ADICIONAIS:
+            if nome not in existentes:
+                conn.execute(f"ALTER TABLE pump_models ADD COLUMN {nome} {tipo}")
+                logging.info(f"Coluna {nome} adicionada à tabela pump_models.")
+
+def coeficientes_para_blob(coeficientes):
+    """
+    Converte coeficientes polinomiais (lista ou string JSON) em BLOB de float64 little-endian.
+    
+    O BLOB é lido em tempo de execução com np.frombuffer(blob, dtype='<f8'), sem decodificar JSON.
+    Retorna None para valores vazios.
+    """
+    if coeficientes is None or (isinstance(coeficientes, float) and np.isnan(coeficientes)):
+        return None
+    if isinstance(coeficientes, str):
+        if not coeficientes.strip():
+            return None
+        coeficientes = json.loads(coeficientes)
+    return np.asarray(coeficientes, dtype='<f8').tobytes()
+
+def preencher_grandezas_derivadas(conn: sqlite3.Connection) -> None:
+    """
+    Calcula as grandezas derivadas dos registros que ainda não as possuem (ex.: bancos migrados).
+    
+    Usa os coeficientes de head e potência já gravados e a vazão de melhor eficiência.
+    """
+    linhas = conn.execute("""
+        SELECT id, coef_head, coef_power, vazao_min, vazao_max, eff_bop_flow
+        FROM pump_models
+        WHERE shutoff_head IS NULL OR max_head IS NULL OR coef_dhead IS NULL
+    """).fetchall()
+    
+    atualizacoes = []
+    for id_bomba, coef_head, coef_power, vazao_min, vazao_max, eff_bop_flow in linhas:
+        try:
+            derivadas = derived_quantities(json.loads(coef_head), json.loads(coef_power) if coef_power else [],
+                                           vazao_min, vazao_max, eff_bop_flow)
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Não foi possível calcular as grandezas derivadas da bomba {id_bomba}: {e}")
+            continue
+        derivadas["coef_dhead"] = coeficientes_para_blob(derivadas["coef_dhead"])
+        atualizacoes.append(tuple(derivadas[c] for c in COLUNAS_DERIVADAS) + (id_bomba,))
+    
+    sql = f"UPDATE pump_models SET {', '.join(c + ' = ?' for c in COLUNAS_DERIVADAS)} WHERE id = ?"
+    with conn:
+        conn.executemany(sql, atualizacoes)
+    logging.info(f"Grandezas derivadas calculadas para {len(atualizacoes)} registros.")
+
 def create_connection(db_path: str) -> sqlite3.Connection:
     """
     Cria e retorna uma conexão com o banco de dados SQLite.
@@ -44,73 +178,150 @@ def create_connection(db_path: str) -> sqlite3.Connection:
     conn.execute("PRAGMA synchronous = NORMAL;")
     return conn
 
-def inserir_bombas_em_lote(conn: sqlite3.Connection, registros: list) -> None:
+# Pragmas aplicados apenas durante uma sessão de importação (valores restaurados ao final)
+PRAGMAS_IMPORTACAO = {
+    "cache_size": -65536,      # 64 MiB de cache de páginas
+    "temp_store": 2,           # MEMORY: tabelas e índices temporários em memória
+    "mmap_size": 268435456,    # 256 MiB de E/S mapeada em memória
+}
+
+@contextmanager
+def sessao_importacao(conn: sqlite3.Connection):
     """
-    Insere múltiplos registros de bombas no banco de dados utilizando INSERT OR IGNORE.
+    Prepara a conexão para uma importação em massa.
     
-    A tabela possui restrição UNIQUE em (marca, modelo, diametro, rotacao, estagios),
-    garantindo que registros duplicados sejam ignorados sem gerar exceção.
+    Ajusta cache_size, temp_store e mmap_size e remove os índices secundários de pump_models,
+    recriando-os uma única vez ao final (o índice UNIQUE é mantido, pois o UPSERT depende dele).
+    Os pragmas originais são restaurados ao sair, mesmo em caso de erro.
+    """
+    originais = {nome: conn.execute(f"PRAGMA {nome}").fetchone()[0] for nome in PRAGMAS_IMPORTACAO}
+    for nome, valor in PRAGMAS_IMPORTACAO.items():
+        conn.execute(f"PRAGMA {nome} = {valor}")
     
-    Registra, via log, quantos registros foram inseridos e quantos foram ignorados.
+    indices = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'pump_models' AND sql IS NOT NULL"
+    ).fetchall()
+    with conn:
+        for nome, _ in indices:
+            conn.execute(f"DROP INDEX {nome}")
+    try:
+        yield conn
+    finally:
+        with conn:
+            for _, sql in indices:
+                conn.execute(sql)
+        for nome, valor in originais.items():
+            conn.execute(f"PRAGMA {nome} = {valor}")
+
+def normalizar_chave(valor):
+    """
+    Forma canônica de um valor numérico da chave única (diâmetro, rotação ou estágios).
     
-    Parâmetros:
-      conn      : Conexão ativa com o banco de dados.
-      registros : Lista de tuplas contendo os registros a serem inseridos.
+    Valores lidos como texto preservam zeros à esquerda ("095"), que não casariam com os registros
+    gravados como "95". Números inteiros viram "95"; não inteiros, a menor representação ("95.5");
+    textos não numéricos são apenas aparados.
     """
-    sql = """
-    INSERT OR IGNORE INTO pump_models 
-    (marca, modelo, diametro, rotacao, estagios, vazao_min, vazao_max, coef_head, coef_eff, coef_npshr, coef_power,
-     eff_bop, eff_bop_flow, p80_eff_bop_flow, p110_eff_bop_flow)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    if valor is None:
+        return None
+    texto = str(valor).strip()
+    try:
+        numero = float(texto)
+    except ValueError:
+        return texto
+    if not np.isfinite(numero):
+        return texto
+    return str(int(numero)) if numero.is_integer() else repr(numero)
+
+def inserir_bombas_em_lote(conn: sqlite3.Connection, lote) -> int:
+    """
+    Grava um lote de bombas no banco de dados utilizando UPSERT.
+    
+    A tabela possui restrição UNIQUE em (marca, modelo, diametro, rotacao, estagios); quando o
+    registro já existe, as demais colunas são sobrescritas (ON CONFLICT ... DO UPDATE), de
+    modo que curvas atualizadas pelo fabricante substituem as antigas. Quando o lote não traz as
+    colunas opcionais (COLUNAS_OPCIONAIS), os valores gravados são mantidos se a curva
+    (COLUNAS_CURVA) não mudou e apagados se mudou, para que preencher_grandezas_derivadas os
+    recalcule. Diâmetro, rotação e estágios são gravados na forma canônica (normalizar_chave).
+    
+    O lote é orientado a colunas: qualquer objeto em que lote[coluna] retorne um array (dicionário
+    de arrays NumPy, DataFrame ou tabela Arrow), indexado pelos nomes de COLUNAS_TABELA. As colunas
+    são convertidas de uma só vez para escalares Python e os valores NaN viram NULL.
+    
+    Registra, via log, quantos registros foram inseridos e atualizados e a taxa em registros/s.
+    
+    Parâmetros:
+      conn : Conexão ativa com o banco de dados.
+      lote : Colunas do lote, indexadas pelos nomes das colunas da tabela.
+    
+    Retorna:
+      int: Número de registros gravados.
     """
+    inicio = time.perf_counter()
+    colunas = []
+    for nome in COLUNAS_TABELA:
+        valores = np.asarray(lote[nome])
+        if valores.dtype.kind in 'fO':
+            nulos = pd.isna(valores)
+            if nulos.any():
+                valores = valores.astype(object)
+                valores[nulos] = None
+        valores = valores.tolist()
+        if nome in CHAVE_NUMERICA:
+            valores = [normalizar_chave(v) for v in valores]
+        colunas.append(valores)
+    n_registros = len(colunas[0])
+    
     with conn:
-        before_changes = conn.total_changes
-        conn.executemany(sql, registros)
-        after_changes = conn.total_changes
-
-    inserted = after_changes - before_changes
-    duplicates = len(registros) - inserted
-    logging.info(f"{inserted} registros inseridos. {duplicates} registros duplicados ignorados.")
+        # Registros novos recebem id maior que o atual (AUTOINCREMENT); os atualizados mantêm o id,
+        # então a contagem percorre apenas o trecho novo da chave primária
+        ultimo_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM pump_models").fetchone()[0]
+        conn.executemany(SQL_UPSERT, zip(*colunas))
+        inseridos = conn.execute("SELECT COUNT(*) FROM pump_models WHERE id > ?", (ultimo_id,)).fetchone()[0]
+    
+    decorrido = time.perf_counter() - inicio
+    taxa = n_registros / decorrido if decorrido > 0 else float('inf')
+    logging.info(f"{inseridos} registros inseridos. {n_registros - inseridos} registros atualizados. "
+                 f"({taxa:,.0f} registros/s)")
+    return n_registros
 
 def transferir_csv_para_db(conn: sqlite3.Connection, caminho_csv: str, chunksize: int = None) -> None:
     """
-    Lê um arquivo CSV utilizando pandas e insere os registros no banco de dados.
+    Lê um arquivo CSV utilizando pandas e grava os registros no banco de dados.
     
     Espera que o CSV possua as colunas:
       - 'Marca', 'Modelo', 'Diameter', 'Rotation', 'Stages', 'min_flow', 'max_flow',
       - 'flowxhead', 'flowxeff', 'flowxnpsh', 'flowxpower',
       - 'eff_bop', 'eff_bop_flow', 'p80_eff_bop_flow', 'p110_eff_bop_flow'
+    e, opcionalmente, as métricas de ajuste 'fit_metrics', 'head_monotonic' e 'fit_ok' e as
+    grandezas derivadas 'shutoff_head', 'max_head', 'head_bop', 'power_bop' e 'coef_dhead'
+    (CSVs antigos não as possuem; nesse caso as derivadas são preenchidas por
+    preencher_grandezas_derivadas).
+    
+    Os tipos são definidos já na leitura (TIPOS_CSV) e cada bloco é entregue ao
+    inserir_bombas_em_lote como colunas NumPy, sem montar tuplas linha a linha.
     """
-    reader = pd.read_csv(caminho_csv, chunksize=chunksize) if chunksize else [pd.read_csv(caminho_csv)]
+    reader = pd.read_csv(caminho_csv, dtype=TIPOS_CSV, chunksize=chunksize) if chunksize \
+        else [pd.read_csv(caminho_csv, dtype=TIPOS_CSV)]
     
+    total = 0
+    inicio = time.perf_counter()
     for df in reader:
         # Normaliza os nomes das colunas removendo espaços
         df.columns = df.columns.str.strip()
-        print(df)
-        # Conversão de tipos para compatibilidade com o banco
-        df['Diameter'] = df['Diameter'].astype(str)
-        df['Rotation'] = df['Rotation'].astype(str)
-        df['Stages'] = df['Stages'].astype(str)  # Nova coluna de estágios
-        df['min_flow'] = df['min_flow'].astype(float)
-        df['max_flow'] = df['max_flow'].astype(float)
-        # Caso seja necessário, converta os coeficientes para string
-        df['flowxhead'] = df['flowxhead'].astype(str)
-        df['flowxeff'] = df['flowxeff'].astype(str)
-        df['flowxnpsh'] = df['flowxnpsh'].astype(str)
-        df['flowxpower'] = df['flowxpower'].astype(str)
-        # Conversão das novas colunas para float
-        df['eff_bop'] = df['eff_bop'].astype(float)
-        df['eff_bop_flow'] = df['eff_bop_flow'].astype(float)
-        df['p80_eff_bop_flow'] = df['p80_eff_bop_flow'].astype(float)
-        df['p110_eff_bop_flow'] = df['p110_eff_bop_flow'].astype(float)
-
-        # Seleção e ordenação das colunas conforme a estrutura da tabela
-        registros = df[['Marca', 'Modelo', 'Diameter', 'Rotation', 'Stages', 'min_flow', 'max_flow', 
-                        'flowxhead', 'flowxeff', 'flowxnpsh', 'flowxpower',
-                        'eff_bop', 'eff_bop_flow', 'p80_eff_bop_flow', 'p110_eff_bop_flow']].to_records(index=False)
         
-        registros = [tuple(reg) for reg in registros]
-        inserir_bombas_em_lote(conn, registros)
+        lote = {}
+        for coluna_csv, coluna_db in MAPA_CSV_TABELA.items():
+            if coluna_csv in df.columns:
+                lote[coluna_db] = df[coluna_csv].to_numpy()
+            else:
+                # Colunas opcionais ausentes em CSVs antigos
+                lote[coluna_db] = np.full(len(df), None, dtype=object)
+        lote['coef_dhead'] = np.array([coeficientes_para_blob(c) for c in lote['coef_dhead']], dtype=object)
+        
+        total += inserir_bombas_em_lote(conn, lote)
+    
+    decorrido = time.perf_counter() - inicio
+    logging.info(f"{total} registros de {os.path.basename(caminho_csv)} gravados em {decorrido:.3f} s.")
 
 if __name__ == "__main__":
     # Configuração básica de logging
@@ -124,12 +335,14 @@ if __name__ == "__main__":
     create_database(DB_PATH)
     
     # Cria a conexão com o banco e processa cada arquivo CSV encontrado na pasta
-    with create_connection(DB_PATH) as conn:
+    with create_connection(DB_PATH) as conn, sessao_importacao(conn):
         for file_name in os.listdir(DATA_PATH):
             if file_name.endswith(".csv"):
                 caminho_completo = os.path.join(DATA_PATH, file_name)
                 logging.info(f"Processando arquivo: {caminho_completo}")
                 # Para arquivos grandes, defina um chunksize apropriado (ex.: 10000)
                 transferir_csv_para_db(conn, caminho_completo, chunksize=10000)
+        # Completa registros antigos que não possuem as grandezas derivadas
+        preencher_grandezas_derivadas(conn)
     
     logging.info("Processamento concluído.")
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+Módulo: curve_report.py
+Descrição:
+    Gera o relatório de QA das curvas (all_pump_curves.pdf) de forma paralela e incremental.
+
+Funcionalidades:
+    - Calcula o hash do conteúdo de cada arquivo bruto (raw_data) junto com os parâmetros de ajuste.
+    - Renderiza, em processos separados e com o backend Agg, as páginas de cada arquivo cujo hash
+      ainda não está no cache, gravando um PDF parcial por arquivo (nomeado pelo próprio hash).
+    - Junta os PDFs parciais em all_pump_curves.pdf, sem redesenhar as páginas que não mudaram.
+    - Remove do cache as páginas de arquivos que foram alterados ou apagados.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from pump_data_extract import POLY_DEGREE, FIT_RMS_TOL, FIT_MAX_ERR_TOL, MONOTONIC_TOL
+
+# Versão do layout das páginas; incrementar invalida todo o cache
+REPORT_FORMAT_VERSION = 1
+
+CACHE_DIR_NAME = ".report_cache"
+MANIFEST_NAME = "manifest.json"
+
+
+def file_content_hash(file_path, degree=POLY_DEGREE):
+    """
+    Calcula o hash que identifica as páginas de um arquivo bruto.
+
+    O hash considera o conteúdo do arquivo, os parâmetros do ajuste e a versão do layout,
+    de modo que qualquer alteração em um deles força a renderização das páginas.
+
+    Parâmetros:
+        file_path (str): Caminho do arquivo CSV bruto.
+        degree (int): Grau máximo do polinômio usado no ajuste.
+
+    Retorna:
+        str: Hash SHA-256 em hexadecimal.
+    """
+    digest = hashlib.sha256()
+    fit_settings = f"degree={degree};rms={FIT_RMS_TOL};max={FIT_MAX_ERR_TOL};mono={MONOTONIC_TOL}"
+    digest.update(f"v{REPORT_FORMAT_VERSION};{fit_settings};".encode("utf-8"))
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def render_file_pages(file_name, raw_data_path, page_path, degree=POLY_DEGREE):
+    """
+    Renderiza em um PDF parcial todas as páginas de um arquivo bruto.
+
+    Executada nos processos de trabalho: usa o backend Agg e uma única figura
+    reaproveitada para todas as páginas do arquivo.
+
+    Parâmetros:
+        file_name (str): Nome do arquivo a ser renderizado.
+        raw_data_path (str): Diretório dos arquivos brutos.
+        page_path (str): Caminho do PDF parcial de saída.
+        degree (int): Grau máximo do polinômio para ajuste.
+
+    Retorna:
+        int: Número de páginas renderizadas.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_pdf import PdfPages
+    from pump_data_extract import parse_pump_data, fit_polynomial, draw_curve
+
+    pump_data = parse_pump_data(os.path.join(raw_data_path, file_name))
+    poly_fits = fit_polynomial(pump_data, degree=degree)
+
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    n_pages = 0
+
+    # Grava em arquivo temporário para que um processo interrompido não deixe cache corrompido
+    tmp_path = page_path + ".tmp"
+    with PdfPages(tmp_path) as pdf:
+        for diameter_key, curves in pump_data.items():
+            for curve_type, data in curves.items():
+                ax.clear()
+                draw_curve(ax, diameter_key, curve_type, data, poly_fits)
+                pdf.savefig(fig)
+                n_pages += 1
+    os.replace(tmp_path, page_path)
+
+    return n_pages
+
+
+def _load_manifest(cache_dir):
+    """Lê o manifesto do cache (arquivo -> hash), retornando um dicionário vazio se não existir."""
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_manifest(cache_dir, manifest):
+    """Grava o manifesto do cache."""
+    with open(os.path.join(cache_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def merge_pages(page_paths, output_pdf):
+    """
+    Junta os PDFs parciais em um único arquivo, copiando as páginas já renderizadas.
+
+    Parâmetros:
+        page_paths (list): Lista ordenada de PDFs parciais.
+        output_pdf (str): Caminho do PDF de saída.
+    """
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for page_path in page_paths:
+        writer.append(page_path)
+
+    tmp_path = output_pdf + ".tmp"
+    with open(tmp_path, "wb") as f:
+        writer.write(f)
+    writer.close()
+    os.replace(tmp_path, output_pdf)
+
+
+def generate_curve_report(raw_data_path, output_pdf, degree=POLY_DEGREE, cache_dir=None, max_workers=None):
+    """
+    Gera all_pump_curves.pdf renderizando somente os arquivos brutos novos ou alterados.
+
+    Parâmetros:
+        raw_data_path (str): Diretório dos arquivos brutos (CSV).
+        output_pdf (str): Caminho do PDF de saída.
+        degree (int): Grau máximo do polinômio para ajuste.
+        cache_dir (str): Diretório do cache de páginas (padrão: '.report_cache' ao lado do PDF).
+        max_workers (int): Número máximo de processos de renderização (padrão: número de CPUs).
+
+    Retorna:
+        tuple: (número de arquivos renderizados, número de arquivos reaproveitados do cache)
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(output_pdf), CACHE_DIR_NAME)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    file_names = sorted(f for f in os.listdir(raw_data_path) if f.endswith(".csv"))
+    hashes = {f: file_content_hash(os.path.join(raw_data_path, f), degree) for f in file_names}
+    page_paths = {f: os.path.join(cache_dir, f"{h}.pdf") for f, h in hashes.items()}
+
+    pending = [f for f in file_names if not os.path.exists(page_paths[f])]
+    old_manifest = _load_manifest(cache_dir)
+
+    if not pending and old_manifest == hashes and os.path.exists(output_pdf):
+        logging.info("Relatório de curvas já está atualizado: %s", output_pdf)
+        return 0, len(file_names)
+
+    if len(pending) == 1:
+        # Um único arquivo alterado não compensa o custo de subir o pool de processos
+        render_file_pages(pending[0], raw_data_path, page_paths[pending[0]], degree)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(render_file_pages, f, raw_data_path, page_paths[f], degree): f
+                for f in pending
+            }
+            for future, file_name in futures.items():
+                n_pages = future.result()
+                logging.info("%d páginas renderizadas para %s", n_pages, file_name)
+
+    merge_pages([page_paths[f] for f in file_names], output_pdf)
+    _save_manifest(cache_dir, hashes)
+
+    # Remove páginas de arquivos alterados ou removidos
+    valid_pages = {os.path.basename(p) for p in page_paths.values()}
+    for entry in os.listdir(cache_dir):
+        if entry.endswith(".pdf") and entry not in valid_pages:
+            os.remove(os.path.join(cache_dir, entry))
+
+    print(f"Gráficos salvos em {output_pdf} ({len(pending)} arquivo(s) renderizado(s), "
+          f"{len(file_names) - len(pending)} reaproveitado(s) do cache)")
+
+    return len(pending), len(file_names) - len(pending)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    raw_data_path = "src/db/pumps/raw_data"
+    output_pdf = os.path.join("src/db/pumps/processed_data", "all_pump_curves.pdf")
+
+    generate_curve_report(raw_data_path, output_pdf)
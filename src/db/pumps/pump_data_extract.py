@@ -4,10 +4,16 @@ import matplotlib.pyplot as plt
 import json
 import os
 from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
 
 # Constantes
 HEADER_DATA_ROW = 2  # índice a partir do qual os dados numéricos começam
-POLY_DEGREE = 5      # grau do polinômio para ajuste
+POLY_DEGREE = 5      # grau máximo do polinômio para ajuste
+MIN_POLY_DEGREE = 1  # grau mínimo testado na seleção automática
+FIT_RMS_TOL = 0.01   # erro RMS máximo da validação cruzada, relativo à amplitude da curva
+FIT_MAX_ERR_TOL = 0.03  # erro absoluto máximo da validação cruzada, relativo à amplitude da curva
+CV_FOLDS = 5         # número de partições da validação cruzada
+MONOTONIC_TOL = 0.005  # subida máxima tolerada na curva de head, relativa à amplitude da curva
 
 def parse_pump_data(file_path):
     """
@@ -66,20 +72,172 @@ def parse_pump_data(file_path):
     
     return pump_data
 
-def fit_polynomial(pump_data, degree=POLY_DEGREE):
+def cross_validation_errors(x, y, degree, n_folds=CV_FOLDS):
+    """
+    Calcula os erros de validação cruzada (k-fold) de um ajuste polinomial.
+    
+    Os pontos são distribuídos de forma intercalada entre as partições, para que cada
+    partição cubra toda a faixa de vazão. Os k ajustes são resolvidos de uma só vez
+    pelas equações normais empilhadas, com a vazão normalizada para [-1, 1].
+    
+    Parâmetros:
+        x (np.ndarray): Valores de vazão.
+        y (np.ndarray): Valores da curva.
+        degree (int): Grau do polinômio.
+        n_folds (int): Número de partições.
+    
+    Retorna:
+        tuple: (erro RMS, erro absoluto máximo) das previsões fora da amostra.
+    """
+    n_points = len(x)
+    t = (2 * x - (x.max() + x.min())) / (x.max() - x.min())
+    vander = np.vander(t, degree + 1)
+    
+    folds = np.arange(n_points) % n_folds
+    weights = (folds[None, :] != np.arange(n_folds)[:, None]).astype(float)
+    
+    normal_matrix = np.einsum('kn,np,nq->kpq', weights, vander, vander)
+    normal_rhs = np.einsum('kn,np,n->kp', weights, vander, y)
+    # Pequena regularização para evitar matrizes singulares em partições com poucos pontos
+    normal_matrix += np.eye(degree + 1) * 1e-12 * np.trace(normal_matrix, axis1=1, axis2=2)[:, None, None]
+    fold_coeffs = np.linalg.solve(normal_matrix, normal_rhs[..., None])[..., 0]
+    
+    # Cada ponto é previsto pelo ajuste que não o utilizou
+    residuals = np.einsum('np,np->n', vander, fold_coeffs[folds]) - y
+    return float(np.sqrt(np.mean(residuals**2))), float(np.max(np.abs(residuals)))
+
+def head_rise(coeffs, min_flow, max_flow, n_points=200):
+    """
+    Calcula a subida total de uma curva de head ajustada dentro da faixa de vazão.
+    
+    Uma curva de head estável é não crescente com a vazão; qualquer subida indica
+    uma curva instável ou oscilações espúrias do ajuste.
+    
+    Parâmetros:
+        coeffs (np.ndarray): Coeficientes do polinômio de head.
+        min_flow (float): Vazão mínima.
+        max_flow (float): Vazão máxima.
+        n_points (int): Número de pontos de avaliação.
+    
+    Retorna:
+        float: Soma das subidas da curva (m).
+    """
+    head = np.polyval(coeffs, np.linspace(min_flow, max_flow, n_points))
+    return float(np.sum(np.clip(np.diff(head), 0, None)))
+
+def derived_quantities(head_coeffs, power_coeffs, min_flow, max_flow, bop_flow):
+    """
+    Calcula as grandezas derivadas que não mudam para uma bomba e podem ser gravadas na ingestão.
+    
+    O head máximo em [min_flow, max_flow] é obtido de forma exata, avaliando a curva nos
+    extremos da faixa e nas raízes reais da derivada contidas nela.
+    
+    Parâmetros:
+        head_coeffs (array-like): Coeficientes do polinômio de head.
+        power_coeffs (array-like): Coeficientes do polinômio de potência (pode ser vazio).
+        min_flow (float): Vazão mínima da bomba.
+        max_flow (float): Vazão máxima da bomba.
+        bop_flow (float): Vazão no ponto de melhor eficiência (pode ser None).
+    
+    Retorna:
+        dict: shutoff_head, max_head, head_bop, power_bop e coef_dhead (coeficientes da derivada
+              dH/dQ). Grandezas que não puderem ser calculadas ficam como None.
+    """
+    head_coeffs = np.asarray(head_coeffs, dtype=float)
+    power_coeffs = np.asarray(power_coeffs, dtype=float)
+    dhead = np.polyder(head_coeffs) if head_coeffs.size > 1 else np.zeros(1)
+    
+    candidates = [min_flow, max_flow]
+    if dhead.size > 1:
+        roots = np.roots(dhead)
+        roots = roots[np.abs(roots.imag) < 1e-9].real
+        candidates.extend(roots[(roots > min_flow) & (roots < max_flow)])
+    
+    has_bop = bop_flow is not None and not pd.isna(bop_flow)
+    return {
+        "shutoff_head": float(np.polyval(head_coeffs, 0.0)),
+        "max_head": float(np.max(np.polyval(head_coeffs, np.asarray(candidates, dtype=float)))),
+        "head_bop": float(np.polyval(head_coeffs, bop_flow)) if has_bop else None,
+        "power_bop": float(np.polyval(power_coeffs, bop_flow)) if has_bop and power_coeffs.size else None,
+        "coef_dhead": dhead.tolist(),
+    }
+
+def select_polynomial_degree(x, y, curve_type, max_degree=POLY_DEGREE, min_degree=MIN_POLY_DEGREE):
+    """
+    Escolhe o menor grau de polinômio cujo erro de validação cruzada atende às tolerâncias.
+    
+    Para curvas de head, também é exigido que o ajuste seja monótono dentro da faixa de
+    vazão. Se nenhum grau atender aos critérios, é usado o menor grau dentro das tolerâncias
+    (ou, na falta deste, o de menor erro RMS) e o ajuste é sinalizado nas métricas.
+    
+    Parâmetros:
+        x (np.ndarray): Valores de vazão.
+        y (np.ndarray): Valores da curva.
+        curve_type (str): Tipo da curva (ex.: 'headxflow').
+        max_degree (int): Grau máximo permitido.
+        min_degree (int): Grau mínimo testado.
+    
+    Retorna:
+        tuple: (coeficientes ajustados, dicionário de métricas do ajuste)
+    """
+    span = float(np.ptp(y)) or 1.0
+    # Garante ao menos um ponto sobrando em cada ajuste da validação cruzada
+    training_points = len(x) - int(np.ceil(len(x) / CV_FOLDS))
+    degrees = range(min_degree, min(max_degree, training_points - 1) + 1)
+    
+    candidates = []
+    for degree in degrees:
+        cv_rms, cv_max_err = cross_validation_errors(x, y, degree)
+        within_tol = cv_rms <= FIT_RMS_TOL * span and cv_max_err <= FIT_MAX_ERR_TOL * span
+        coeffs = np.polyfit(x, y, degree)
+        monotonic = curve_type != "headxflow" or head_rise(coeffs, x.min(), x.max()) <= MONOTONIC_TOL * span
+        candidates.append((degree, coeffs, cv_rms, cv_max_err, within_tol, monotonic))
+        if within_tol and monotonic:
+            break
+    
+    if not candidates:
+        # Poucos pontos para validação cruzada: ajuste direto no maior grau possível
+        degree = min(max_degree, len(x) - 1)
+        coeffs = np.polyfit(x, y, degree)
+        monotonic = curve_type != "headxflow" or head_rise(coeffs, x.min(), x.max()) <= MONOTONIC_TOL * span
+        candidates.append((degree, coeffs, np.nan, np.nan, False, monotonic))
+    
+    chosen = next((c for c in candidates if c[4] and c[5]), None) \
+        or next((c for c in candidates if c[4]), None) \
+        or min(candidates, key=lambda c: np.nan_to_num(c[2], nan=np.inf))
+    degree, coeffs, cv_rms, cv_max_err, within_tol, monotonic = chosen
+    
+    residuals = np.polyval(coeffs, x) - y
+    metrics = {
+        "degree": int(degree),
+        "rms": float(np.sqrt(np.mean(residuals**2))),
+        "max_err": float(np.max(np.abs(residuals))),
+        "cv_rms": None if np.isnan(cv_rms) else cv_rms,
+        "cv_max_err": None if np.isnan(cv_max_err) else cv_max_err,
+        "ok": bool(within_tol),
+        "monotonic": bool(monotonic),
+    }
+    return coeffs, metrics
+
+def fit_polynomial(pump_data, degree=POLY_DEGREE, fit_metrics=None):
     """
     Ajusta um polinômio aos dados de cada curva e retorna os coeficientes.
     
-    Se houver a chave 'all', aplica o ajuste aos demais diâmetros.
+    O grau de cada curva é escolhido automaticamente por select_polynomial_degree,
+    limitado a 'degree'. Se houver a chave 'all', aplica o ajuste aos demais diâmetros.
     
     Parâmetros:
         pump_data (dict): Dicionário com os dados extraídos.
-        degree (int): Grau do polinômio para o ajuste.
+        degree (int): Grau máximo do polinômio para o ajuste.
+        fit_metrics (dict): Dicionário opcional, preenchido com as métricas de cada ajuste
+                            organizadas da mesma forma que os coeficientes.
     
     Retorna:
         dict: Dicionário com os coeficientes ajustados organizados por diâmetro_estágios e tipo de curva.
     """
     poly_fits = {}
+    if fit_metrics is None:
+        fit_metrics = {}
     
     # Processamento especial para a chave "all"
     all_key = next((k for k in pump_data.keys() if k.startswith('all_')), None)
@@ -90,13 +248,12 @@ def fit_polynomial(pump_data, degree=POLY_DEGREE):
         for curve_type, data in all_data.items():
             x = np.array(data['X'])
             y = np.array(data['Y'])
-            if len(x) < degree + 1:
+            if len(x) < MIN_POLY_DEGREE + 2:
                 continue  # Evita erro de ajuste para poucos pontos
-            coeffs = np.polyfit(x, y, degree)
+            coeffs, metrics = select_polynomial_degree(x, y, curve_type, max_degree=degree)
             for diameter in available_diameters:
-                if diameter not in poly_fits:
-                    poly_fits[diameter] = {}
-                poly_fits[diameter][curve_type] = json.dumps(coeffs.tolist())
+                poly_fits.setdefault(diameter, {})[curve_type] = json.dumps(coeffs.tolist())
+                fit_metrics.setdefault(diameter, {})[curve_type] = metrics
     
     # Processamento para os demais diâmetros
     for diameter_key, curves in pump_data.items():
@@ -104,86 +261,108 @@ def fit_polynomial(pump_data, degree=POLY_DEGREE):
             continue
         if diameter_key not in poly_fits:
             poly_fits[diameter_key] = {}
+            fit_metrics[diameter_key] = {}
         for curve_type, data in curves.items():
             x = np.array(data['X'])
             y = np.array(data['Y'])
-            if len(x) < degree + 1:
+            if len(x) < MIN_POLY_DEGREE + 2:
                 continue  # Evita erro de ajuste para poucos pontos
-            coeffs = np.polyfit(x, y, degree)
+            coeffs, metrics = select_polynomial_degree(x, y, curve_type, max_degree=degree)
             poly_fits[diameter_key][curve_type] = json.dumps(coeffs.tolist())
+            fit_metrics[diameter_key][curve_type] = metrics
+            if not metrics["ok"]:
+                print(f"Aviso: ajuste de {curve_type} ({diameter_key}) fora da tolerância: {metrics}")
+            if not metrics["monotonic"]:
+                print(f"Aviso: curva de head não monótona ({diameter_key}): {metrics}")
     
     return poly_fits
 
+def draw_curve(ax, diameter_key, curve_type, data, poly_fits):
+    """
+    Desenha em um eixo os pontos originais de uma curva e o respectivo ajuste polinomial.
+    
+    Parâmetros:
+        ax: Eixo do matplotlib onde a curva será desenhada.
+        diameter_key (str): Chave no formato 'diameter_stages'.
+        curve_type (str): Tipo da curva (ex.: 'headxflow').
+        data (dict): Dicionário com as listas 'X' e 'Y' da curva.
+        poly_fits (dict): Dicionário com os coeficientes polinomiais.
+    """
+    diameter_parts = diameter_key.split('_')
+    diameter = diameter_parts[0]
+    stages = diameter_parts[1] if len(diameter_parts) > 1 else "1"  # Estágio padrão 1 se não especificado
+    
+    x = np.array(data['X'])
+    y = np.array(data['Y'])
+    
+    ax.scatter(x, y, label='Dados originais', color='blue')
+    
+    if diameter_key in poly_fits and curve_type in poly_fits[diameter_key]:
+        coeffs = json.loads(poly_fits[diameter_key][curve_type])
+        x_fit = np.linspace(min(x), max(x), 100)
+        y_fit = np.polyval(coeffs, x_fit)
+        ax.plot(x_fit, y_fit, label='Ajuste Polinomial', color='red')
+    
+    ax.set_xlabel('Fluxo (m³/h)')
+    ax.set_ylabel('Valor')
+    ax.set_title(f'Curva {curve_type} para Rotor {diameter} mm e {stages} estágio(s)')
+    ax.legend()
+    ax.grid()
+
 def plot_all_curves(pump_data, poly_fits):
     """
     Plota e exibe os gráficos das curvas originais e dos ajustes polinomiais.
     
+    Cada combinação de diâmetro e estágios recebe uma única figura com todas as suas
+    curvas, e todas as figuras são exibidas de uma vez ao final.
+    
     Parâmetros:
         pump_data (dict): Dicionário com os dados extraídos.
         poly_fits (dict): Dicionário com os coeficientes polinomiais.
     """
     for diameter_key, curves in pump_data.items():
-        diameter_parts = diameter_key.split('_')
-        diameter = diameter_parts[0]
-        stages = diameter_parts[1] if len(diameter_parts) > 1 else "1"  # Estágio padrão 1 se não especificado
+        if not curves:
+            continue
+        n_cols = 2 if len(curves) > 1 else 1
+        n_rows = int(np.ceil(len(curves) / n_cols))
+        fig, axes = plt.subplots(n_rows, n_cols, figsize=(8 * n_cols, 5 * n_rows), squeeze=False)
         
-        for curve_type, data in curves.items():
-            x = np.array(data['X'])
-            y = np.array(data['Y'])
-            
-            plt.figure(figsize=(8, 5))
-            plt.scatter(x, y, label='Dados originais', color='blue')
-            
-            if diameter_key in poly_fits and curve_type in poly_fits[diameter_key]:
-                coeffs = json.loads(poly_fits[diameter_key][curve_type])
-                x_fit = np.linspace(min(x), max(x), 100)
-                y_fit = np.polyval(coeffs, x_fit)
-                plt.plot(x_fit, y_fit, label='Ajuste Polinomial', color='red')
-            
-            plt.xlabel('Fluxo (m³/h)')
-            plt.ylabel('Valor')
-            plt.title(f'Curva {curve_type} para Rotor {diameter} mm e {stages} estágio(s)')
-            plt.legend()
-            plt.grid()
-            plt.show()
+        for ax, (curve_type, data) in zip(axes.flat, curves.items()):
+            draw_curve(ax, diameter_key, curve_type, data, poly_fits)
+        
+        # Remove eixos sobrando quando o número de curvas é ímpar
+        for ax in axes.flat[len(curves):]:
+            ax.remove()
+        
+        fig.tight_layout()
+    
+    plt.show()
 
 
 def save_plots_to_pdf(pump_data_list, poly_fits_list, output_pdf):
     """
     Salva os gráficos gerados para cada curva em um arquivo PDF.
     
+    Versão serial e sem cache; para o catálogo completo prefira
+    curve_report.generate_curve_report, que renderiza em paralelo e só refaz
+    as páginas dos arquivos alterados.
+    
     Parâmetros:
         pump_data_list (list): Lista de dicionários com os dados extraídos de cada arquivo.
         poly_fits_list (list): Lista de dicionários com os coeficientes ajustados de cada arquivo.
         output_pdf (str): Caminho do arquivo PDF de saída.
     """
+    # Uma única figura é reaproveitada para todas as páginas
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    
     with PdfPages(output_pdf) as pdf:
         for pump_data, poly_fits in zip(pump_data_list, poly_fits_list):
             for diameter_key, curves in pump_data.items():
-                diameter_parts = diameter_key.split('_')
-                diameter = diameter_parts[0]
-                stages = diameter_parts[1] if len(diameter_parts) > 1 else "1"
-                
                 for curve_type, data in curves.items():
-                    x = np.array(data['X'])
-                    y = np.array(data['Y'])
-                    
-                    plt.figure(figsize=(8, 5))
-                    plt.scatter(x, y, label='Dados originais', color='blue')
-                    
-                    if diameter_key in poly_fits and curve_type in poly_fits[diameter_key]:
-                        coeffs = json.loads(poly_fits[diameter_key][curve_type])
-                        x_fit = np.linspace(min(x), max(x), 100)
-                        y_fit = np.polyval(coeffs, x_fit)
-                        plt.plot(x_fit, y_fit, label='Ajuste Polinomial', color='red')
-                    
-                    plt.xlabel('Fluxo (m³/h)')
-                    plt.ylabel('Valor')
-                    plt.title(f'Curva {curve_type} para Rotor {diameter} mm e {stages} estágio(s)')
-                    plt.legend()
-                    plt.grid()
-                    pdf.savefig()
-                    plt.close()
+                    ax.clear()
+                    draw_curve(ax, diameter_key, curve_type, data, poly_fits)
+                    pdf.savefig(fig)
     
     print(f"Gráficos salvos em {output_pdf}")
 
@@ -200,13 +379,17 @@ def process_file(file_name, raw_data_path, output_path, degree=POLY_DEGREE):
           * eff_bop_flow: fluxo correspondente a eff_bop.
           * 80_eff_bop_flow = 0.8 * eff_bop_flow, limitado pelo min_flow.
           * 110_eff_bop_flow = 1.1 * eff_bop_flow, limitado pelo max_flow.
+      - Registra as métricas de qualidade dos ajustes (fit_metrics, em JSON), se a curva de
+        head é monótona (head_monotonic) e se todos os ajustes atendem às tolerâncias (fit_ok).
+      - Pré-calcula as grandezas derivadas usadas na seleção (ver derived_quantities):
+        shutoff_head, max_head, head_bop, power_bop e coef_dhead (em JSON).
       - Exporta as informações em um arquivo CSV.
     
     Parâmetros:
         file_name (str): Nome do arquivo a ser processado.
         raw_data_path (str): Caminho para o diretório de arquivos de entrada.
         output_path (str): Caminho para o diretório de saída.
-        degree (int): Grau do polinômio para ajuste.
+        degree (int): Grau máximo do polinômio para ajuste.
     """
     file_path = os.path.join(raw_data_path, file_name)
     output_file = os.path.join(output_path, file_name.replace(".csv", "_polycoeff.csv"))
@@ -217,7 +400,8 @@ def process_file(file_name, raw_data_path, output_path, degree=POLY_DEGREE):
         print(f"Arquivo {file_name} não foi processado devido a erros na leitura dos dados.")
         return None, None
     
-    poly_fits = fit_polynomial(pump_data, degree=degree)
+    fit_metrics = {}
+    poly_fits = fit_polynomial(pump_data, degree=degree, fit_metrics=fit_metrics)
     
     # Extrair os metadados do nome do arquivo com tratamento de erro
     file_base = os.path.splitext(file_name)[0]
@@ -295,16 +479,31 @@ def process_file(file_name, raw_data_path, output_path, degree=POLY_DEGREE):
         flowxpower = curves_poly.get("powerxflow", "")
         # Obter os novos parâmetros calculados para a curva effxflow
         eff_bop, eff_bop_flow, eff80_flow, eff110_flow = additional_data.get(diameter_key, ("", "", "", ""))
+        # Métricas de qualidade dos ajustes
+        curves_metrics = fit_metrics.get(diameter_key, {})
+        head_monotonic = int(curves_metrics.get("headxflow", {}).get("monotonic", True))
+        fit_ok = int(all(m["ok"] for m in curves_metrics.values()))
+        # Grandezas derivadas, calculadas uma única vez por bomba
+        derived = {"shutoff_head": None, "max_head": None, "head_bop": None, "power_bop": None, "coef_dhead": ""}
+        if flowxhead and min_flow is not None:
+            derived = derived_quantities(json.loads(flowxhead), json.loads(flowxpower) if flowxpower else [],
+                                         min_flow, max_flow, eff_bop_flow if eff_bop_flow != "" else None)
+            derived["coef_dhead"] = json.dumps(derived["coef_dhead"])
         # Nova ordem: Marca, Modelo, Diameter, Rotation, Stages, min_flow, max_flow,
-        # flowxhead, flowxeff, flowxnpsh, flowxpower, eff_bop, eff_bop_flow, 80_eff_bop_flow, 110_eff_bop_flow
+        # flowxhead, flowxeff, flowxnpsh, flowxpower, eff_bop, eff_bop_flow, 80_eff_bop_flow, 110_eff_bop_flow,
+        # fit_metrics, head_monotonic, fit_ok, shutoff_head, max_head, head_bop, power_bop, coef_dhead
         row = (marca, modelo, diameter, rotation, stages, min_flow, max_flow, flowxhead, flowxeff, flowxnpsh, flowxpower,
-               eff_bop, eff_bop_flow, eff80_flow, eff110_flow)
+               eff_bop, eff_bop_flow, eff80_flow, eff110_flow, json.dumps(curves_metrics), head_monotonic, fit_ok,
+               derived["shutoff_head"], derived["max_head"], derived["head_bop"], derived["power_bop"],
+               derived["coef_dhead"])
         rows.append(row)
     
     # Definindo o cabeçalho desejado com as colunas na nova ordem
     columns = ["Marca", "Modelo", "Diameter", "Rotation", "Stages", "min_flow", "max_flow",
                "flowxhead", "flowxeff", "flowxnpsh", "flowxpower",
-               "eff_bop", "eff_bop_flow", "p80_eff_bop_flow", "p110_eff_bop_flow"]
+               "eff_bop", "eff_bop_flow", "p80_eff_bop_flow", "p110_eff_bop_flow",
+               "fit_metrics", "head_monotonic", "fit_ok",
+               "shutoff_head", "max_head", "head_bop", "power_bop", "coef_dhead"]
     
     poly_df = pd.DataFrame(rows, columns=columns)
     
@@ -317,21 +516,18 @@ def process_file(file_name, raw_data_path, output_path, degree=POLY_DEGREE):
     return pump_data, poly_fits
 
 if __name__ == "__main__":
+    from curve_report import generate_curve_report
+    
     raw_data_path = "src/db/pumps/raw_data"
     output_path = "src/db/pumps/processed_data"
-    # output_pdf = os.path.join(output_path, "all_pump_curves.pdf")
-    
-    # Lista para armazenar os dados de cada arquivo para posterior geração de PDF
-    pump_data_list = []
-    poly_fits_list = []
+    output_pdf = os.path.join(output_path, "all_pump_curves.pdf")
     
     # Processa cada arquivo no diretório de entrada
     for file_name in os.listdir(raw_data_path):
+        if not file_name.endswith(".csv"):
+            continue
         print(f"Processando arquivo: {file_name}")
-        pump_data, poly_fits = process_file(file_name, raw_data_path, output_path, degree=POLY_DEGREE)
-        if pump_data is not None and poly_fits is not None:
-            pump_data_list.append(pump_data)
-            poly_fits_list.append(poly_fits)
+        process_file(file_name, raw_data_path, output_path, degree=POLY_DEGREE)
     
-    # Gera um PDF com os gráficos de todas as curvas processadas
-    # save_plots_to_pdf(pump_data_list, poly_fits_list, output_pdf)
\ No newline at end of file
+    # Gera o PDF com os gráficos de todas as curvas, refazendo apenas as páginas dos arquivos alterados
+    generate_curve_report(raw_data_path, output_pdf, degree=POLY_DEGREE)
@@ -1,4 +1,6 @@
-from PyQt6.QtCore import QSize
+# Primeira importação: marca o início da contagem das métricas de inicialização
+from UI.func.startup_metrics import mark, log_startup_report
+from PyQt6.QtCore import QSize, QTimer
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -10,9 +12,11 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QAction
 import sys
 from UI.fluid_prop_tab import FluidPropInput
-from UI.pipe_table_tab import *
+from UI.pipe_table_tab import SystemInputWidget
 from UI.pump_selection_tab import PumpSelectionWidget
 
+mark("importacoes")
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -61,6 +65,7 @@ class MainWindow(QMainWindow):
         central_layout.addWidget(tab_widget)
         
         self.createMenuBar()
+        mark("janela_criada")
 
     def createMenuBar(self):
         menu_bar = self.menuBar()
@@ -90,8 +95,17 @@ class MainWindow(QMainWindow):
         QMessageBox.about(self, "About", "This is a PyQt6 application demonstrating a rotated table.")
 
 
+def report_first_show():
+    """Registra a exibição da janela e escreve as métricas de inicialização no log."""
+    mark("janela_exibida")
+    log_startup_report()
+
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = MainWindow()
+    # Executado no primeiro ciclo do loop de eventos, com a janela já exibida; agendado antes do show()
+    # para preceder os preenchimentos adiados pelas abas na primeira exibição
+    QTimer.singleShot(0, report_first_show)
     window.show()
     sys.exit(app.exec())
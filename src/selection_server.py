@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Módulo: selection_server.py
+Descrição:
+    Inicia o serviço HTTP local de seleção de bombas (ver UI.func.selection_service).
+
+Uso (a partir da raiz do repositório):
+    python src/selection_server.py [--host 127.0.0.1] [--port 8765] [--workers 4]
+
+Exemplo de requisição:
+    curl -X POST http://127.0.0.1:8765/select -d @servico.json
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from UI.func.selection_service import run_service, DEFAULT_HOST, DEFAULT_PORT
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de seleção de bombas.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"endereço de escuta (padrão: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"porta (padrão: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, help="processos de cálculo (padrão: número de CPUs)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="mostra o log detalhado da seleção")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s - %(levelname)s - %(message)s", stream=sys.stderr)
+    print(f"Serviço de seleção em http://{args.host}:{args.port} (Ctrl+C para encerrar)", file=sys.stderr)
+    run_service(args.host, args.port, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Módulo: startup_benchmark.py
+Descrição:
+    Benchmark do tempo de inicialização do aplicativo (MainWindow do main.py) com QT_QPA_PLATFORM=offscreen.
+
+    Cada repetição roda em um processo novo (importações frias do Python). O processo filho cria a
+    QApplication e a MainWindow, exibe a janela e percorre as abas, registrando:
+        - primeira pintura da janela, medida desde o lançamento do processo (inclui o interpretador);
+        - janela interativa: último evento processado antes de o loop de eventos ficar ocioso por IDLE_MS;
+        - para cada aba: primeira pintura e tempo até ficar interativa após ser selecionada (a aba de
+          seleção cria os gráficos na primeira exibição);
+        - métricas de UI.func.startup_metrics e dependências pesadas carregadas até a primeira pintura.
+
+    Além das repetições com o cache de tabelas de fluidos já gravado, executa repetições com cache frio
+    (FLUID_TABLE_DIR apontando para um diretório temporário vazio), como na primeira execução em uma
+    máquina nova ou com src/db/fluid_tables/ ausente; suas métricas recebem o prefixo "cold.".
+
+    À parte, em processos separados, mede o perfil de importação do main.py (-X importtime) e o custo
+    isolado da leitura do CSV de comprimentos equivalentes (local_loss), do CoolProp e do backend Qt do
+    matplotlib.
+
+    Com --baseline, compara a mediana das repetições com um resultado anterior e termina com código 1
+    quando alguma métrica piora além da tolerância ou quando uma dependência pesada passa a ser carregada
+    antes da janela ser exibida. Os custos isolados ("isolated.") medem bibliotecas de terceiros e variam
+    muito entre execuções: são exibidos, mas não entram na verificação de regressão.
+
+Uso (a partir da raiz do repositório):
+    python src/startup_benchmark.py [--repeat 5] [--cold-repeat 1] [--json resultado.json]
+    python src/startup_benchmark.py --save-baseline startup_baseline.json
+    python src/startup_benchmark.py --baseline startup_baseline.json [--tolerance 0.25] [--min-delta-ms 50]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SRC_DIR)   # o aplicativo usa caminhos relativos à raiz (./src/db/...)
+
+IDLE_MS = 50            # loop de eventos sem eventos por este tempo = interativo
+TIMEOUT_S = 30.0        # tempo máximo de espera por pintura ou ociosidade
+TOP_IMPORTS = 15        # módulos exibidos no perfil de importação
+DEFAULT_REPEAT = 5
+DEFAULT_COLD_REPEAT = 1     # cada repetição com cache frio monta a tabela da água com o CoolProp
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MIN_DELTA_MS = 50.0
+REPORT_ONLY_PREFIXES = ("isolated.",)   # métricas exibidas, mas fora da verificação de regressão
+
+# Custos isolados: etapa medida em um processo novo, após o código de preparação (ISOLATED_SETUP)
+ISOLATED_COSTS = {
+    "coolprop_import": "import CoolProp.CoolProp",
+    "matplotlib_qtagg_import": "import matplotlib.backends.backend_qtagg",
+    "pandas_import": "import pandas",
+    "local_loss_csv": "load_equivalent_length_table()",
+}
+ISOLATED_SETUP = {
+    "matplotlib_qtagg_import": "import PyQt6.QtWidgets",
+    "local_loss_csv": "import pandas\nfrom UI.extra.local_loss import load_equivalent_length_table",
+}
+
+
+def _child_env(fluid_table_dir=None):
+    env = dict(os.environ)
+    if fluid_table_dir is not None:
+        env["FLUID_TABLE_DIR"] = fluid_table_dir
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = SRC_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+# --------------------------------------------------------------------------------------------------
+# Processo filho: abre a janela e mede pintura e ociosidade de cada aba
+# --------------------------------------------------------------------------------------------------
+
+def _run_child(launch_time):
+    """Executa uma medição no processo atual e imprime o resultado (JSON) na saída padrão."""
+    sys.path.insert(0, SRC_DIR)
+    from PyQt6.QtCore import QObject, QEvent, QEventLoop, QTimer
+    from PyQt6.QtWidgets import QApplication, QTabWidget
+
+    class EventProbe(QObject):
+        """
+        Filtro de eventos da aplicação: primeira pintura dos widgets observados (e as dependências pesadas
+        já carregadas nesse momento) e último evento.
+        """
+
+        def __init__(self):
+            super().__init__()
+            self.painted = {}
+            self.heavy_at_paint = {}
+            self.watched = set()
+            self.last_event = time.time()
+            self.tick = QTimer()
+            self.tick.setSingleShot(True)
+
+        def eventFilter(self, obj, event):
+            if obj is not self.tick:
+                now = time.time()
+                self.last_event = now
+                if event.type() == QEvent.Type.Paint:
+                    for widget in self.watched:
+                        if widget not in self.painted and (obj is widget or widget.isAncestorOf(obj)):
+                            self.painted[widget] = now
+                            self.heavy_at_paint[widget] = startup_metrics.heavy_modules_loaded()
+            return False
+
+        def run_for(self, ms):
+            loop = QEventLoop()
+            self.tick.timeout.connect(loop.quit)
+            self.tick.start(ms)
+            loop.exec()
+            self.tick.timeout.disconnect(loop.quit)
+
+        def wait_paint(self, widget):
+            self.watched.add(widget)
+            deadline = time.time() + TIMEOUT_S
+            while widget not in self.painted and time.time() < deadline:
+                self.run_for(1)
+            return self.painted.get(widget)
+
+        def wait_idle(self):
+            deadline = time.time() + TIMEOUT_S
+            while time.time() < deadline:
+                self.run_for(IDLE_MS)
+                if time.time() - self.last_event >= IDLE_MS / 1000:
+                    break
+            return self.last_event
+
+    from UI.func import startup_metrics
+    app = QApplication(sys.argv[:1])
+    probe = EventProbe()
+    app.installEventFilter(probe)
+
+    import main
+    from UI.extra.local_loss import load_equivalent_length_table
+
+    window = main.MainWindow()
+    window.show()
+    first_paint = probe.wait_paint(window)
+    local_loss_loaded = load_equivalent_length_table.cache_info().currsize > 0
+    interactive = probe.wait_idle()
+    result = {
+        "window_first_paint_ms": 1000 * (first_paint - launch_time),
+        "window_interactive_ms": 1000 * (interactive - launch_time),
+        "heavy_modules_at_show": probe.heavy_at_paint.get(window, []),
+        "local_loss_csv_loaded_at_show": local_loss_loaded,
+        "tabs": {},
+    }
+
+    tabs = window.findChild(QTabWidget)
+    initial = tabs.currentIndex()
+    for index in range(tabs.count()):
+        name = tabs.tabText(index)
+        if index == initial:
+            result["tabs"][name] = {"first_paint_ms": result["window_first_paint_ms"],
+                                    "interactive_ms": result["window_interactive_ms"]}
+            continue
+        page = tabs.widget(index)
+        start = time.time()
+        tabs.setCurrentIndex(index)
+        painted = probe.wait_paint(page)
+        idle = probe.wait_idle()
+        result["tabs"][name] = {"first_paint_ms": 1000 * (painted - start) if painted else None,
+                                "interactive_ms": 1000 * (idle - start)}
+
+    report = startup_metrics.startup_report()
+    result["stages_ms"] = {name: 1000 * t for name, t in report["etapas"].items()}
+    result["deferred_ms"] = {name: 1000 * t for name, t in report["duracoes"].items()}
+    print(json.dumps(result))
+    window.close()
+
+
+def measure_startup(cold=False):
+    """
+    Lança um processo filho e retorna as medições de inicialização.
+
+    Com cold=True, o filho usa um diretório vazio como cache das tabelas de fluidos (FLUID_TABLE_DIR).
+    """
+    with tempfile.TemporaryDirectory(prefix="fluid_tables_") as empty_dir:
+        env = _child_env(empty_dir if cold else None)
+        launch_time = time.time()
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", repr(launch_time)],
+                                   cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+# --------------------------------------------------------------------------------------------------
+# Perfil de importação e custos isolados
+# --------------------------------------------------------------------------------------------------
+
+def import_profile():
+    """
+    Perfil de importação do main.py (-X importtime) em um processo novo.
+
+    Retorna:
+        dict: 'total_ms' (importação do main) e 'top' [(módulo, próprio_ms, acumulado_ms)] pelos maiores
+              tempos acumulados
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                               cwd=ROOT_DIR, env=_child_env(), capture_output=True, text=True, check=True)
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)", line)
+        if match:
+            entries.append((match.group(3), int(match.group(1)) / 1000, int(match.group(2)) / 1000))
+    total = next((cumulative for name, _, cumulative in entries if name == "main"), None)
+    top = sorted(entries, key=lambda entry: entry[2], reverse=True)[:TOP_IMPORTS]
+    return {"total_ms": total, "top": top}
+
+
+def isolated_cost(name):
+    """Tempo (ms) da etapa ISOLATED_COSTS[name] em um processo novo, após ISOLATED_SETUP[name]."""
+    code = (f"import time\n{ISOLATED_SETUP.get(name, '')}\n"
+            f"start = time.perf_counter()\n{ISOLATED_COSTS[name]}\n"
+            f"print(1000 * (time.perf_counter() - start))")
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, env=_child_env(),
+                               capture_output=True, text=True, check=True)
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+# --------------------------------------------------------------------------------------------------
+# Agregação, relatório e comparação com a referência
+# --------------------------------------------------------------------------------------------------
+
+def flatten(run):
+    """Métricas numéricas (ms) de uma medição, com nomes planos."""
+    metrics = {"window_first_paint_ms": run["window_first_paint_ms"],
+               "window_interactive_ms": run["window_interactive_ms"]}
+    for tab, values in run["tabs"].items():
+        for key, value in values.items():
+            if value is not None:
+                metrics[f"tab[{tab}].{key}"] = value
+    for name, value in run["deferred_ms"].items():
+        metrics[f"deferred.{name}_ms"] = value
+    return metrics
+
+
+def _median_metrics(runs, prefix=""):
+    flat = [flatten(run) for run in runs]
+    return {prefix + key: statistics.median(run[key] for run in flat if key in run) for key in flat[0]}
+
+
+def run_benchmark(repeat, cold_repeat=DEFAULT_COLD_REPEAT):
+    """
+    Executa as repetições (cache quente e frio), o perfil de importação e os custos isolados; retorna o
+    resultado completo.
+    """
+    runs = [measure_startup() for _ in range(repeat)]
+    cold_runs = [measure_startup(cold=True) for _ in range(cold_repeat)]
+    metrics = _median_metrics(runs)
+    if cold_runs:
+        metrics.update(_median_metrics(cold_runs, "cold."))
+    for name in ISOLATED_COSTS:
+        metrics[f"isolated.{name}_ms"] = statistics.median(isolated_cost(name) for _ in range(repeat))
+    profiles = [import_profile() for _ in range(repeat)]
+    metrics["import.main_ms"] = statistics.median(profile["total_ms"] for profile in profiles)
+    result = {
+        "repeat": repeat,
+        "cold_repeat": len(cold_runs),
+        "metrics": metrics,
+        "heavy_modules_at_show": sorted({module for run in runs for module in run["heavy_modules_at_show"]}),
+        "local_loss_csv_loaded_at_show": any(run["local_loss_csv_loaded_at_show"] for run in runs),
+        "import_top": profiles[-1]["top"],
+    }
+    if cold_runs:
+        result["cold_heavy_modules_at_show"] = sorted({module for run in cold_runs
+                                                       for module in run["heavy_modules_at_show"]})
+    return result
+
+
+def print_report(result):
+    print(f"Inicialização (mediana de {result['repeat']} processo(s); cache frio: {result.get('cold_repeat', 0)}; ms):")
+    for key, value in result["metrics"].items():
+        note = " (informativo)" if key.startswith(REPORT_ONLY_PREFIXES) else ""
+        print(f"  {key:<55} {value:9.1f}{note}")
+    print(f"Dependências pesadas carregadas até a exibição: {', '.join(result['heavy_modules_at_show']) or 'nenhuma'}")
+    if "cold_heavy_modules_at_show" in result:
+        print(f"Dependências pesadas carregadas até a exibição (cache frio): "
+              f"{', '.join(result['cold_heavy_modules_at_show']) or 'nenhuma'}")
+    print(f"CSV de comprimentos equivalentes lido até a exibição: "
+          f"{'sim' if result['local_loss_csv_loaded_at_show'] else 'não'}")
+    print("Maiores tempos acumulados de importação (-X importtime, ms):")
+    for name, own, cumulative in result["import_top"]:
+        print(f"  {name:<55} {cumulative:9.1f} (próprio {own:.1f})")
+
+
+def compare(result, baseline, tolerance, min_delta_ms):
+    """
+    Compara o resultado com a referência.
+
+    Uma métrica é regressão quando excede a referência em mais de `tolerance` (fração) e em mais de
+    `min_delta_ms` (ruído de medição). As métricas de REPORT_ONLY_PREFIXES (custos isolados de bibliotecas
+    de terceiros) não são verificadas. Dependências pesadas novas antes da exibição, com cache quente ou
+    frio, também são regressão.
+
+    Retorna:
+        list: descrição das regressões encontradas
+    """
+    regressions = []
+    for key, reference in baseline["metrics"].items():
+        if key.startswith(REPORT_ONLY_PREFIXES):
+            continue
+        value = result["metrics"].get(key)
+        if value is None or reference is None:
+            continue
+        if value > reference * (1 + tolerance) and value - reference > min_delta_ms:
+            regressions.append(f"{key}: {value:.1f} ms (referência {reference:.1f} ms, "
+                               f"+{100 * (value / reference - 1):.0f}%)")
+    for key, label in (("heavy_modules_at_show", ""), ("cold_heavy_modules_at_show", " (cache frio)")):
+        if key not in result:
+            continue
+        new_modules = set(result[key]) - set(baseline.get(key, []))
+        if new_modules:
+            regressions.append(f"dependências pesadas carregadas antes da exibição{label}: "
+                               f"{', '.join(sorted(new_modules))}")
+    if result["local_loss_csv_loaded_at_show"] and not baseline.get("local_loss_csv_loaded_at_show", False):
+        regressions.append("CSV de comprimentos equivalentes passou a ser lido antes da exibição")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de inicialização do aplicativo.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="processos medidos (mediana)")
+    parser.add_argument("--cold-repeat", type=int, default=DEFAULT_COLD_REPEAT,
+                        help="processos medidos com o cache de tabelas de fluidos vazio (padrão: %(default)s)")
+    parser.add_argument("--json", help="grava o resultado completo neste arquivo")
+    parser.add_argument("--baseline", help="resultado de referência para detectar regressões")
+    parser.add_argument("--save-baseline", help="grava o resultado como nova referência")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="piora relativa tolerada (fração, padrão: %(default)s)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="piora absoluta mínima para acusar regressão (padrão: %(default)s ms)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _run_child(float(args.child))
+        return 0
+
+    result = run_benchmark(args.repeat, args.cold_repeat)
+    print_report(result)
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("Regressões em relação à referência:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("Sem regressões em relação à referência.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())